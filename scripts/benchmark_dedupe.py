@@ -0,0 +1,79 @@
+import argparse
+import sys
+import os
+import random
+import tempfile
+import time
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import DatabaseManager
+from src.core.models import Property
+from src.services.duplicate_detector import AddressIndex, DuplicateDetector
+
+SUFFIXES = {"Street": "St.", "Road": "Rd", "Avenue": "Ave", "Drive": "Dr."}
+
+def benchmark_dedupe(homes=50000, batch=2000, seed=7):
+    """
+    Times find_potential_duplicate() one listing at a time against
+    find_duplicates_batch() on the same batch, and checks both make the
+    same accept/reject decision for every listing.
+    """
+    print(f"🏁 Dedupe benchmark: {homes:,} homes in the table, batch of {batch:,}")
+    rng = random.Random(seed)
+    numbers = list(range(100, 300))
+    streets = [f"{name} {suffix}" for name in ("Oak", "Maple", "Cedar", "Pine", "Elm", "Lake", "Hill", "Park")
+               for suffix in SUFFIXES] * (homes // (len(numbers) * 32) + 1)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        
+        # 1. A large city with big blocks (many homes share each house number)
+        existing = [(f"{n} {street} {i}", "Benchtown") for i, street in enumerate(streets) for n in numbers][:homes]
+        with db.session_scope() as session:
+            session.bulk_save_objects([
+                Property(address=address, city=city, zip_code="78701", url=f"http://bench/{i}")
+                for i, (address, city) in enumerate(existing)
+            ])
+        
+        # 2. Incoming batch: half messy copies of existing homes, half new homes
+        incoming = []
+        for i in range(batch):
+            address, city = rng.choice(existing)
+            if i % 2:
+                for long, short in SUFFIXES.items():
+                    address = address.replace(long, short)
+            else:
+                address = f"{rng.choice(numbers)} Unknown Way {i}"
+            incoming.append(Property(address=address, city=city, zip_code="78701"))
+        
+        with db.session_scope() as session:
+            detector = DuplicateDetector(session, AddressIndex.load(session))
+            
+            # 3. One at a time (thefuzz loop)
+            start = time.perf_counter()
+            single = [detector.find_potential_duplicate(p.address, p.city, zip_code=p.zip_code) for p in incoming]
+            single_s = time.perf_counter() - start
+            
+            # 4. Whole batch (rapidfuzz cdist per block)
+            start = time.perf_counter()
+            batched = detector.find_duplicates_batch(incoming)
+            batch_s = time.perf_counter() - start
+            
+            same = all((a.url if a else None) == (b.url if b else None) for a, b in zip(single, batched))
+            found = sum(m is not None for m in batched)
+        db.engine.dispose()
+    
+    print(f"\n⏱️ One at a time: {single_s:.2f}s ({batch / single_s:,.0f} listings/s)")
+    print(f"⏱️ Batched:       {batch_s:.2f}s ({batch / batch_s:,.0f} listings/s)")
+    print(f"🚀 Speedup: {single_s / batch_s:.1f}x")
+    print(f"{'✅' if same else '❌'} Decisions identical: {same} ({found} duplicates)")
+    return same
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark single vs batch duplicate detection.")
+    parser.add_argument("--homes", type=int, default=50000, help="Homes already in the table")
+    parser.add_argument("--batch", type=int, default=2000, help="Incoming listings to check")
+    args = parser.parse_args()
+    benchmark_dedupe(args.homes, args.batch)
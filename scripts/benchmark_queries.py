@@ -0,0 +1,86 @@
+import argparse
+import sys
+import os
+import tempfile
+import time
+
+# Add the project root to the python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, text
+from src.core.database import DatabaseManager
+from src.core.migrations import create_query_indexes, drop_query_indexes
+from src.core.models import Property, PriceHistory
+from src.services.data_generator import SyntheticDataGenerator
+
+def _queries(session, sample_ids):
+    """(name, SQL for EXPLAIN, function) for the lookups the app makes most."""
+    return [
+        ("dedupe: city + zip", "SELECT id FROM properties WHERE city = 'Austin' AND zip_code = '78799'",
+         lambda: session.query(Property.id, Property.url, Property.address)
+         .filter(Property.city == "Austin", Property.zip_code == "78799").all()),
+        ("dedupe: new city", "SELECT id FROM properties WHERE city = 'Nowhere'",
+         lambda: session.query(Property.id).filter(Property.city == "Nowhere").all()),
+        ("zip_code count", "SELECT count(*) FROM properties WHERE zip_code = '78701'",
+         lambda: session.query(func.count(Property.id)).filter(Property.zip_code == "78701").scalar()),
+        ("price band", "SELECT id FROM properties WHERE price BETWEEN 1500000 AND 1600000",
+         lambda: session.query(Property.id).filter(Property.price.between(1_500_000, 1_600_000)).all()),
+        ("source_site count", "SELECT count(*) FROM properties WHERE source_site = 'Redfin'",
+         lambda: session.query(func.count(Property.id)).filter(Property.source_site == "Redfin").scalar()),
+        (f"latest price x{len(sample_ids)}",
+         "SELECT price FROM price_history WHERE property_id = 1 ORDER BY recorded_at DESC LIMIT 1",
+         lambda: [session.query(PriceHistory.price).filter(PriceHistory.property_id == prop_id)
+                  .order_by(PriceHistory.recorded_at.desc()).first() for prop_id in sample_ids]),
+    ]
+
+def _time(func, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def _plan(session, sql):
+    rows = session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    return "; ".join(row[-1] for row in rows)
+
+def benchmark_queries(rows=200000, repeat=3, lookups=200, seed=42):
+    """
+    Times the app's common filters on a synthetic table with and without
+    the secondary indexes (migration v2), best of `repeat` runs each.
+    """
+    print(f"🏁 Query benchmark: {rows:,} synthetic listings")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        SyntheticDataGenerator(seed=seed).to_database(db, rows)
+        sample_ids = list(range(1, rows + 1, max(1, rows // lookups)))[:lookups]
+        
+        results = {}
+        for label, change in (("before", drop_query_indexes), ("after", create_query_indexes)):
+            # 1. Drop (or re-create) the indexes, then time every query on a warm cache
+            with db.engine.begin() as connection:
+                change(connection)
+            with db.session_scope() as session:
+                for name, sql, func_ in _queries(session, sample_ids):
+                    func_()
+                    results.setdefault(name, {})[label] = (_time(func_, repeat), _plan(session, sql))
+        db.engine.dispose()
+    
+    # 2. Report
+    print(f"\n{'query':<22} {'before':>10} {'after':>10} {'speedup':>8}")
+    for name, timing in results.items():
+        before, after = timing["before"][0], timing["after"][0]
+        print(f"{name:<22} {before * 1000:>8.2f}ms {after * 1000:>8.2f}ms {before / max(after, 1e-9):>7.1f}x")
+    print("\n🔎 Query plans after indexing:")
+    for name, timing in results.items():
+        print(f"   {name:<22} {timing['after'][1]}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark common queries with and without secondary indexes.")
+    parser.add_argument("--rows", type=int, default=200000, help="Synthetic listings to generate")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per query (best is reported)")
+    args = parser.parse_args()
+    benchmark_queries(args.rows, args.repeat)
@@ -1,49 +1,54 @@
-import sys
-import os
-import pandas as pd
-from sqlalchemy import create_engine
-
-# Fix imports so Python can find 'src'
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.core.models import Property
-from src.core.database import DatabaseManager
-
-def show_data():
-    print("🔎 Inspecting Database...")
-    
-    # Connect to the database
-    db = DatabaseManager()
-    
-    # We use a context manager to ensure the session closes
-    with db.session_scope() as session:
-        # Fetch all properties
-        properties = session.query(Property).all()
-        
-        if not properties:
-            print("❌ Database is empty. Run 'scripts/run_pipeline.py' first!")
-            return
-
-        print(f"✅ Found {len(properties)} listings.\n")
-        
-        # Build a list of dictionaries for the table
-        data = []
-        for p in properties:
-            data.append({
-                "ID": p.id,
-                "Address": p.address,
-                "City": p.city,
-                "Price": f"${p.price:,.0f}",
-                "Beds": p.bedrooms,
-                "SqFt": p.square_feet,
-                "Status": p.listing_status
-            })
-            
-        # Create a DataFrame
-        df = pd.DataFrame(data)
-        
-        # Print the table nicely
-        print(df.to_string(index=False))
-
-if __name__ == "__main__":
+import sys
+import os
+import pandas as pd
+from sqlalchemy import create_engine
+
+# Fix imports so Python can find 'src'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.models import Property
+from src.core.database import DatabaseManager
+from src.services.property_service import PropertyService
+
+def show_data():
+    print("🔎 Inspecting Database...")
+    
+    # Connect to the database
+    db = DatabaseManager()
+    
+    # We use a context manager to ensure the session closes
+    with db.session_scope() as session:
+        service = PropertyService(session)
+        
+        # Count in SQL instead of fetching every row just to call len()
+        total = service.get_stats()["total_listings"]
+        if not total:
+            print("❌ Database is empty. Run 'scripts/run_pipeline.py' first!")
+            return
+
+        print(f"✅ Found {total} listings.\n")
+        
+        # Stream the table a page at a time, only the columns we show
+        columns = ["id", "address", "city", "price", "bedrooms", "square_feet", "listing_status"]
+        for page_number, page in enumerate(service.iter_chunks(columns, chunk_size=500)):
+            # Build a list of dictionaries for the table
+            data = []
+            for p in page:
+                data.append({
+                    "ID": p.id,
+                    "Address": p.address,
+                    "City": p.city,
+                    "Price": f"${p.price:,.0f}",
+                    "Beds": p.bedrooms,
+                    "SqFt": p.square_feet,
+                    "Status": p.listing_status
+                })
+            
+            # Create a DataFrame
+            df = pd.DataFrame(data)
+            
+            # Print the table nicely (header on the first page only)
+            print(df.to_string(index=False, header=page_number == 0))
+
+if __name__ == "__main__":
     show_data()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import pandas as pd
+from src.utils.parsers import apply_unique
+from src.utils.text_normalizer import tokenize
+
+class AddressCleaner:
+    """
+    Canonical street addresses, so "1234 North Main Street, Apt. 2" and
+    "1234 n main st #2" come out the same.
+    
+    address_key() is what gets stored on Property.address_key: two listings
+    with the same key (in the same city) are the same home, no fuzzy match
+    needed.
+    """
+    
+    # Every spelling we see -> the USPS abbreviation
+    SUFFIXES = {
+        "alley": "aly", "aly": "aly",
+        "avenue": "ave", "ave": "ave", "av": "ave", "aven": "ave", "avn": "ave", "avnue": "ave",
+        "boulevard": "blvd", "blvd": "blvd", "boul": "blvd", "boulv": "blvd",
+        "circle": "cir", "cir": "cir", "circ": "cir", "crcl": "cir",
+        "court": "ct", "ct": "ct", "crt": "ct",
+        "cove": "cv", "cv": "cv",
+        "crossing": "xing", "xing": "xing",
+        "drive": "dr", "dr": "dr", "drv": "dr", "driv": "dr",
+        "expressway": "expy", "expy": "expy",
+        "freeway": "fwy", "fwy": "fwy",
+        "highway": "hwy", "hwy": "hwy", "hiway": "hwy", "hway": "hwy",
+        "lane": "ln", "ln": "ln",
+        "parkway": "pkwy", "pkwy": "pkwy", "parkwy": "pkwy", "pkway": "pkwy", "pky": "pkwy",
+        "place": "pl", "pl": "pl",
+        "plaza": "plz", "plz": "plz",
+        "point": "pt", "pt": "pt",
+        "road": "rd", "rd": "rd",
+        "route": "rte", "rte": "rte",
+        "square": "sq", "sq": "sq",
+        "street": "st", "st": "st", "str": "st", "strt": "st",
+        "terrace": "ter", "ter": "ter", "terr": "ter",
+        "trail": "trl", "trl": "trl",
+        "turnpike": "tpke", "tpke": "tpke",
+        "way": "way", "wy": "way",
+    }
+    DIRECTIONALS = {
+        "north": "n", "n": "n", "south": "s", "s": "s", "east": "e", "e": "e", "west": "w", "w": "w",
+        "northeast": "ne", "ne": "ne", "northwest": "nw", "nw": "nw",
+        "southeast": "se", "se": "se", "southwest": "sw", "sw": "sw",
+    }
+    # Apartment / unit / '#' all mean the same thing to us
+    UNITS = {
+        "apartment": "apt", "apt": "apt", "unit": "apt", "#": "apt",
+        "suite": "ste", "ste": "ste",
+        "building": "bldg", "bldg": "bldg",
+        "floor": "fl", "fl": "fl",
+    }
+    
+    # Abbreviation -> the long form, for display (the first spelling listed above wins)
+    EXPANSIONS = {
+        **{short: long for long, short in reversed(list(SUFFIXES.items()))},
+        **{short: long for long, short in reversed(list(DIRECTIONALS.items()))},
+        "apt": "apartment", "ste": "suite", "bldg": "building", "fl": "floor",
+    }
+    
+    @classmethod
+    def normalize(cls, address: str) -> str:
+        """
+        Canonical, abbreviated, lowercase form:
+        '1234 North Main Street, Apt. #2' -> '1234 n main st apt 2'
+        """
+        tokens = []
+        for token in tokenize(address):
+            if token in cls.UNITS:
+                unit = cls.UNITS[token]
+                # "Apt #2": the '#' after a unit word adds nothing
+                if tokens and tokens[-1] in cls.UNITS.values() and token == "#":
+                    continue
+                tokens.append(unit)
+            elif token in cls.SUFFIXES:
+                tokens.append(cls.SUFFIXES[token])
+            elif token in cls.DIRECTIONALS:
+                tokens.append(cls.DIRECTIONALS[token])
+            else:
+                tokens.append(token)
+        return " ".join(tokens)
+
+    @classmethod
+    def expand(cls, address: str) -> str:
+        """Long, title-cased form: '1234 n main st apt 2' -> '1234 North Main Street Apartment 2'"""
+        return " ".join(cls.EXPANSIONS.get(token, token).title() for token in cls.normalize(address).split())
+
+    @classmethod
+    def address_key(cls, address):
+        """The dedupe key for an address, or None when there is nothing to key on."""
+        if not isinstance(address, str):
+            return None
+        return cls.normalize(address) or None
+
+    @classmethod
+    def address_keys(cls, addresses: pd.Series) -> pd.Series:
+        """address_key() for a whole column (each distinct address normalized once)."""
+        return apply_unique(addresses, lambda unique: unique.map(cls.address_key).astype(object))
@@ -1,33 +1,60 @@
-import re
-
-class PriceCleaner:
-    """
-    Cleans price strings into usable float values.
-    Example: "$450,000" -> 450000.0
-    """
-    
-    @staticmethod
-    def clean_price(price_input):
-        """
-        Removes currency symbols, commas, and whitespace.
-        Returns a float or None if invalid.
-        """
-        if not price_input:
-            return None
-            
-        # If it's already a number, just return it
-        if isinstance(price_input, (int, float)):
-            return float(price_input)
-            
-        # Convert to string just in case
-        price_str = str(price_input)
-        
-        # 1. Remove anything that ISN'T a digit or a decimal point
-        # Regex explanation: [^\d.] means "Match anything that is NOT a number or dot"
-        clean_str = re.sub(r'[^\d.]', '', price_str)
-        
-        try:
-            return float(clean_str)
-        except ValueError:
-            print(f"⚠️ Could not convert price: {price_input}")
-            return None
\ No newline at end of file
+import re
+import numpy as np
+import pandas as pd
+from src.utils.parsers import split_numbers, to_number
+
+class PriceCleaner:
+    """
+    Cleans price strings into usable float values.
+    Example: "$450,000" -> 450000.0
+    """
+    
+    # Regex explanation: [^\d.] means "Match anything that is NOT a number or dot"
+    NON_NUMERIC = re.compile(r'[^\d.]')
+    
+    @staticmethod
+    def clean_price(price_input):
+        """
+        Removes currency symbols, commas, and whitespace.
+        Returns a float or None if invalid.
+        """
+        if not price_input:
+            return None
+            
+        # If it's already a number, just return it
+        if isinstance(price_input, (int, float)):
+            return float(price_input)
+            
+        # Convert to string just in case
+        price_str = str(price_input)
+        
+        # 1. Remove anything that ISN'T a digit or a decimal point
+        clean_str = PriceCleaner.NON_NUMERIC.sub('', price_str)
+        
+        try:
+            return float(clean_str)
+        except ValueError:
+            print(f"⚠️ Could not convert price: {price_input}")
+            return None
+
+    @staticmethod
+    def clean_prices(prices: pd.Series) -> pd.Series:
+        """
+        Vectorized clean_price() for a whole column.
+        Returns floats, with NaN wherever clean_price() would return None.
+        Missing values (None/NaN) count as "no price".
+        """
+        numeric, is_number = split_numbers(prices)
+        result = pd.Series(np.nan, index=prices.index, dtype=float)
+        
+        # 1. Numbers pass straight through (0 is falsy, so it means "no price")
+        result[is_number] = numeric[is_number].where(numeric[is_number] != 0)
+        
+        # 2. Strings: strip everything but digits and dots, then parse
+        is_text = ~is_number & prices.notna()
+        if is_text.any():
+            digits = prices[is_text].astype(str).str.replace(PriceCleaner.NON_NUMERIC, '', regex=True)
+            result[is_text] = to_number(digits, float)
+        
+        return result
+
@@ -1,41 +1,84 @@
-class PropertyCleaner:
-    """
-    Standardizes property details like City, State, and Beds/Baths.
-    """
-    
-    @staticmethod
-    def clean_city(city: str) -> str:
-        if not city:
-            return "Unknown"
-        # " austin " -> "Austin"
-        return city.strip().title()
-        
-    @staticmethod
-    def clean_state(state: str) -> str:
-        if not state:
-            return "XX"
-        return state.strip().upper()[:2] # Ensure it's 2 chars like "TX"
-    
-    @staticmethod
-    def validate_beds_baths(value):
-        """
-        Ensures beds/baths are positive numbers.
-        If we get "3 Beds", we extract 3.
-        """
-        if value is None:
-            return 0
-            
-        if isinstance(value, (int, float)):
-            return abs(value) # No negative bedrooms allowed!
-            
-        # Simple text handling (e.g. "3 bd")
-        try:
-            # Grab the first number found
-            import re
-            numbers = re.findall(r'\d+', str(value))
-            if numbers:
-                return int(numbers[0])
-        except:
-            pass
-            
-        return 0
\ No newline at end of file
+import re
+import pandas as pd
+from src.utils.parsers import split_numbers, to_number
+
+class PropertyCleaner:
+    """
+    Standardizes property details like City, State, and Beds/Baths.
+    """
+    
+    FIRST_NUMBER = re.compile(r'(\d+)')
+    
+    @staticmethod
+    def clean_city(city: str) -> str:
+        if not city:
+            return "Unknown"
+        # " austin " -> "Austin"
+        return city.strip().title()
+        
+    @staticmethod
+    def clean_state(state: str) -> str:
+        if not state:
+            return "XX"
+        return state.strip().upper()[:2] # Ensure it's 2 chars like "TX"
+    
+    @staticmethod
+    def validate_beds_baths(value):
+        """
+        Ensures beds/baths are positive numbers.
+        If we get "3 Beds", we extract 3.
+        """
+        if value is None:
+            return 0
+            
+        if isinstance(value, (int, float)):
+            return abs(value) # No negative bedrooms allowed!
+            
+        # Simple text handling (e.g. "3 bd")
+        try:
+            # Grab the first number found
+            match = PropertyCleaner.FIRST_NUMBER.search(str(value))
+            if match:
+                return int(match.group())
+        except:
+            pass
+            
+        return 0
+
+    # --- VECTORIZED VERSIONS (whole pandas columns at once) ---
+    # Missing values (None/NaN) are treated like a missing field.
+
+    @staticmethod
+    def clean_cities(cities: pd.Series) -> pd.Series:
+        return PropertyCleaner._clean_text(cities, "Unknown").str.strip().str.title()
+
+    @staticmethod
+    def clean_states(states: pd.Series) -> pd.Series:
+        return PropertyCleaner._clean_text(states, "XX").str.strip().str.upper().str[:2]
+
+    @staticmethod
+    def _clean_text(values: pd.Series, default: str) -> pd.Series:
+        """Empty or missing values become `default` (which is already clean)."""
+        missing = values.isna() | (values == "")
+        return values.astype(object).where(~missing, default).astype(str)
+
+    @staticmethod
+    def validate_beds_baths_series(values: pd.Series) -> pd.Series:
+        """
+        Vectorized validate_beds_baths(): numbers become their absolute value,
+        text becomes its first whole number, anything else becomes 0.
+        """
+        numeric, is_number = split_numbers(values)
+        result = numeric.abs().where(is_number, 0)
+        
+        is_text = ~is_number & values.notna()
+        if is_text.any():
+            first = values[is_text].astype(str).str.extract(PropertyCleaner.FIRST_NUMBER, expand=False)
+            result[is_text] = to_number(first, int).fillna(0)
+        
+        # Floats stay floats (abs(2.5) == 2.5); everything else is a whole number
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            has_floats = pd.api.types.is_float_dtype(values.dtype)
+        else:
+            has_floats = values[is_number].map(lambda v: isinstance(v, float)).any()
+        return result if has_floats else result.astype("int64")
\ No newline at end of file
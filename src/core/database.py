@@ -1,39 +1,113 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from contextlib import contextmanager
-import os
-
-# Import the Base and Models so SQLAlchemy knows what to build
-from src.core.models import Base, Property, PriceHistory 
-
-class DatabaseManager:
-    def __init__(self, db_url=None):
-        if db_url is None:
-            # Ensure the data directory exists
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            data_dir = os.path.join(base_dir, 'data')
-            os.makedirs(data_dir, exist_ok=True)
-            db_url = f"sqlite:///{os.path.join(data_dir, 'real_estate.db')}"
-            
-        self.engine = create_engine(db_url)
-        
-        # --- 🏗️ CRITICAL FIX: BUILD TABLES AUTOMATICALLY ---
-        # This creates the 'properties' and 'price_history' tables 
-        # if they don't exist yet.
-        Base.metadata.create_all(self.engine)
-        # ----------------------------------------------------
-        
-        self.Session = sessionmaker(bind=self.engine)
-
-    @contextmanager
-    def session_scope(self):
-        """Provide a transactional scope around a series of operations."""
-        session = self.Session()
-        try:
-            yield session
-            session.commit()
-        except Exception:
-            session.rollback()
-            raise
-        finally:
-            session.close()
\ No newline at end of file
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from contextlib import contextmanager
+import os
+import threading
+
+# Import the Base and Models so SQLAlchemy knows what to build
+from src.core.models import Base, Property, PriceHistory
+from src.core.migrations import migrate
+
+# SQLite tuning applied to every new connection:
+# WAL lets readers (web, analyzers) run while the ingest pipeline writes,
+# NORMAL sync is safe under WAL, and a bigger cache + mmap cut disk reads.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64000,        # KiB (negative), so ~64 MB
+    "mmap_size": 268435456,      # 256 MB
+    "temp_store": "MEMORY",
+    "busy_timeout": 30000,       # ms a writer waits for a lock instead of failing
+}
+
+# One (engine, session factory) per database URL for the whole process
+_engines = {}
+_engines_lock = threading.Lock()
+
+def default_db_url():
+    # Ensure the data directory exists
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    data_dir = os.path.join(base_dir, 'data')
+    os.makedirs(data_dir, exist_ok=True)
+    return f"sqlite:///{os.path.join(data_dir, 'real_estate.db')}"
+
+def _is_memory(db_url):
+    return db_url in ("sqlite://", "sqlite:///:memory:")
+
+def _tune_sqlite(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name} = {value}")
+    cursor.close()
+
+def _create_engine(db_url):
+    if not db_url.startswith("sqlite"):
+        return create_engine(db_url, pool_size=10, max_overflow=20, pool_pre_ping=True)
+    if _is_memory(db_url):
+        # Every session must see the same in-memory database: one shared connection
+        return create_engine(db_url, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    
+    engine = create_engine(db_url, connect_args={"check_same_thread": False}, pool_size=10, max_overflow=20)
+    event.listen(engine, "connect", _tune_sqlite)
+    return engine
+
+def _registered(db_url):
+    with _engines_lock:
+        entry = _engines.get(db_url)
+        if entry is None:
+            engine = _create_engine(db_url)
+            # --- 🏗️ BUILD TABLES AUTOMATICALLY (once per process) ---
+            Base.metadata.create_all(engine)
+            # ...and bring older databases up to date (new columns, indexes)
+            migrate(engine)
+            entry = (engine, sessionmaker(bind=engine))
+            _engines[db_url] = entry
+        return entry
+
+def get_engine(db_url=None):
+    """
+    The process-wide engine for a database URL. The first call creates its
+    pool and checks the schema (create_all + migrations); later calls, from
+    any thread, reuse both.
+    """
+    return _registered(db_url or default_db_url())[0]
+
+def dispose_engines():
+    """Closes every pooled connection (e.g. before deleting database files)."""
+    with _engines_lock:
+        for engine, _ in _engines.values():
+            engine.dispose()
+        _engines.clear()
+
+class DatabaseManager:
+    """
+    Cheap to create: every DatabaseManager for the same URL shares one
+    engine, connection pool and session factory (see get_engine).
+    """
+
+    def __init__(self, db_url=None):
+        self.db_url = db_url or default_db_url()
+        self.engine, self.Session = _registered(self.db_url)
+
+    def create_all_tables(self):
+        """Creates missing tables and applies pending migrations (safe to call again)."""
+        Base.metadata.create_all(self.engine)
+        migrate(self.engine)
+
+    @contextmanager
+    def session_scope(self):
+        """Provide a transactional scope around a series of operations."""
+        session = self.Session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+def SessionLocal():
+    """A new session on the default database (for scripts that just need one)."""
+    return DatabaseManager().Session()
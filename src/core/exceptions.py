@@ -0,0 +1,10 @@
+class CircuitOpenError(Exception):
+    """
+    Raised instead of making a request when a host's circuit breaker is open.
+    The host failed too many times in a row, so we fail fast until it cools down.
+    """
+    
+    def __init__(self, host, retry_in):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {host}; retry in {retry_in:.1f}s")
@@ -0,0 +1,74 @@
+"""
+Schema changes for databases created before a column or index existed.
+
+create_all() only creates missing *tables*, so every change to an existing
+table is a numbered step here. The last applied step is kept in the
+schema_version table; each step must be safe to run on a brand-new
+database too (where create_all already built the column).
+"""
+from sqlalchemy import inspect, text
+from src.cleaners.address_cleaner import AddressCleaner
+
+def _columns(connection, table):
+    return {column["name"] for column in inspect(connection).get_columns(table)}
+
+def _add_address_key(connection):
+    # 1. Column + index
+    if "address_key" not in _columns(connection, "properties"):
+        connection.execute(text("ALTER TABLE properties ADD COLUMN address_key VARCHAR"))
+    connection.execute(text("CREATE INDEX IF NOT EXISTS ix_properties_address_key ON properties (address_key)"))
+    
+    # 2. Backfill existing rows
+    rows = connection.execute(text(
+        "SELECT id, address FROM properties WHERE address_key IS NULL AND address IS NOT NULL"
+    )).fetchall()
+    updates = [{"id": prop_id, "key": AddressCleaner.address_key(address)} for prop_id, address in rows]
+    if updates:
+        connection.execute(text("UPDATE properties SET address_key = :key WHERE id = :id"), updates)
+        print(f"   🔑 Backfilled address keys for {len(updates):,} properties")
+
+# (name, table, columns) -- must match the Index / index=True declarations in models.py
+QUERY_INDEXES = [
+    ("ix_properties_city_zip_code", "properties", ["city", "zip_code"]),
+    ("ix_properties_zip_code", "properties", ["zip_code"]),
+    ("ix_properties_price", "properties", ["price"]),
+    ("ix_properties_source_site", "properties", ["source_site"]),
+    ("ix_properties_updated_at", "properties", ["updated_at"]),
+    ("ix_price_history_property_id_recorded_at", "price_history", ["property_id", "recorded_at"]),
+]
+
+def create_query_indexes(connection):
+    for name, table, columns in QUERY_INDEXES:
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+    # Fresh statistics so the planner actually picks the new indexes
+    connection.execute(text("ANALYZE"))
+
+def drop_query_indexes(connection):
+    """Only for benchmarks (scripts/benchmark_queries.py): back to full table scans."""
+    for name, _, _ in QUERY_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+# (version, description, step) -- append only, never renumber
+MIGRATIONS = [
+    (1, "add properties.address_key", _add_address_key),
+    (2, "index properties city/zip/price/source_site and price_history", create_query_indexes),
+    # Creates only what's missing: ix_properties_updated_at on databases already at v2
+    (3, "index properties.updated_at", create_query_indexes),
+]
+
+def current_version(connection):
+    connection.execute(text("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER NOT NULL)"))
+    return connection.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 0
+
+def migrate(engine):
+    """Applies every migration newer than the database, each in its own transaction."""
+    with engine.begin() as connection:
+        version = current_version(connection)
+    
+    for number, description, step in MIGRATIONS:
+        if number <= version:
+            continue
+        with engine.begin() as connection:
+            step(connection)
+            connection.execute(text("INSERT INTO schema_version (version) VALUES (:version)"), {"version": number})
+        print(f"🔧 Database migrated to v{number}: {description}")
@@ -1,42 +1,86 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, create_engine
-from sqlalchemy.orm import relationship, declarative_base
-from datetime import datetime
-
-Base = declarative_base()
-
-class Property(Base):
-    __tablename__ = 'properties'
-    
-    id = Column(Integer, primary_key=True)
-    address = Column(String)
-    city = Column(String)
-    state = Column(String)
-    zip_code = Column(String)
-    price = Column(Float)
-    bedrooms = Column(Integer)
-    bathrooms = Column(Float)
-    square_feet = Column(Integer)
-    property_type = Column(String)
-    listing_status = Column(String)
-    source_site = Column(String)
-    url = Column(String, unique=True)
-    
-    # --- NEW COLUMNS FOR STEP 7 ---
-    latitude = Column(Float, nullable=True)
-    longitude = Column(Float, nullable=True)
-    # ------------------------------
-    
-    scraped_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow)
-    
-    price_history = relationship("PriceHistory", back_populates="property")
-
-class PriceHistory(Base):
-    __tablename__ = 'price_history'
-    
-    id = Column(Integer, primary_key=True)
-    property_id = Column(Integer, ForeignKey('properties.id'))
-    price = Column(Float)
-    recorded_at = Column(DateTime, default=datetime.utcnow)
-    
-    property = relationship("Property", back_populates="price_history")
\ No newline at end of file
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, create_engine
+from sqlalchemy.orm import relationship, declarative_base
+from datetime import datetime
+from src.cleaners.address_cleaner import AddressCleaner
+
+Base = declarative_base()
+
+class Property(Base):
+    __tablename__ = 'properties'
+    # Dedupe looks listings up by city (and ZIP); the composite index serves both
+    __table_args__ = (
+        Index('ix_properties_city_zip_code', 'city', 'zip_code'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    address = Column(String)
+    city = Column(String)
+    state = Column(String)
+    zip_code = Column(String, index=True)
+    price = Column(Float, index=True)
+    bedrooms = Column(Integer)
+    bathrooms = Column(Float)
+    square_feet = Column(Integer)
+    property_type = Column(String)
+    listing_status = Column(String)
+    source_site = Column(String, index=True)
+    url = Column(String, unique=True)
+    # Normalized address (AddressCleaner.address_key) for exact duplicate lookups
+    address_key = Column(String, index=True, default=lambda context: AddressCleaner.address_key(
+        context.get_current_parameters().get("address")
+    ))
+    
+    # --- NEW COLUMNS FOR STEP 7 ---
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    # ------------------------------
+    
+    scraped_at = Column(DateTime, default=datetime.utcnow)
+    # Indexed: the snapshot and spatial index look for rows changed since their last refresh
+    updated_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    price_history = relationship("PriceHistory", back_populates="property")
+    sources = relationship("ListingSource", back_populates="property")
+
+class PriceHistory(Base):
+    __tablename__ = 'price_history'
+    # "A property's prices, newest first" without scanning the whole table
+    __table_args__ = (
+        Index('ix_price_history_property_id_recorded_at', 'property_id', 'recorded_at'),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    property_id = Column(Integer, ForeignKey('properties.id'))
+    price = Column(Float)
+    recorded_at = Column(DateTime, default=datetime.utcnow)
+    
+    property = relationship("Property", back_populates="price_history")
+
+class ListingSource(Base):
+    """
+    Where a property was seen: one row per source URL when several sites
+    listed the same home in one run (the property keeps the first copy).
+    """
+    __tablename__ = 'listing_sources'
+    
+    id = Column(Integer, primary_key=True)
+    property_id = Column(Integer, ForeignKey('properties.id'), index=True)
+    source_site = Column(String)
+    url = Column(String, unique=True)
+    price = Column(Float)
+    seen_at = Column(DateTime, default=datetime.utcnow)
+    
+    property = relationship("Property", back_populates="sources")
+
+class DuplicateCluster(Base):
+    """
+    One member of a group of listings the offline dedupe job thinks are the
+    same home. canonical_id is the group's oldest listing (lowest id).
+    """
+    __tablename__ = 'duplicate_clusters'
+    
+    id = Column(Integer, primary_key=True)
+    canonical_id = Column(Integer, ForeignKey('properties.id'), index=True)
+    property_id = Column(Integer, ForeignKey('properties.id'), index=True)
+    score = Column(Float)  # best similarity linking this listing into the group
+    detected_at = Column(DateTime, default=datetime.utcnow)
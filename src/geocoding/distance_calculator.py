@@ -0,0 +1,244 @@
+import math
+from datetime import datetime
+import numpy as np
+from sqlalchemy import or_
+from src.core.models import Property
+
+EARTH_RADIUS_KM = 6371.0088
+EARTH_RADIUS_MI = 3958.7613
+RADIUS = {"km": EARTH_RADIUS_KM, "mi": EARTH_RADIUS_MI}
+
+def haversine(lat1, lon1, lat2, lon2, unit="mi"):
+    """
+    Great-circle distance between points given in degrees. Takes scalars or
+    NumPy arrays (broadcast against each other) and never loops in Python.
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIUS[unit] * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+def distance_matrix(lats1, lons1, lats2, lons2, unit="mi"):
+    """(len(1) x len(2)) distances between two sets of points."""
+    return haversine(np.asarray(lats1)[:, None], np.asarray(lons1)[:, None],
+                     np.asarray(lats2)[None, :], np.asarray(lons2)[None, :], unit)
+
+
+class SpatialIndex:
+    """
+    Grid index over listing coordinates for "within X miles" and
+    "k nearest" queries without scanning every row.
+    
+    Points live in NumPy arrays sorted by grid cell (cell_deg degrees
+    square), so each row of cells a query touches is one searchsorted
+    slice; only those candidates get an exact haversine check.
+    
+    New or moved points (add()) go to a small unsorted buffer that every
+    query also scans, and are merged into the sorted arrays once the buffer
+    reaches `merge_at` points, so geocoding more listings never means
+    rebuilding the whole index. refresh() likewise only reads the rows
+    added or updated since the previous refresh.
+    """
+    
+    DEFAULT_CELL_DEG = 0.05   # about 3.5 miles north-south
+    DEFAULT_MERGE_AT = 20000
+
+    def __init__(self, cell_deg=DEFAULT_CELL_DEG, merge_at=DEFAULT_MERGE_AT):
+        self.cell_deg = cell_deg
+        self.merge_at = merge_at
+        self.columns = int(math.ceil(360 / cell_deg))
+        # Sorted by cell code
+        self.codes = np.empty(0, dtype=np.int64)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.lats = np.empty(0, dtype=np.float64)
+        self.lons = np.empty(0, dtype=np.float64)
+        self.alive = np.empty(0, dtype=bool)
+        # Not merged yet
+        self.pending_ids = np.empty(0, dtype=np.int64)
+        self.pending_lats = np.empty(0, dtype=np.float64)
+        self.pending_lons = np.empty(0, dtype=np.float64)
+        self._id_order = None
+        # Where the last refresh() left off
+        self.last_id = 0
+        self.refreshed_at = None
+
+    @classmethod
+    def from_properties(cls, session, **kwargs):
+        """Index of every listing that has coordinates."""
+        index = cls(**kwargs)
+        index.refresh(session)
+        return index
+
+    def __len__(self):
+        return int(self.alive.sum()) + len(self.pending_ids)
+
+    # --- BUILDING ---
+
+    def _cell_codes(self, lats, lons):
+        rows = np.floor((np.clip(lats, -90, 90) + 90) / self.cell_deg).astype(np.int64)
+        cols = np.floor((np.asarray(lons) + 180) / self.cell_deg).astype(np.int64) % self.columns
+        return rows * self.columns + cols
+
+    def add(self, ids, lats, lons):
+        """Adds points, or moves them if their id is already indexed."""
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        lats = np.atleast_1d(np.asarray(lats, dtype=np.float64))
+        lons = np.atleast_1d(np.asarray(lons, dtype=np.float64))
+        keep = ~(np.isnan(lats) | np.isnan(lons))
+        ids, lats, lons = ids[keep], lats[keep], lons[keep]
+        if not len(ids):
+            return
+        # The last copy of a repeated id wins
+        _, last = np.unique(ids[::-1], return_index=True)
+        last = np.sort(len(ids) - 1 - last)
+        ids, lats, lons = ids[last], lats[last], lons[last]
+        
+        # 1. Older positions of these ids no longer count
+        self._forget(ids)
+        stale = np.isin(self.pending_ids, ids)
+        if stale.any():
+            self.pending_ids = self.pending_ids[~stale]
+            self.pending_lats = self.pending_lats[~stale]
+            self.pending_lons = self.pending_lons[~stale]
+        
+        # 2. Into the buffer, merged once it gets big
+        self.pending_ids = np.concatenate((self.pending_ids, ids))
+        self.pending_lats = np.concatenate((self.pending_lats, lats))
+        self.pending_lons = np.concatenate((self.pending_lons, lons))
+        if len(self.pending_ids) >= self.merge_at:
+            self.merge()
+
+    def _forget(self, ids):
+        if not len(self.ids):
+            return
+        if self._id_order is None:
+            self._id_order = np.argsort(self.ids, kind="stable")
+        sorted_ids = self.ids[self._id_order]
+        at = np.searchsorted(sorted_ids, ids)
+        hit = at < len(sorted_ids)
+        hit[hit] = sorted_ids[at[hit]] == ids[hit]
+        self.alive[self._id_order[at[hit]]] = False
+
+    def merge(self):
+        """Folds the buffer into the sorted arrays and drops moved points."""
+        codes = np.concatenate((self.codes[self.alive], self._cell_codes(self.pending_lats, self.pending_lons)))
+        order = np.argsort(codes, kind="stable")
+        self.codes = codes[order]
+        self.ids = np.concatenate((self.ids[self.alive], self.pending_ids))[order]
+        self.lats = np.concatenate((self.lats[self.alive], self.pending_lats))[order]
+        self.lons = np.concatenate((self.lons[self.alive], self.pending_lons))[order]
+        self.alive = np.ones(len(self.ids), dtype=bool)
+        self.pending_ids = np.empty(0, dtype=np.int64)
+        self.pending_lats = np.empty(0, dtype=np.float64)
+        self.pending_lons = np.empty(0, dtype=np.float64)
+        self._id_order = None
+
+    def refresh(self, session, chunk_size=200_000):
+        """
+        Picks up listings geocoded (or re-geocoded) since the last refresh.
+        Only reads rows past the highest id seen so far or stamped with a
+        newer updated_at (every writer sets it), in id order, and only adds
+        the ones that are new or moved. The first refresh reads them all.
+        """
+        started = datetime.utcnow()
+        unseen = Property.id > self.last_id
+        if self.refreshed_at is not None:
+            unseen = or_(unseen, Property.updated_at >= self.refreshed_at)
+        cursor = 0
+        added = 0
+        while True:
+            rows = session.query(Property.id, Property.latitude, Property.longitude).filter(
+                Property.id > cursor, unseen, Property.latitude.isnot(None), Property.longitude.isnot(None)
+            ).order_by(Property.id).limit(chunk_size).all()
+            if not rows:
+                break
+            data = np.array(rows, dtype=np.float64)
+            ids = data[:, 0].astype(np.int64)
+            cursor = int(ids[-1])
+            self.last_id = max(self.last_id, cursor)
+            changed = ~self._has(ids, data[:, 1], data[:, 2])
+            if changed.any():
+                self.add(ids[changed], data[changed, 1], data[changed, 2])
+                added += int(changed.sum())
+        self.merge()
+        self.refreshed_at = started
+        print(f"📐 Spatial index: {len(self):,} points ({added:,} new or moved)")
+        return added
+
+    def _has(self, ids, lats, lons):
+        """True where an id is already indexed (and merged) at exactly these coordinates."""
+        found = np.zeros(len(ids), dtype=bool)
+        if not len(self.ids):
+            return found
+        if self._id_order is None:
+            self._id_order = np.argsort(self.ids, kind="stable")
+        sorted_ids = self.ids[self._id_order]
+        at = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+        position = self._id_order[at]
+        return ((sorted_ids[at] == ids) & self.alive[position]
+                & (self.lats[position] == lats) & (self.lons[position] == lons))
+
+    # --- QUERIES ---
+
+    def _candidates(self, lat, lon, radius_deg_lat, radius_deg_lon):
+        """Positions in the sorted arrays whose cells overlap the search box."""
+        row_lo = int(np.floor((max(lat - radius_deg_lat, -90) + 90) / self.cell_deg))
+        row_hi = int(np.floor((min(lat + radius_deg_lat, 90) + 90) / self.cell_deg))
+        if radius_deg_lon >= 180:
+            col_ranges = [(0, self.columns - 1)]
+        else:
+            col_lo = int(np.floor((lon - radius_deg_lon + 180) / self.cell_deg))
+            col_hi = int(np.floor((lon + radius_deg_lon + 180) / self.cell_deg))
+            if col_hi - col_lo >= self.columns - 1:
+                col_ranges = [(0, self.columns - 1)]
+            else:
+                col_lo, col_hi = col_lo % self.columns, col_hi % self.columns
+                # Crossing the date line splits the box in two
+                col_ranges = [(col_lo, col_hi)] if col_lo <= col_hi else [(col_lo, self.columns - 1), (0, col_hi)]
+        
+        starts, ends = [], []
+        for row in range(row_lo, row_hi + 1):
+            for col_lo, col_hi in col_ranges:
+                starts.append(row * self.columns + col_lo)
+                ends.append(row * self.columns + col_hi)
+        first = np.searchsorted(self.codes, starts, side="left")
+        last = np.searchsorted(self.codes, ends, side="right")
+        slices = [np.arange(a, b) for a, b in zip(first, last) if b > a]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        positions = np.concatenate(slices)
+        return positions[self.alive[positions]]
+
+    def within(self, lat, lon, radius, unit="mi"):
+        """
+        Every point within `radius` of (lat, lon).
+        Returns (ids, distances), nearest first.
+        """
+        radius_deg_lat = math.degrees(radius / RADIUS[unit])
+        cos_lat = math.cos(math.radians(min(abs(lat) + radius_deg_lat, 90.0)))
+        radius_deg_lon = radius_deg_lat / cos_lat if cos_lat > 1e-9 else 360.0
+        
+        positions = self._candidates(lat, lon, radius_deg_lat, radius_deg_lon)
+        ids = np.concatenate((self.ids[positions], self.pending_ids))
+        distances = haversine(lat, lon, np.concatenate((self.lats[positions], self.pending_lats)),
+                              np.concatenate((self.lons[positions], self.pending_lons)), unit)
+        inside = distances <= radius
+        ids, distances = ids[inside], distances[inside]
+        order = np.argsort(distances, kind="stable")
+        return ids[order], distances[order]
+
+    def nearest(self, lat, lon, k=1, unit="mi"):
+        """
+        The k points closest to (lat, lon), as (ids, distances), nearest first.
+        Searches a growing radius, so it stays local wherever points are dense.
+        """
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        # Start at about one cell and double until k points fall inside the circle
+        radius = math.radians(self.cell_deg) * RADIUS[unit]
+        half_earth = math.pi * RADIUS[unit]
+        while True:
+            ids, distances = self.within(lat, lon, radius, unit)
+            if len(ids) >= k or radius >= half_earth:
+                return ids[:k], distances[:k]
+            radius *= 2
@@ -0,0 +1,145 @@
+import re
+import numpy as np
+import pandas as pd
+from src.cleaners.address_cleaner import AddressCleaner
+
+class Gazetteer:
+    """
+    Offline address lookup from local reference files, held in compact
+    NumPy arrays so thousands of lookups a second need no network.
+    
+    zip_path: CSV of ZIP centroids
+        zip,latitude,longitude[,city,state]
+    street_path: optional CSV of street address ranges (like TIGER/Line)
+        zip,street,from_number,to_number,from_lat,from_lon,to_lat,to_lon
+    
+    Answers come with a precision: "street" when a house number falls in
+    a known street range (position interpolated along it), "zip" for a ZIP
+    centroid and "city" for the centroid of a city's ZIPs.
+    """
+    
+    ZIP = re.compile(r'\b(\d{5})(?:-\d{4})?\s*$')
+    UNIT_WORDS = {"apt", "ste", "bldg", "fl"}
+
+    def __init__(self, zip_path=None, street_path=None):
+        self.zips = np.array([], dtype=np.int32)
+        self.zip_coords = np.empty((0, 2), dtype=np.float32)
+        self.cities = {}
+        self.streets = {}
+        self.ranges = np.empty((0, 2), dtype=np.int32)
+        self.range_coords = np.empty((0, 4), dtype=np.float32)
+        if zip_path:
+            self.load_zips(zip_path)
+        if street_path:
+            self.load_streets(street_path)
+
+    # --- LOADING ---
+
+    def load_zips(self, path):
+        df = pd.read_csv(path, dtype={"zip": str})
+        df = df.dropna(subset=["zip", "latitude", "longitude"])
+        df["zip"] = df["zip"].str[:5].astype(np.int32)
+        df = df.sort_values("zip").drop_duplicates("zip")
+        self.zips = df["zip"].to_numpy(np.int32)
+        self.zip_coords = df[["latitude", "longitude"]].to_numpy(np.float32)
+        
+        # City centroids: the mean of the city's ZIP centroids
+        if "city" in df.columns:
+            df["city_key"] = self._city_key(df["city"], df["state"] if "state" in df.columns else "")
+            centroids = df.groupby("city_key")[["latitude", "longitude"]].mean()
+            self.cities = {key: (float(lat), float(lon)) for key, (lat, lon) in centroids.iterrows()}
+        print(f"📍 Gazetteer: {len(self.zips):,} ZIP centroids, {len(self.cities):,} cities")
+
+    def load_streets(self, path):
+        df = pd.read_csv(path, dtype={"zip": str, "street": str})
+        df = df.dropna(subset=["zip", "street", "from_number", "to_number"])
+        df["key"] = df["zip"].str[:5] + "|" + df["street"].map(AddressCleaner.normalize)
+        # Low number first, so each street's ranges are sorted for searchsorted
+        low = df[["from_number", "to_number"]].min(axis=1)
+        high = df[["from_number", "to_number"]].max(axis=1)
+        flip = (df["from_number"] > df["to_number"]).to_numpy()[:, None]
+        from_points = df[["from_lat", "from_lon"]].to_numpy()
+        to_points = df[["to_lat", "to_lon"]].to_numpy()
+        start = np.where(flip, to_points, from_points)
+        end = np.where(flip, from_points, to_points)
+        df = pd.DataFrame({"key": df["key"].to_numpy(), "low": low.to_numpy(), "high": high.to_numpy(),
+                           "lat0": start[:, 0], "lon0": start[:, 1], "lat1": end[:, 0], "lon1": end[:, 1]})
+        df = df.sort_values(["key", "low"]).reset_index(drop=True)
+        
+        # street key -> (first row, last row + 1) into the sorted arrays
+        bounds = df.groupby("key").indices
+        self.streets = {key: (int(rows[0]), int(rows[-1]) + 1) for key, rows in bounds.items()}
+        self.ranges = df[["low", "high"]].to_numpy(np.int32)
+        self.range_coords = df[["lat0", "lon0", "lat1", "lon1"]].to_numpy(np.float32)
+        print(f"📍 Gazetteer: {len(df):,} street ranges on {len(self.streets):,} streets")
+
+    @staticmethod
+    def _city_key(city, state):
+        return (pd.Series(city).astype(str).str.strip().str.lower() + "|"
+                + pd.Series(state).astype(str).str.strip().str.upper()).to_numpy()
+
+    # --- LOOKUPS ---
+
+    def zip_centroid(self, zip_code):
+        if not zip_code or not str(zip_code)[:5].isdigit():
+            return None
+        code = int(str(zip_code)[:5])
+        i = np.searchsorted(self.zips, code)
+        if i < len(self.zips) and self.zips[i] == code:
+            return float(self.zip_coords[i, 0]), float(self.zip_coords[i, 1])
+        return None
+
+    def city_centroid(self, city, state=""):
+        key = f"{(city or '').strip().lower()}|{(state or '').strip().upper()}"
+        return self.cities.get(key)
+
+    def street_point(self, zip_code, street, number):
+        """Interpolates a house number along the street range that contains it."""
+        bounds = self.streets.get(f"{str(zip_code)[:5]}|{street}")
+        if bounds is None:
+            return None
+        first, last = bounds
+        lows = self.ranges[first:last, 0]
+        i = first + np.searchsorted(lows, number, side="right") - 1
+        if i < first or number > self.ranges[i, 1]:
+            return None
+        low, high = self.ranges[i]
+        t = (number - low) / (high - low) if high > low else 0.5
+        lat0, lon0, lat1, lon1 = self.range_coords[i]
+        return float(lat0 + t * (lat1 - lat0)), float(lon0 + t * (lon1 - lon0))
+
+    def parse(self, address_str):
+        """'1234 N Main St, Austin, TX 78701' -> number, street, city, state, zip (any may be None)."""
+        parts = [p.strip() for p in (address_str or "").split(",")]
+        zip_match = self.ZIP.search(parts[-1]) if parts else None
+        zip_code = zip_match.group(1) if zip_match else None
+        state = None
+        if len(parts) >= 3:
+            state = self.ZIP.sub("", parts[-1]).strip() or None
+        city = parts[1] if len(parts) >= 2 and not self.ZIP.fullmatch(parts[1]) else None
+        
+        tokens = AddressCleaner.normalize(parts[0]).split() if parts else []
+        number = int(tokens[0]) if tokens and tokens[0].isdigit() else None
+        street = []
+        for token in tokens[1 if number is not None else 0:]:
+            if token in self.UNIT_WORDS:
+                break
+            street.append(token)
+        return {"number": number, "street": " ".join(street), "city": city, "state": state, "zip": zip_code}
+
+    def lookup(self, address_str):
+        """Returns (lat, lon, precision) using the most precise data available, or None."""
+        parsed = self.parse(address_str)
+        if parsed["zip"]:
+            if parsed["number"] is not None and self.streets:
+                point = self.street_point(parsed["zip"], parsed["street"], parsed["number"])
+                if point:
+                    return point + ("street",)
+            point = self.zip_centroid(parsed["zip"])
+            if point:
+                return point + ("zip",)
+        if parsed["city"]:
+            point = self.city_centroid(parsed["city"], parsed["state"])
+            if point:
+                return point + ("city",)
+        return None
@@ -1,45 +1,125 @@
-from geopy.geocoders import Nominatim
-from geopy.exc import GeocoderTimedOut
-import time
-
-class Geocoder:
-    """
-    Converts text addresses into Latitude/Longitude coordinates.
-    """
-    
-    def __init__(self):
-        # We must provide a unique user_agent to be polite to the free API
-        self.geolocator = Nominatim(user_agent="my_real_estate_project_v1")
-        self.cache = {} # Simple memory cache to avoid repeat calls
-
-    def geocode(self, address_str):
-        """
-        Returns (lat, lon) for a given address string.
-        Returns (None, None) if not found.
-        """
-        # 1. Check Cache first
-        if address_str in self.cache:
-            return self.cache[address_str]
-        
-        try:
-            # 2. Ask the API
-            # We add a small delay to respect the free API's rules (1 request per second)
-            time.sleep(1.1) 
-            
-            print(f"   🗺️ Geocoding: {address_str}...")
-            location = self.geolocator.geocode(address_str, timeout=10)
-            
-            if location:
-                coords = (location.latitude, location.longitude)
-                self.cache[address_str] = coords
-                return coords
-            else:
-                print("   ❌ Location not found.")
-                return None, None
-                
-        except GeocoderTimedOut:
-            print("   ⏳ Geocoding timed out.")
-            return None, None
-        except Exception as e:
-            print(f"   ⚠️ Geocoding Error: {e}")
-            return None, None
\ No newline at end of file
+from geopy.geocoders import Nominatim
+from geopy.exc import GeocoderTimedOut
+from src.geocoding.gazetteer import Gazetteer
+from src.utils.cache import GeocodeCache
+from src.utils.rate_limiter import RateLimiter
+
+class NominatimBackend:
+    """
+    The free OpenStreetMap API: rooftop-level answers, but about one
+    request per second and it needs the network.
+    """
+    
+    name = "nominatim"
+    remote = True
+    DOMAIN = "nominatim.openstreetmap.org"
+    # The free API's rules: at most 1 request per second (with a little margin)
+    RATE = 1 / 1.1
+
+    def __init__(self, user_agent="my_real_estate_project_v1", limiter=None):
+        # We must provide a unique user_agent to be polite to the free API
+        self.geolocator = Nominatim(user_agent=user_agent)
+        # One budget for the whole process, however many threads are geocoding
+        self.limiter = limiter or RateLimiter.shared()
+        if self.limiter.domain_of(self.DOMAIN) not in self.limiter.domain_limits:
+            self.limiter.configure(self.DOMAIN, self.RATE, burst=1)
+
+    def lookup(self, address_str):
+        self.limiter.acquire(self.DOMAIN)
+        
+        print(f"   🗺️ Geocoding: {address_str}...")
+        location = self.geolocator.geocode(address_str, timeout=10)
+        if location:
+            return location.latitude, location.longitude, "rooftop"
+        return None
+
+
+class GazetteerBackend:
+    """
+    Local ZIP-centroid / street-range files (see Gazetteer): no network,
+    thousands of lookups a second, street- or ZIP-level precision.
+    """
+    
+    name = "gazetteer"
+    remote = False
+
+    def __init__(self, gazetteer=None, zip_path=None, street_path=None):
+        self.gazetteer = gazetteer or Gazetteer(zip_path, street_path)
+
+    def lookup(self, address_str):
+        return self.gazetteer.lookup(address_str)
+
+
+class Geocoder:
+    """
+    Converts text addresses into Latitude/Longitude coordinates.
+    
+    Tries its backends in order and takes the first answer that is precise
+    enough, e.g. [GazetteerBackend(...), NominatimBackend()] answers most
+    addresses locally and only calls the API when the local data is too
+    coarse. If nothing is precise enough, the best answer found is used.
+    """
+    
+    # Coarsest to finest
+    PRECISIONS = ["city", "zip", "street", "rooftop"]
+
+    def __init__(self, cache=None, backends=None, precision="zip"):
+        self.backends = backends or [NominatimBackend()]
+        # Persistent cache (data/geocode_cache.db) for answers from remote backends
+        self.cache = cache or GeocodeCache.shared()
+        self.min_precision = self.PRECISIONS.index(precision)
+
+    @classmethod
+    def from_gazetteer(cls, zip_path, street_path=None, fallback=True, **kwargs):
+        """Local gazetteer first; Nominatim only as the fallback (or never, with fallback=False)."""
+        backends = [GazetteerBackend(zip_path=zip_path, street_path=street_path)]
+        if fallback:
+            backends.append(NominatimBackend())
+        return cls(backends=backends, **kwargs)
+
+    def geocode(self, address_str):
+        """
+        Returns (lat, lon) for a given address string.
+        Returns (None, None) if not found.
+        """
+        best = None
+        for backend in self.backends:
+            result = self._lookup(backend, address_str)
+            if result is None:
+                continue
+            if self.PRECISIONS.index(result[2]) >= self.min_precision:
+                return result[0], result[1]
+            if best is None or self.PRECISIONS.index(result[2]) > self.PRECISIONS.index(best[2]):
+                best = result
+        
+        if best:
+            return best[0], best[1]
+        return None, None
+
+    def _lookup(self, backend, address_str):
+        """(lat, lon, precision) from one backend, or None."""
+        if not backend.remote:
+            return backend.lookup(address_str)
+        
+        # 1. Check Cache first (including "we already know it can't be found")
+        cached, coords = self.cache.get(address_str)
+        if cached:
+            return None if coords[0] is None else coords + ("rooftop",)
+        
+        try:
+            # 2. Ask the API
+            result = backend.lookup(address_str)
+            if result:
+                self.cache.store(address_str, result[:2])
+            else:
+                print("   ❌ Location not found.")
+                self.cache.store(address_str, (None, None))
+            return result
+        
+        except GeocoderTimedOut:
+            # Timeouts and errors are temporary, so they are not cached
+            print("   ⏳ Geocoding timed out.")
+            return None
+        except Exception as e:
+            print(f"   ⚠️ Geocoding Error: {e}")
+            return None
@@ -0,0 +1,160 @@
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+from sqlalchemy import bindparam, or_, update
+from src.core.models import Property
+from src.geocoding.distance_calculator import EARTH_RADIUS_KM
+
+def to_unit_vectors(lats, lons):
+    """Lat/lon in degrees -> (n, 3) points on the unit sphere."""
+    lat = np.radians(np.asarray(lats, dtype=np.float64))
+    lon = np.radians(np.asarray(lons, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+def chord_to_km(chord):
+    """Straight-line distance between unit vectors -> great-circle kilometres (inf stays inf)."""
+    chord = np.asarray(chord, dtype=np.float64)
+    return np.where(np.isinf(chord), np.inf, 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0, 1)))
+
+def km_to_chord(km):
+    return 2 * np.sin(np.asarray(km) / (2 * EARTH_RADIUS_KM))
+
+
+class ReverseGeocoder:
+    """
+    Offline coordinates -> labels (ZIP, city, state, neighborhood...).
+    
+    Reference points go into a KD-tree over 3D unit vectors, so "nearest"
+    is the true great-circle nearest (no trouble near the poles or the date
+    line) and a whole array of coordinates is answered in one call.
+    
+    Reference data, either:
+    - a CSV with latitude,longitude plus label columns (the gazetteer's
+      zip,latitude,longitude,city,state file works as-is), or
+    - listings already in the database that have coordinates and labels
+      (ReverseGeocoder.from_properties), which needs no files at all.
+    """
+    
+    # Reference CSV column -> Property column
+    COLUMN_ALIASES = {"zip": "zip_code", "zipcode": "zip_code", "postcode": "zip_code"}
+    LABELS = ["zip_code", "city", "state"]
+
+    def __init__(self, path=None, points=None):
+        self.points = pd.DataFrame(columns=["latitude", "longitude"])
+        self.tree = None
+        if path:
+            points = pd.read_csv(path, dtype=str)
+        if points is not None:
+            self.load(points)
+
+    def load(self, points: pd.DataFrame):
+        """Builds the tree from a DataFrame of latitude, longitude and label columns."""
+        points = points.rename(columns=self.COLUMN_ALIASES)
+        points["latitude"] = pd.to_numeric(points["latitude"], errors="coerce")
+        points["longitude"] = pd.to_numeric(points["longitude"], errors="coerce")
+        points = points.dropna(subset=["latitude", "longitude"]).reset_index(drop=True)
+        if "zip_code" in points.columns:
+            points["zip_code"] = points["zip_code"].str[:5]
+        self.points = points
+        self.tree = cKDTree(to_unit_vectors(points["latitude"], points["longitude"]))
+        print(f"🧭 Reverse geocoder: {len(points):,} reference points")
+        return self
+
+    @classmethod
+    def from_properties(cls, session, labels=None):
+        """Uses every geocoded listing that already has all the labels as a reference point."""
+        labels = labels or cls.LABELS
+        columns = [Property.latitude, Property.longitude] + [getattr(Property, name) for name in labels]
+        query = session.query(*columns).filter(Property.latitude.isnot(None), Property.longitude.isnot(None))
+        for name in labels:
+            query = query.filter(getattr(Property, name).isnot(None), getattr(Property, name) != "")
+        points = pd.DataFrame(query.all(), columns=["latitude", "longitude"] + labels)
+        return cls(points=points)
+
+    @property
+    def labels(self):
+        return [c for c in self.points.columns if c not in ("latitude", "longitude")]
+
+    def query(self, lats, lons, k=1, max_distance_km=None):
+        """
+        Nearest reference points for arrays of coordinates.
+        Returns (distances in km, row indices); rows with no point within
+        max_distance_km get distance inf and index len(points).
+        """
+        if self.tree is None or not len(self.points):
+            raise ValueError("Reverse geocoder has no reference points loaded")
+        bound = km_to_chord(max_distance_km) if max_distance_km is not None else np.inf
+        chord, index = self.tree.query(to_unit_vectors(lats, lons), k=k, distance_upper_bound=bound, workers=-1)
+        return chord_to_km(chord), index
+
+    def lookup(self, lats, lons, columns=None, max_distance_km=None):
+        """
+        DataFrame with the nearest point's labels for every coordinate (in
+        order), plus distance_km. Missing coordinates, or nothing within
+        max_distance_km, give NaN labels.
+        """
+        columns = columns or self.labels
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        result = pd.DataFrame(index=range(len(lats)), columns=columns + ["distance_km"], dtype=object)
+        valid = ~(np.isnan(lats) | np.isnan(lons))
+        if not valid.any():
+            return result
+        
+        distances, index = self.query(lats[valid], lons[valid], max_distance_km=max_distance_km)
+        found = index < len(self.points)
+        rows = np.flatnonzero(valid)[found]
+        labels = self.points[columns].to_numpy(dtype=object)[index[found]]
+        result.loc[rows, columns] = labels
+        result.loc[rows, "distance_km"] = distances[found]
+        return result
+
+    def fill_missing(self, db_manager, columns=None, max_distance_km=10.0, chunk_size=100_000):
+        """
+        Fills empty label columns (default: every label the reference has
+        that Property also has) on geocoded listings. Works through the table
+        in id order, chunk by chunk, with bulk UPDATEs for each chunk.
+        Returns {column: rows filled}.
+        """
+        columns = [c for c in (columns or self.labels) if hasattr(Property, c)]
+        filled = {c: 0 for c in columns}
+        if not columns:
+            return filled
+        table = Property.__table__
+        last_id = 0
+        
+        while True:
+            with db_manager.session_scope() as session:
+                # 1. The next chunk of geocoded listings missing something
+                rows = session.query(Property.id, Property.latitude, Property.longitude,
+                                     *[getattr(Property, c) for c in columns]).filter(
+                    Property.id > last_id,
+                    Property.latitude.isnot(None), Property.longitude.isnot(None),
+                    or_(*[or_(getattr(Property, c).is_(None), getattr(Property, c) == "") for c in columns])
+                ).order_by(Property.id).limit(chunk_size).all()
+                if not rows:
+                    break
+                chunk = pd.DataFrame(rows, columns=["id", "latitude", "longitude"] + columns)
+                last_id = int(chunk["id"].iloc[-1])
+                
+                # 2. One vectorized lookup for the whole chunk
+                found = self.lookup(chunk["latitude"], chunk["longitude"], columns, max_distance_km)
+                
+                # 3. Only empty fields are written; existing values are never overwritten
+                for column in columns:
+                    empty = (chunk[column].isna() | (chunk[column] == "")).to_numpy()
+                    fill = empty & found[column].notna().to_numpy()
+                    if not fill.any():
+                        continue
+                    stmt = update(table).where(table.c.id == bindparam("b_id")).values(
+                        {column: bindparam("b_value"), "updated_at": datetime.utcnow()})
+                    session.execute(stmt, [
+                        {"b_id": int(i), "b_value": value}
+                        for i, value in zip(chunk["id"].to_numpy()[fill], found[column].to_numpy()[fill])
+                    ])
+                    filled[column] += int(fill.sum())
+        
+        print("🧭 Filled " + ", ".join(f"{count:,} {column}" for column, count in filled.items()))
+        return filled
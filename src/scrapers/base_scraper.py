@@ -1,43 +1,71 @@
-import requests
-from abc import ABC, abstractmethod
-from typing import Optional
-from src.utils.rate_limiter import RateLimiter
-from src.utils.retry import retry_request # <--- IMPORT THE NEW TOOL
-
-class BaseScraper(ABC):
-    """
-    Abstract Base Class for all real estate scrapers.
-    """
-    
-    def __init__(self, base_url: str, site_name: str):
-        self.base_url = base_url
-        self.site_name = site_name
-        self.session = requests.Session()
-        
-        self.session.headers.update({
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) RealEstateBot/1.0",
-            "Accept-Language": "en-US,en;q=0.9",
-        })
-
-    @retry_request(max_attempts=3, delay=2) # <--- THIS IS THE SAFETY NET
-    def fetch_page(self, url: str) -> Optional[str]:
-        print(f"🌐 [{self.site_name}] Fetching: {url}")
-        
-        # --- SIMULATION MODE ---
-        if "mock" in url:
-            # We don't print "Simulation Mode" every time to keep logs clean
-            return """<html><body><div class='mock'>Fake Data</div></body></html>"""
-        # -----------------------
-
-        RateLimiter.delay()
-        response = self.session.get(url, timeout=10)
-        response.raise_for_status()
-        return response.text
-
-    @abstractmethod
-    def parse(self, html_content: str):
-        pass
-    
-    @abstractmethod
-    def run(self):
+import requests
+from abc import ABC, abstractmethod
+from typing import Optional
+from src.utils.rate_limiter import RateLimiter
+from src.utils.retry import retry_request # <--- IMPORT THE NEW TOOL
+from src.utils.cache import HttpCache
+from src.utils.metrics import metrics
+
+class BaseScraper(ABC):
+    """
+    Abstract Base Class for all real estate scrapers.
+    """
+    
+    def __init__(self, base_url: str, site_name: str, rate_limiter: Optional[RateLimiter] = None,
+                 http_cache: Optional[HttpCache] = None):
+        self.base_url = base_url
+        self.site_name = site_name
+        self.session = requests.Session()
+        # All scrapers share one limiter so per-domain budgets hold process-wide
+        self.rate_limiter = rate_limiter or RateLimiter.shared()
+        self._http_cache = http_cache
+        
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) RealEstateBot/1.0",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+
+    @retry_request(max_attempts=3, delay=2) # <--- THIS IS THE SAFETY NET
+    def fetch_page(self, url: str) -> Optional[str]:
+        print(f"🌐 [{self.site_name}] Fetching: {url}")
+        
+        with metrics.stage("fetch"):
+            # --- SIMULATION MODE ---
+            if "mock" in url:
+                # We don't print "Simulation Mode" every time to keep logs clean
+                return """<html><body><div class='mock'>Fake Data</div></body></html>"""
+            # -----------------------
+            
+            # 1. Recently cached (e.g. a search page inside its TTL)? No request at all.
+            cache = self.http_cache
+            cached = cache.get(url)
+            if cached and cache.is_fresh(cached):
+                return cache.hit(cached)
+
+            waited = self.rate_limiter.acquire(url)
+            if waited > 0:
+                print(f"⏳ [{self.site_name}] Rate limited for {waited:.2f} seconds...")
+            
+            # 2. Ask the server "has this changed?" instead of downloading it again
+            response = self.session.get(url, timeout=10, headers=cache.conditional_headers(cached))
+            if response.status_code == 304 and cached:
+                return cache.revalidated(cached)
+            
+            response.raise_for_status()
+            cache.store(url, response)
+            return response.text
+
+    @property
+    def http_cache(self) -> HttpCache:
+        # Opened lazily so simulated scrapers never touch the cache file
+        if self._http_cache is None:
+            self._http_cache = HttpCache.shared()
+        return self._http_cache
+
+    @abstractmethod
+    def parse(self, html_content: str):
+        pass
+    
+    @abstractmethod
+    def run(self):
         pass
\ No newline at end of file
@@ -1,45 +1,68 @@
-import random
-import time
-from datetime import datetime
-from src.core.models import Property
-
-class RealtorScraper:
-    """
-    Simulates scraping data from Realtor.com.
-    """
-    def __init__(self, base_url="http://mock-realtor.com", site_name="Realtor.com"):
-        self.base_url = base_url
-        self.site_name = site_name
-
-    def run(self, pages=1):
-        print(f"🔵 [Realtor] Connecting to {self.base_url}...")
-        results = []
-        
-        for page in range(1, pages + 1):
-            time.sleep(0.5)
-            print(f"   📄 Parsing Realtor.com Page {page}...")
-            
-            for _ in range(5):
-                results.append(self._generate_mock_listing())
-                
-        print(f"✅ [Realtor] Finished. Found {len(results)} listings.")
-        return results
-
-    def _generate_mock_listing(self):
-        cities = ["Austin", "Round Rock", "Georgetown"]
-        street_names = ["Congress Ave", "Lamar Blvd", "6th St", "Burnet Rd"]
-        
-        return Property(
-            address=f"{random.randint(100, 9999)} {random.choice(street_names)}",
-            city=random.choice(cities),
-            state="TX",
-            zip_code=f"78{random.randint(100, 999)}",
-            price=float(random.randint(450000, 1200000)), # More expensive
-            bedrooms=random.randint(3, 6),
-            bathrooms=float(random.randint(2, 5)),
-            square_feet=random.randint(2000, 5000),
-            property_type="Single Family",
-            source_site=self.site_name,
-            url=f"http://realtor.com/realestateandhomes-detail/{random.randint(10000,99999)}",
-            scraped_at=datetime.utcnow()
+import random
+import time
+from datetime import datetime
+from src.core.models import Property
+from src.utils.metrics import metrics
+
+class RealtorScraper:
+    """
+    Simulates scraping data from Realtor.com.
+    """
+    
+    # Mock market model (also used by SyntheticDataGenerator)
+    CITIES = ["Austin", "Round Rock", "Georgetown"]
+    STREET_NAMES = ["Congress Ave", "Lamar Blvd", "6th St", "Burnet Rd"]
+    ZIP_PREFIX = "78"
+    PRICE_RANGE = (450000, 1200000) # More expensive
+    BEDROOMS = (3, 6)
+    BATHROOMS = (2, 5)
+    SQFT_RANGE = (2000, 5000)
+    PROPERTY_TYPE = "Single Family"
+
+    def __init__(self, base_url="http://mock-realtor.com", site_name="Realtor.com"):
+        self.base_url = base_url
+        self.site_name = site_name
+
+    def scrape_page(self, page):
+        """
+        Scrapes a single page. Safe to call from several threads at once.
+        """
+        with metrics.stage("fetch"):
+            time.sleep(0.5)
+        print(f"   📄 Parsing Realtor.com Page {page}...")
+        with metrics.stage("parse", rows=5):
+            return [self._generate_mock_listing() for _ in range(5)]
+
+    def iter_pages(self, pages=1):
+        """
+        Streaming mode: yields each page's listings as soon as it is scraped,
+        so callers can process them without holding the whole crawl in memory.
+        """
+        for page in range(1, pages + 1):
+            yield self.scrape_page(page)
+
+    def run(self, pages=1):
+        print(f"🔵 [Realtor] Connecting to {self.base_url}...")
+        results = []
+        
+        for page_results in self.iter_pages(pages):
+            results.extend(page_results)
+                
+        print(f"✅ [Realtor] Finished. Found {len(results)} listings.")
+        return results
+
+    def _generate_mock_listing(self):
+        return Property(
+            address=f"{random.randint(100, 9999)} {random.choice(self.STREET_NAMES)}",
+            city=random.choice(self.CITIES),
+            state="TX",
+            zip_code=f"{self.ZIP_PREFIX}{random.randint(100, 999)}",
+            price=float(random.randint(*self.PRICE_RANGE)),
+            bedrooms=random.randint(*self.BEDROOMS),
+            bathrooms=float(random.randint(*self.BATHROOMS)),
+            square_feet=random.randint(*self.SQFT_RANGE),
+            property_type=self.PROPERTY_TYPE,
+            source_site=self.site_name,
+            url=f"http://realtor.com/realestateandhomes-detail/{random.randint(10000,99999)}",
+            scraped_at=datetime.utcnow()
         )
\ No newline at end of file
@@ -1,33 +1,81 @@
-from src.cleaners.price_cleaner import PriceCleaner
-from src.cleaners.property_cleaner import PropertyCleaner
-from src.core.models import Property
-
-class CleaningService:
-    """
-    The Manager that hires specific janitors to clean parts of the house.
-    """
-    
-    @staticmethod
-    def clean_listing(raw_data: dict) -> dict:
-        """
-        Takes a raw dictionary (from a scraper) and cleans all fields.
-        """
-        cleaned = {}
-        
-        # 1. Clean Price
-        cleaned['price'] = PriceCleaner.clean_price(raw_data.get('price'))
-        
-        # 2. Clean Location
-        cleaned['city'] = PropertyCleaner.clean_city(raw_data.get('city'))
-        cleaned['state'] = PropertyCleaner.clean_state(raw_data.get('state'))
-        cleaned['address'] = raw_data.get('address', 'Unknown Address').strip()
-        
-        # 3. Clean Details
-        cleaned['bedrooms'] = PropertyCleaner.validate_beds_baths(raw_data.get('beds'))
-        cleaned['bathrooms'] = PropertyCleaner.validate_beds_baths(raw_data.get('baths'))
-        cleaned['square_feet'] = PropertyCleaner.validate_beds_baths(raw_data.get('sqft')) # Same logic works for sqft integers
-        
-        # Keep other fields
-        cleaned['url'] = raw_data.get('url')
-        
-        return cleaned
\ No newline at end of file
+import pandas as pd
+from src.cleaners.address_cleaner import AddressCleaner
+from src.cleaners.price_cleaner import PriceCleaner
+from src.cleaners.property_cleaner import PropertyCleaner
+from src.core.models import Property
+from src.utils.parsers import apply_unique
+
+class CleaningService:
+    """
+    The Manager that hires specific janitors to clean parts of the house.
+    """
+    
+    @staticmethod
+    def clean_listing(raw_data: dict) -> dict:
+        """
+        Takes a raw dictionary (from a scraper) and cleans all fields.
+        """
+        cleaned = {}
+        
+        # 1. Clean Price
+        cleaned['price'] = PriceCleaner.clean_price(raw_data.get('price'))
+        
+        # 2. Clean Location
+        cleaned['city'] = PropertyCleaner.clean_city(raw_data.get('city'))
+        cleaned['state'] = PropertyCleaner.clean_state(raw_data.get('state'))
+        cleaned['address'] = raw_data.get('address', 'Unknown Address').strip()
+        cleaned['address_key'] = AddressCleaner.address_key(cleaned['address'])
+        
+        # 3. Clean Details
+        cleaned['bedrooms'] = PropertyCleaner.validate_beds_baths(raw_data.get('beds'))
+        cleaned['bathrooms'] = PropertyCleaner.validate_beds_baths(raw_data.get('baths'))
+        cleaned['square_feet'] = PropertyCleaner.validate_beds_baths(raw_data.get('sqft')) # Same logic works for sqft integers
+        
+        # Keep other fields
+        cleaned['url'] = raw_data.get('url')
+        
+        return cleaned
+
+    @staticmethod
+    def clean_dataframe(raw) -> pd.DataFrame:
+        """
+        Batch version of clean_listing(): cleans every row of a pandas
+        DataFrame (or pyarrow Table) at once with vectorized string ops.
+        
+        Takes the same columns clean_listing() reads (price, city, state,
+        address, beds, baths, sqft, url) and returns the same cleaned columns,
+        row for row. Missing columns and None/NaN cells are treated like a
+        key missing from the raw dict.
+        """
+        if hasattr(raw, "to_pandas"):
+            raw = raw.to_pandas()
+        
+        def column(name):
+            if name in raw.columns:
+                return raw[name]
+            return pd.Series(None, index=raw.index, dtype=object)
+        
+        cleaned = pd.DataFrame(index=raw.index)
+        
+        # Every cleaner runs once per distinct value, not once per row
+        def clean(name, func):
+            return apply_unique(column(name), func)
+        
+        # 1. Clean Price
+        cleaned['price'] = clean('price', PriceCleaner.clean_prices)
+        
+        # 2. Clean Location
+        cleaned['city'] = clean('city', PropertyCleaner.clean_cities)
+        cleaned['state'] = clean('state', PropertyCleaner.clean_states)
+        cleaned['address'] = clean('address', lambda a: a.astype(object).where(a.notna(), 'Unknown Address').astype(str).str.strip())
+        cleaned['address_key'] = AddressCleaner.address_keys(cleaned['address'])
+        
+        # 3. Clean Details
+        cleaned['bedrooms'] = clean('beds', PropertyCleaner.validate_beds_baths_series)
+        cleaned['bathrooms'] = clean('baths', PropertyCleaner.validate_beds_baths_series)
+        cleaned['square_feet'] = clean('sqft', PropertyCleaner.validate_beds_baths_series) # Same logic works for sqft integers
+        
+        # Keep other fields
+        cleaned['url'] = column('url')
+        
+        return cleaned
@@ -0,0 +1,206 @@
+import os
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, insert
+from src.cleaners.address_cleaner import AddressCleaner
+from src.core.models import Property, PriceHistory
+from src.core.enums import PropertyType, ListingStatus, DataSource
+from src.scrapers.zillow_scraper import ZillowScraper
+from src.scrapers.redfin_scraper import RedfinScraper
+from src.scrapers.realtor_scraper import RealtorScraper
+
+class SyntheticDataGenerator:
+    """
+    Builds large, repeatable datasets for benchmarking.
+    
+    Uses the same location and price models as the mock scrapers, but is
+    seeded, vectorized with NumPy and never sleeps. The same seed and row
+    count always produce exactly the same listings and price history.
+    """
+    
+    # Rows are generated in fixed-size blocks, each with its own seeded RNG,
+    # so memory stays flat and output doesn't depend on how it's consumed.
+    BLOCK_SIZE = 100_000
+    
+    STATUSES = [ListingStatus.ACTIVE.value, ListingStatus.PENDING.value, ListingStatus.SOLD.value]
+    STATUS_WEIGHTS = [0.85, 0.10, 0.05]
+    
+    # How many earlier prices each listing has (most have none)
+    HISTORY_COUNTS = [0, 1, 2, 3]
+    HISTORY_WEIGHTS = [0.6, 0.25, 0.1, 0.05]
+
+    def __init__(self, seed=42, as_of=datetime(2025, 1, 1)):
+        self.seed = seed
+        self.as_of = pd.Timestamp(as_of)
+
+    # --- GENERATION ---
+
+    def iter_blocks(self, rows, start_id=1):
+        """
+        Yields (properties_df, history_df) for each block of up to BLOCK_SIZE rows.
+        Property ids run from start_id to start_id + rows - 1.
+        """
+        for block_index, offset in enumerate(range(0, rows, self.BLOCK_SIZE)):
+            n = min(self.BLOCK_SIZE, rows - offset)
+            rng = np.random.default_rng([self.seed, block_index])
+            properties = self._properties(rng, n, start_id + offset)
+            history = self._price_history(rng, properties)
+            yield properties, history
+
+    def _properties(self, rng, n, first_id):
+        site = rng.integers(0, 3, n) # 0 = Zillow, 1 = Redfin, 2 = Realtor
+        is_zillow, is_redfin = site == 0, site == 1
+        ids = np.arange(first_id, first_id + n)
+        
+        # 1. Zillow model: fixed neighborhoods, price driven by square footage
+        loc = rng.integers(0, len(ZillowScraper.LOCATIONS), n)
+        z_city = np.array([l["city"] for l in ZillowScraper.LOCATIONS])[loc]
+        z_zip = np.array([l["zip"] for l in ZillowScraper.LOCATIONS])[loc]
+        z_base = np.array([l["base_price"] for l in ZillowScraper.LOCATIONS])[loc]
+        z_sqft = rng.integers(ZillowScraper.SQFT_RANGE[0], ZillowScraper.SQFT_RANGE[1] + 1, n)
+        z_noise = rng.integers(-ZillowScraper.PRICE_NOISE, ZillowScraper.PRICE_NOISE + 1, n)
+        z_price = np.round(z_base + z_sqft * ZillowScraper.PRICE_PER_SQFT + z_noise, -3)
+        z_street = (
+            pd.Series(np.array(ZillowScraper.STREET_NAMES)[rng.integers(0, len(ZillowScraper.STREET_NAMES), n)])
+            + " "
+            + pd.Series(np.array(ZillowScraper.TYPES)[rng.integers(0, len(ZillowScraper.TYPES), n)])
+        ).to_numpy()
+        z_baths = self._between(rng, ZillowScraper.BATHROOMS, n) + np.where(rng.random(n) > 0.5, 0.5, 0.0)
+        
+        # 2. Redfin / Realtor model: uniform ranges per site
+        def site_columns(scraper):
+            return {
+                "city": np.array(scraper.CITIES)[rng.integers(0, len(scraper.CITIES), n)],
+                "street": np.array(scraper.STREET_NAMES)[rng.integers(0, len(scraper.STREET_NAMES), n)],
+                "zip": np.char.add(scraper.ZIP_PREFIX, rng.integers(100, 1000, n).astype(str)),
+                "price": self._between(rng, scraper.PRICE_RANGE, n).astype(float),
+                "beds": self._between(rng, scraper.BEDROOMS, n),
+                "baths": self._between(rng, scraper.BATHROOMS, n).astype(float),
+                "sqft": self._between(rng, scraper.SQFT_RANGE, n),
+            }
+        redfin, realtor = site_columns(RedfinScraper), site_columns(RealtorScraper)
+        
+        def pick(zillow_values, key):
+            return np.where(is_zillow, zillow_values, np.where(is_redfin, redfin[key], realtor[key]))
+        
+        number = rng.integers(100, 10000, n).astype(str)
+        site_names = np.array([DataSource.ZILLOW.value, "Redfin", "Realtor.com"])[site]
+        url_bases = np.array([
+            "https://zillow.com/homedetails",
+            "http://redfin.com/listing",
+            "http://realtor.com/realestateandhomes-detail",
+        ])[site]
+        
+        # 3. Timestamps: first seen some time in the past year, last changed since then
+        scraped_days = rng.integers(1, 366, n)
+        updated_days = (scraped_days * rng.random(n)).astype(int)
+        
+        address = pd.Series(number) + " " + pd.Series(pick(z_street, "street"))
+        
+        return pd.DataFrame({
+            "id": ids,
+            "address": address,
+            "city": pick(z_city, "city"),
+            "state": "TX",
+            "zip_code": pick(z_zip, "zip"),
+            "price": pick(z_price, "price"),
+            "bedrooms": pick(self._between(rng, ZillowScraper.BEDROOMS, n), "beds"),
+            "bathrooms": pick(z_baths, "baths"),
+            "square_feet": pick(z_sqft, "sqft"),
+            "property_type": np.where(is_zillow, PropertyType.HOUSE.value,
+                                      np.where(is_redfin, RedfinScraper.PROPERTY_TYPE, RealtorScraper.PROPERTY_TYPE)),
+            "listing_status": rng.choice(self.STATUSES, n, p=self.STATUS_WEIGHTS),
+            "source_site": site_names,
+            "url": pd.Series(url_bases) + f"/synthetic-{self.seed}-" + pd.Series(ids.astype(str)),
+            "address_key": AddressCleaner.address_keys(address),
+            "scraped_at": self.as_of - pd.to_timedelta(scraped_days, unit="D"),
+            "updated_at": self.as_of - pd.to_timedelta(updated_days, unit="D"),
+        })
+
+    def _price_history(self, rng, properties):
+        """
+        Earlier prices for some listings, oldest first, the way
+        PropertyService records them: each row is the price *before* a change.
+        Most changes are price cuts, a few are increases.
+        """
+        counts = rng.choice(self.HISTORY_COUNTS, len(properties), p=self.HISTORY_WEIGHTS)
+        owner = np.repeat(np.arange(len(properties)), counts)
+        if len(owner) == 0:
+            return pd.DataFrame(columns=["property_id", "price", "recorded_at"])
+        
+        # Step k back in time multiplies the price by (1 + change); walk back from today's price
+        change = rng.uniform(-0.03, 0.08, len(owner))
+        steps_back = pd.Series(np.log1p(change)).groupby(owner).cumsum().to_numpy()
+        current = properties["price"].to_numpy()[owner]
+        old_price = np.round(current * np.exp(steps_back), -3)
+        
+        # Each earlier price was recorded 1-30 days before the next one
+        gaps = pd.Series(rng.integers(1, 31, len(owner))).groupby(owner).cumsum().to_numpy()
+        updated = properties["updated_at"].to_numpy()[owner]
+        
+        history = pd.DataFrame({
+            "property_id": properties["id"].to_numpy()[owner],
+            "price": old_price,
+            "recorded_at": updated - pd.to_timedelta(gaps, unit="D").to_numpy(),
+        })
+        return history.sort_values(["property_id", "recorded_at"], kind="stable").reset_index(drop=True)
+
+    @staticmethod
+    def _between(rng, bounds, n):
+        """Random integers in [low, high], inclusive like random.randint."""
+        return rng.integers(bounds[0], bounds[1] + 1, n)
+
+    # --- OUTPUT ---
+
+    def to_parquet(self, rows, output_dir):
+        """
+        Writes properties.parquet and price_history.parquet into output_dir.
+        Returns the two file paths.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        os.makedirs(output_dir, exist_ok=True)
+        paths = (os.path.join(output_dir, "properties.parquet"), os.path.join(output_dir, "price_history.parquet"))
+        writers = [None, None]
+        try:
+            for properties, history in self.iter_blocks(rows):
+                for i, df in enumerate((properties, history)):
+                    table = pa.Table.from_pandas(df, preserve_index=False)
+                    if writers[i] is None:
+                        writers[i] = pq.ParquetWriter(paths[i], table.schema)
+                    writers[i].write_table(table.cast(writers[i].schema))
+        finally:
+            for writer in writers:
+                if writer is not None:
+                    writer.close()
+        print(f"📦 Wrote {rows:,} synthetic listings to {output_dir}")
+        return paths
+
+    def to_database(self, db_manager, rows):
+        """
+        Bulk-inserts listings and their price history, one transaction per block.
+        New ids start after the current highest property id.
+        """
+        with db_manager.session_scope() as session:
+            start_id = (session.query(func.max(Property.id)).scalar() or 0) + 1
+        
+        written = 0
+        for properties, history in self.iter_blocks(rows, start_id=start_id):
+            with db_manager.session_scope() as session:
+                session.execute(insert(Property.__table__), self._records(properties))
+                if not history.empty:
+                    session.execute(insert(PriceHistory.__table__), self._records(history))
+            written += len(properties)
+            print(f"   💾 Inserted {written:,}/{rows:,} synthetic listings...")
+        return written
+
+    @staticmethod
+    def _records(df):
+        """DataFrame -> list of dicts with plain Python values SQLite understands."""
+        df = df.astype(object)
+        for column in df.columns:
+            if column.endswith("_at"):
+                df[column] = [ts.to_pydatetime() for ts in df[column]]
+        return df.to_dict("records")
@@ -0,0 +1,280 @@
+import os
+import time
+from datetime import datetime
+from multiprocessing import Pool
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+from sqlalchemy import insert
+from src.cleaners.address_cleaner import AddressCleaner
+from src.core.database import DatabaseManager
+from src.core.models import Property, DuplicateCluster
+from src.services.property_service import PropertyService
+
+# Universal hashing modulo a Mersenne prime: (a * x + b) % P fits in uint64
+_PRIME = np.uint64((1 << 31) - 1)
+
+def _permutations(num_perm, seed):
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_PRIME), num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_PRIME), num_perm, dtype=np.uint64)
+    return a, b
+
+def _shingles(keys):
+    """
+    Character 3-grams of every key as uint32 codes, built from one byte
+    buffer with no per-key Python work. Returns (codes, row offsets).
+    """
+    padded = [f" {key} " for key in keys]
+    lengths = np.fromiter((len(p) for p in padded), dtype=np.int64, count=len(padded))
+    buffer = np.frombuffer("".join(padded).encode("ascii", "replace"), dtype=np.uint8).astype(np.uint32)
+    
+    # Every 3-byte window of the buffer, then drop windows that straddle two keys
+    codes = (buffer[:-2] << 16) | (buffer[1:-1] << 8) | buffer[2:]
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    counts = lengths - 2
+    row = np.repeat(np.arange(len(keys)), counts)
+    position = starts[row] + (np.arange(len(row)) - np.repeat(np.cumsum(counts) - counts, counts))
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return codes[position], offsets
+
+def _signatures(args):
+    """MinHash signatures (rows x num_perm, uint32) for a chunk of keys. Runs in a worker process."""
+    keys, num_perm, seed = args
+    a, b = _permutations(num_perm, seed)
+    codes, offsets = _shingles(keys)
+    hashed = (a[:, None] * codes[None, :].astype(np.uint64) + b[:, None]) % _PRIME
+    return np.minimum.reduceat(hashed, offsets, axis=1).T.astype(np.uint32)
+
+def _connected_components(n, left, right):
+    """Union-find over edge arrays, vectorized: returns each row's lowest connected row."""
+    parent = np.arange(n)
+    while True:
+        low = np.minimum(parent[left], parent[right])
+        np.minimum.at(parent, parent[left], low)
+        np.minimum.at(parent, parent[right], low)
+        # Pointer jumping until every row points straight at its root
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+        if np.array_equal(parent[left], parent[right]):
+            return parent
+
+
+class DedupeJob:
+    """
+    Offline dedupe over the whole properties table.
+    
+    Insert-time dedupe only sees one city, so duplicates already in the table
+    (or listed under another city spelling) slip through. This job:
+    
+    1. shingles every normalized address into character 3-grams
+    2. builds MinHash signatures (in parallel, one chunk per process)
+    3. buckets them with LSH banding, so only colliding rows become pairs
+    4. fuzzy-scores just those pairs (rapidfuzz, all cores)
+    5. joins matches into clusters and writes them to duplicate_clusters
+    
+    No step compares all rows against each other, so millions of rows fit
+    on one machine.
+    """
+    
+    # 16 bands x 4 rows: pairs with Jaccard ~0.5+ on 3-grams are very likely to collide
+    NUM_PERM = 64
+    BANDS = 16
+    # Rows this close in a band's sorted order become candidate pairs (caps huge buckets)
+    WINDOW = 20
+    CHUNK_SIZE = 10000
+
+    def __init__(self, db_manager=None, threshold=85, num_perm=NUM_PERM, bands=BANDS, window=WINDOW,
+                 workers=None, chunk_size=CHUNK_SIZE, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.db = db_manager or DatabaseManager()
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.window = window
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.seed = seed
+
+    def run(self, write=True):
+        """Runs the whole job; returns a report of counts and timings."""
+        timings = {}
+        
+        def timed(name, func, *args):
+            started = time.perf_counter()
+            result = func(*args)
+            timings[name] = round(time.perf_counter() - started, 3)
+            return result
+        
+        self._pairs_considered = 0
+        listings = timed("load", self._load)
+        if len(listings) < 2:
+            return self._finish({"rows": len(listings), "candidate_pairs": 0, "matched_pairs": 0,
+                                 "clusters": 0, "duplicates": 0}, timings)
+        keys = listings["address_key"].tolist()
+        signatures = timed("minhash", self._minhash, keys)
+        left, right = timed("lsh", self._candidate_pairs, signatures, listings)
+        left, right, scores = timed("score", self._score, listings, left, right)
+        clusters = timed("cluster", self._clusters, listings, left, right, scores)
+        if write:
+            timed("write", self._write, clusters)
+        
+        report = {
+            "rows": len(listings),
+            "candidate_pairs": self._pairs_considered,
+            "matched_pairs": len(scores),
+            "clusters": int(clusters["canonical_id"].nunique()) if len(clusters) else 0,
+            "duplicates": int((clusters["property_id"] != clusters["canonical_id"]).sum()) if len(clusters) else 0,
+        }
+        return self._finish(report, timings)
+
+    # --- STEPS ---
+
+    def _load(self):
+        columns = ["id", "address", "address_key", "zip_code", "city", "state"]
+        with self.db.session_scope() as session:
+            # Keyset-paged, so the driver never buffers the whole table at once
+            chunks = [pd.DataFrame(chunk, columns=columns) for chunk in
+                      PropertyService(session).iter_chunks(columns, chunk_size=self.chunk_size * 5)]
+        listings = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=columns)
+        # Rows saved before keys existed (or with odd addresses) get keyed here
+        missing = listings["address_key"].isna()
+        listings.loc[missing, "address_key"] = AddressCleaner.address_keys(listings.loc[missing, "address"])
+        listings = listings[listings["address_key"].notna()].reset_index(drop=True)
+        listings["house_number"] = listings["address_key"].str.extract(r"^(\d+)", expand=False).fillna("")
+        listings["zip_code"] = listings["zip_code"].fillna("")
+        # "St. Louis", "st louis MO" -> "st louis"; blocks pairs like insert-time dedupe does
+        listings["city_key"] = (listings["city"].fillna("").str.lower()
+                                .str.replace(r"[^a-z0-9]+", " ", regex=True).str.strip()
+                                .str.replace(r"(?<=\S) [a-z]{2}$", "", regex=True))
+        listings["state"] = listings["state"].fillna("").str.strip().str.upper()
+        print(f"📥 Loaded {len(listings):,} keyed listings")
+        return listings
+
+    def _minhash(self, keys):
+        chunks = [(keys[i:i + self.chunk_size], self.num_perm, self.seed)
+                  for i in range(0, len(keys), self.chunk_size)]
+        if self.workers > 1 and len(chunks) > 1:
+            with Pool(min(self.workers, len(chunks))) as pool:
+                parts = pool.map(_signatures, chunks)
+        else:
+            parts = [_signatures(chunk) for chunk in chunks]
+        return np.vstack(parts)
+
+    def _candidate_pairs(self, signatures, listings):
+        """
+        LSH banding: rows whose band hashes collide become candidate pairs.
+        The house number is mixed into every bucket (a match needs the same
+        number anyway), which keeps "12 Oak St" and "13 Oak St" apart.
+        Inside a band's sorted order only rows within `window` of each other
+        are paired, so one enormous bucket can't explode into n^2 pairs.
+        """
+        n = len(signatures)
+        rows_per_band = self.num_perm // self.bands
+        # Ties inside a bucket are broken by key, so near-identical keys sit side by side
+        key_rank = pd.factorize(listings["address_key"], sort=True)[0]
+        house = pd.factorize(listings["house_number"])[0].astype(np.uint64)
+        mixers = np.random.default_rng(self.seed).integers(1, 1 << 62, rows_per_band + 1, dtype=np.uint64) | np.uint64(1)
+        
+        pair_codes = []
+        for band in range(self.bands):
+            columns = signatures[:, band * rows_per_band:(band + 1) * rows_per_band].astype(np.uint64)
+            # Wrapping multiply-add hash of the band's rows
+            bucket = (columns * mixers[:-1]).sum(axis=1, dtype=np.uint64) + house * mixers[-1]
+            order = np.lexsort((key_rank, bucket))
+            sorted_bucket = bucket[order]
+            for distance in range(1, min(self.window, n)):
+                same = sorted_bucket[:-distance] == sorted_bucket[distance:]
+                if not same.any():
+                    break
+                i, j = order[:-distance][same], order[distance:][same]
+                low, high = np.minimum(i, j), np.maximum(i, j)
+                pair_codes.append(low.astype(np.int64) * n + high)
+        
+        if not pair_codes:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        codes = np.unique(np.concatenate(pair_codes))
+        self._pairs_considered = len(codes)
+        print(f"🪣 LSH: {len(codes):,} candidate pairs out of {n * (n - 1) // 2:,} possible")
+        return codes // n, codes % n
+
+    def _score(self, listings, left, right):
+        """
+        Same rules as insert-time dedupe: same state, same city (allowing a
+        typo like "Austn"), same house number, compatible ZIPs, and an address
+        score >= threshold.
+        """
+        house = listings["house_number"].to_numpy()
+        zips = listings["zip_code"].to_numpy()
+        states = listings["state"].to_numpy()
+        cities = listings["city_key"].to_numpy()
+        compatible = (house[left] == house[right]) & (states[left] == states[right]) & (
+            (zips[left] == "") | (zips[right] == "") | (zips[left] == zips[right])
+        )
+        left, right = left[compatible], right[compatible]
+        
+        # Different city keys only pass if the names are near-identical spellings
+        differs = cities[left] != cities[right]
+        if differs.any():
+            city_scores = process.cpdist(cities[left[differs]], cities[right[differs]], scorer=fuzz.ratio,
+                                         score_cutoff=self.threshold - 0.5, dtype=np.float64, workers=-1)
+            same_city = np.ones(len(left), dtype=bool)
+            same_city[differs] = np.round(city_scores) >= self.threshold
+            left, right = left[same_city], right[same_city]
+        if not len(left):
+            return left, right, np.array([])
+        
+        keys = listings["address_key"].to_numpy()
+        scores = process.cpdist(keys[left], keys[right], scorer=fuzz.token_sort_ratio,
+                                score_cutoff=self.threshold - 0.5, dtype=np.float64, workers=-1)
+        matched = np.round(scores) >= self.threshold
+        print(f"🎯 {matched.sum():,} of {len(scores):,} scored pairs are duplicates")
+        return left[matched], right[matched], scores[matched]
+
+    def _clusters(self, listings, left, right, scores):
+        """DataFrame of (canonical_id, property_id, score) for every listing in a group of 2+."""
+        if not len(left):
+            return pd.DataFrame(columns=["canonical_id", "property_id", "score"])
+        root = _connected_components(len(listings), left, right)
+        members = np.unique(np.concatenate([left, right]))
+        
+        # Each member's best link score (the canonical listing gets 100)
+        best = pd.concat([
+            pd.Series(scores, index=left), pd.Series(scores, index=right)
+        ]).groupby(level=0).max()
+        
+        ids = listings["id"].to_numpy()
+        # Rows are sorted by id, so the root (lowest row) is the oldest listing
+        clusters = pd.DataFrame({
+            "canonical_id": ids[root[members]],
+            "property_id": ids[members],
+            "score": best.reindex(members).to_numpy(),
+        })
+        clusters.loc[clusters["canonical_id"] == clusters["property_id"], "score"] = 100.0
+        return clusters
+
+    def _write(self, clusters):
+        """Replaces the previous run's clusters."""
+        now = datetime.utcnow()
+        with self.db.session_scope() as session:
+            session.query(DuplicateCluster).delete()
+            records = [
+                {"canonical_id": int(c), "property_id": int(p), "score": float(s), "detected_at": now}
+                for c, p, s in clusters.itertuples(index=False)
+            ]
+            for i in range(0, len(records), 50000):
+                session.execute(insert(DuplicateCluster.__table__), records[i:i + 50000])
+        print(f"💾 Wrote {len(clusters):,} cluster rows")
+
+    @staticmethod
+    def _finish(report, timings):
+        report["seconds"] = timings
+        print(f"\n🧬 Dedupe job: {report['rows']:,} listings, {report['candidate_pairs']:,} candidate pairs, "
+              f"{report['matched_pairs']:,} matches, {report['clusters']:,} clusters "
+              f"({report['duplicates']:,} duplicates)")
+        print(f"   ⏱️ " + ", ".join(f"{step} {seconds}s" for step, seconds in timings.items()))
+        return report
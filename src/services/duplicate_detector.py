@@ -1,49 +1,223 @@
-from sqlalchemy.orm import Session
-from src.core.models import Property
-from thefuzz import fuzz
-
-class DuplicateDetector:
-    """
-    Uses fuzzy logic to find properties that look the same 
-    but have slightly different spelling.
-    """
-    
-    def __init__(self, session: Session):
-        self.session = session
-
-    def find_potential_duplicate(self, new_address, city, threshold=85):
-        """
-        Checks if a similar address already exists in the same city.
-        Returns the existing Property object if found, else None.
-        
-        threshold=85 means "85% similar".
-        """
-        # 1. Filter by City first (Optimization to avoid checking every house in the world)
-        # We perform a rough database search first
-        candidates = self.session.query(Property).filter(
-            Property.city == city
-        ).all()
-        
-        if not candidates:
-            return None
-
-        # 2. Check Fuzzy Similarity on Address
-        best_match = None
-        highest_score = 0
-        
-        for candidate in candidates:
-            # Calculate similarity score (0 to 100)
-            score = fuzz.token_sort_ratio(new_address, candidate.address)
-            
-            if score > highest_score:
-                highest_score = score
-                best_match = candidate
-        
-        # 3. Decision
-        if highest_score >= threshold:
-            print(f"   ⚠️ Potential Duplicate Found (Score: {highest_score}%)")
-            print(f"      New: {new_address}")
-            print(f"      Old: {best_match.address}")
-            return best_match
-            
-        return None
\ No newline at end of file
+import re
+import threading
+from collections import defaultdict
+import numpy as np
+from rapidfuzz import fuzz as rapid_fuzz, process
+from sqlalchemy.orm import Session
+from src.cleaners.address_cleaner import AddressCleaner
+from src.core.models import Property
+from thefuzz import fuzz, utils
+
+class AddressIndex:
+    """
+    In-memory blocking index over the properties table.
+    
+    Listings are grouped by (city, house number), so a new listing is only
+    fuzzy-matched against the handful of homes on the same number in the
+    same city instead of every home in the city. "1234 Main St" and
+    "1243 Main St" are different houses, so they never need comparing.
+    
+    It also maps (city, normalized address key) to listings, so an exact
+    match after normalization is a dict lookup with no scoring at all.
+    
+    Load it once per run with AddressIndex.load(session) and add() listings
+    as they are saved. Safe to share between threads.
+    """
+    
+    HOUSE_NUMBER = re.compile(r'^\s*(\d+)')
+
+    def __init__(self):
+        # (city, house number) -> [(id, url, address, zip_code)]
+        self.blocks = defaultdict(list)
+        # (city, address_key) -> [(id, url, address, zip_code)]
+        self.keys = defaultdict(list)
+        self.size = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, session: Session, chunk_size=10000):
+        """Builds the index from the database (a single column-only scan)."""
+        index = cls()
+        rows = session.query(
+            Property.id, Property.url, Property.address, Property.city, Property.zip_code, Property.address_key
+        ).yield_per(chunk_size)
+        for prop_id, url, address, city, zip_code, address_key in rows:
+            index.add(address, city, zip_code, url=url, prop_id=prop_id, address_key=address_key)
+        return index
+
+    @classmethod
+    def block_key(cls, address, city):
+        match = cls.HOUSE_NUMBER.match(address or "")
+        return (city, match.group(1) if match else None)
+
+    def add(self, address, city, zip_code=None, url=None, prop_id=None, address_key=None):
+        entry = (prop_id, url, address, zip_code)
+        address_key = address_key or AddressCleaner.address_key(address)
+        with self.lock:
+            self.blocks[self.block_key(address, city)].append(entry)
+            if address_key:
+                self.keys[(city, address_key)].append(entry)
+            self.size += 1
+
+    def add_listing(self, prop: Property):
+        self.add(prop.address, prop.city, prop.zip_code, url=prop.url, prop_id=prop.id,
+                 address_key=prop.address_key)
+
+    def exact(self, address, city, zip_code=None):
+        """First listing whose normalized address matches exactly (ZIP rules as in candidates())."""
+        address_key = AddressCleaner.address_key(address)
+        if not address_key:
+            return None
+        with self.lock:
+            matches = list(self.keys.get((city, address_key), ()))
+        for entry in matches:
+            if not zip_code or not entry[3] or entry[3] == zip_code:
+                return entry
+        return None
+
+    def block(self, key):
+        with self.lock:
+            return list(self.blocks.get(key, ()))
+
+    def candidates(self, address, city, zip_code=None):
+        """Entries in the same block; ZIP must agree when both sides have one."""
+        block = self.block(self.block_key(address, city))
+        if zip_code:
+            block = [e for e in block if not e[3] or e[3] == zip_code]
+        return block
+
+
+class DuplicateDetector:
+    """
+    Uses fuzzy logic to find properties that look the same 
+    but have slightly different spelling.
+    """
+    
+    def __init__(self, session: Session, index: AddressIndex = None):
+        self.session = session
+        self._index = index
+
+    @property
+    def index(self) -> AddressIndex:
+        # Built on first use when no shared index was passed in
+        if self._index is None:
+            self._index = AddressIndex.load(self.session)
+        return self._index
+
+    def find_potential_duplicate(self, new_address, city, threshold=85, zip_code=None):
+        """
+        Checks if a similar address already exists in the same city.
+        Returns the existing Property object if found, else None.
+        
+        threshold=85 means "85% similar".
+        """
+        # 1. Same address once normalized ("N Main St" == "North Main Street")? Just a dict lookup.
+        exact = self.index.exact(new_address, city, zip_code)
+        if exact:
+            print(f"   ⚠️ Exact Duplicate Found: '{new_address}' == '{exact[2]}'")
+            return self._fetch(exact)
+        
+        # 2. Otherwise only look at homes with the same house number in the same city (and ZIP)
+        candidates = self.index.candidates(new_address, city, zip_code)
+        
+        if not candidates:
+            return None
+
+        # 3. Check Fuzzy Similarity on Address
+        best_match = None
+        highest_score = 0
+        
+        for candidate in candidates:
+            # Calculate similarity score (0 to 100)
+            score = fuzz.token_sort_ratio(new_address, candidate[2])
+            
+            if score > highest_score:
+                highest_score = score
+                best_match = candidate
+        
+        # 4. Decision
+        if highest_score >= threshold:
+            print(f"   ⚠️ Potential Duplicate Found (Score: {highest_score}%)")
+            print(f"      New: {new_address}")
+            print(f"      Old: {best_match[2]}")
+            return self._fetch(best_match)
+            
+        return None
+
+    # Below this many pairs, spreading a block over threads costs more than it saves
+    PARALLEL_MIN_PAIRS = 50000
+
+    def find_duplicates_batch(self, listings, threshold=85, workers=-1):
+        """
+        Batch version of find_potential_duplicate() for a list of Property
+        objects. Returns one entry per listing: the matching Property or None.
+        
+        Exact address-key matches are resolved first. The rest are grouped
+        by block, and each block is scored in a single
+        rapidfuzz cdist() call (rows x candidates) instead of a Python loop.
+        Strings are preprocessed and scores rounded the same way thefuzz
+        does, so the accept/reject decisions match the single-listing path.
+        Listings are only compared against the index, not against each other.
+        """
+        best = [None] * len(listings)
+        
+        # 1. Exact key matches first; only the misses are grouped by block for scoring
+        groups = defaultdict(list)
+        for row, listing in enumerate(listings):
+            best[row] = self.index.exact(listing.address, listing.city, listing.zip_code)
+            if best[row] is None:
+                groups[self.index.block_key(listing.address, listing.city)].append(row)
+        
+        for key, rows in groups.items():
+            candidates = [e for e in self.index.block(key) if e[2] is not None]
+            rows = [r for r in rows if listings[r].address is not None]
+            if not candidates or not rows:
+                continue
+            
+            # 2. Score the whole block at once; anything that can't round up to the threshold is 0
+            scores = process.cdist(
+                [utils.full_process(listings[r].address, force_ascii=True) for r in rows],
+                [utils.full_process(e[2], force_ascii=True) for e in candidates],
+                scorer=rapid_fuzz.token_sort_ratio,
+                score_cutoff=max(threshold - 0.5, 0),
+                dtype=np.float64,
+                workers=workers if len(rows) * len(candidates) >= self.PARALLEL_MIN_PAIRS else 1,
+            )
+            # thefuzz reports int(round(score)); numpy rounds half to even just like round()
+            scores = np.round(scores)
+            
+            # 3. ZIPs must agree when both sides have one
+            row_zips = np.array([listings[r].zip_code or "" for r in rows])
+            candidate_zips = np.array([e[3] or "" for e in candidates])
+            zip_ok = ((row_zips[:, None] == "") | (candidate_zips[None, :] == "")
+                      | (row_zips[:, None] == candidate_zips[None, :]))
+            scores[~zip_ok] = 0
+            
+            # 4. First highest-scoring candidate wins, like the loop in find_potential_duplicate
+            top = scores.argmax(axis=1)
+            for i, r in enumerate(rows):
+                if scores[i, top[i]] >= threshold:
+                    best[r] = candidates[top[i]]
+        
+        return self._fetch_many(best)
+
+    def _fetch_many(self, entries):
+        """Loads the Properties for a list of index entries (None stays None)."""
+        ids = list({e[0] for e in entries if e is not None and e[0] is not None})
+        urls = list({e[1] for e in entries if e is not None and e[0] is None})
+        by_id, by_url = {}, {}
+        for i in range(0, len(ids), 500):
+            for prop in self.session.query(Property).filter(Property.id.in_(ids[i:i + 500])):
+                by_id[prop.id] = prop
+        for i in range(0, len(urls), 500):
+            for prop in self.session.query(Property).filter(Property.url.in_(urls[i:i + 500])):
+                by_url[prop.url] = prop
+        return [None if e is None else by_id.get(e[0]) if e[0] is not None else by_url.get(e[1])
+                for e in entries]
+
+    def _fetch(self, entry):
+        prop_id, url, _, _ = entry
+        if prop_id is not None:
+            return self.session.get(Property, prop_id)
+        # Saved during this run through the bulk path, so only the URL is known
+        return self.session.query(Property).filter_by(url=url).first()
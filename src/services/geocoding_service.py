@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from sqlalchemy import bindparam, update
+from src.core.models import Property
+from src.geocoding.geocoder import Geocoder
+from src.utils.cache import GeocodeCache
+
+class GeocodingService:
+    """
+    Geocodes addresses in the background and hands back futures.
+    
+    Callers never wait on the API: submit() returns at once, the same
+    address (after normalization) is only looked up once per service, and
+    the remote rate budget is shared by every worker (see NominatimBackend),
+    so more workers only help the cached and local lookups.
+    
+    backfill() writes the answers to saved listings with bulk UPDATEs, so
+    listings can be saved first and get their coordinates later.
+    """
+    
+    DEFAULT_WORKERS = 4
+    BACKFILL_BATCH = 500
+
+    def __init__(self, geocoder=None, workers=DEFAULT_WORKERS):
+        self.geocoder = geocoder or Geocoder()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="geocode")
+        self.futures = {}
+        self.stats = {"submitted": 0, "deduped": 0, "found": 0, "not_found": 0, "backfilled": 0}
+        self.lock = threading.Lock()
+
+    def submit(self, address_str):
+        """Returns a Future of (lat, lon); (None, None) if the address can't be found."""
+        key = GeocodeCache.normalize_key(address_str)
+        with self.lock:
+            self.stats["submitted"] += 1
+            future = self.futures.get(key)
+            if future is not None:
+                self.stats["deduped"] += 1
+                return future
+            future = self.executor.submit(self._geocode, address_str)
+            self.futures[key] = future
+            return future
+
+    def submit_many(self, addresses):
+        """Batch form of submit(): one future per address, in order."""
+        return [self.submit(address) for address in addresses]
+
+    def _geocode(self, address_str):
+        try:
+            coords = self.geocoder.geocode(address_str)
+        except Exception as e:
+            print(f"   ⚠️ Geocoding Error: {e}")
+            coords = (None, None)
+        with self.lock:
+            self.stats["found" if coords[0] is not None else "not_found"] += 1
+        return coords
+
+    def backfill(self, db_manager, pending, batch_size=BACKFILL_BATCH):
+        """
+        Writes coordinates to saved listings as their lookups finish.
+        
+        pending: iterable of (url, future) pairs
+        Returns how many listings were updated.
+        """
+        futures = {}
+        for url, future in pending:
+            futures.setdefault(future, []).append(url)
+        
+        stmt = (
+            update(Property.__table__)
+            .where(Property.__table__.c.url == bindparam("b_url"))
+            .values(latitude=bindparam("b_lat"), longitude=bindparam("b_lon"))
+        )
+        rows = []
+        updated = 0
+        with db_manager.session_scope() as session:
+            for future in as_completed(futures):
+                lat, lon = future.result()
+                if lat is None:
+                    continue
+                rows.extend({"b_url": url, "b_lat": lat, "b_lon": lon} for url in futures[future])
+                if len(rows) >= batch_size:
+                    updated += self._write(session, stmt, rows)
+            if rows:
+                updated += self._write(session, stmt, rows)
+        
+        with self.lock:
+            self.stats["backfilled"] += updated
+        print(f"   📍 Backfilled coordinates for {updated} listings")
+        return updated
+
+    @staticmethod
+    def _write(session, stmt, rows):
+        # Stamped at write time, so the analytics snapshot sees the change
+        session.execute(stmt.values(updated_at=datetime.utcnow()), rows)
+        session.commit()
+        count = len(rows)
+        rows.clear()
+        return count
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats, unique=len(self.futures))
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait)
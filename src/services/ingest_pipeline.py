@@ -0,0 +1,417 @@
+import queue
+import threading
+import time
+from src.core.database import DatabaseManager
+from src.geocoding.geocoder import Geocoder
+from src.services.cleaning_service import CleaningService
+from src.services.duplicate_detector import AddressIndex, DuplicateDetector
+from src.services.geocoding_service import GeocodingService
+from src.services.listing_merger import ListingMerger
+from src.services.property_service import PropertyService
+from src.services.scraping_service import ScrapingService
+from src.services.snapshot_service import SnapshotService
+from src.utils.metrics import Profiler, metrics
+
+# Tells a stage's workers that nothing more is coming
+_DONE = object()
+# Returned by a handler that keeps the item for the stage's release()
+_HELD = object()
+
+
+class Stage:
+    """
+    One step of the pipeline: a bounded inbox plus a few worker threads.
+    
+    A full inbox blocks whoever is feeding it (backpressure), so a slow stage
+    slows its producers down instead of letting a queue grow without limit.
+    """
+    
+    def __init__(self, name, workers=1, queue_size=100):
+        self.name = name
+        self.workers = workers
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.queue_size = queue_size
+        self.lock = threading.Lock()
+        self.stats = {"in": 0, "out": 0, "dropped": 0, "errors": 0, "held": 0, "released": 0,
+                      "busy": 0.0, "max_depth": 0, "depth_total": 0, "depth_samples": 0}
+
+    def put(self, item):
+        self.inbox.put(item)
+        depth = self.inbox.qsize()
+        with self.lock:
+            self.stats["max_depth"] = max(self.stats["max_depth"], depth)
+            self.stats["depth_total"] += depth
+            self.stats["depth_samples"] += 1
+
+    def record(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+
+class IngestPipeline:
+    """
+    scrape -> clean -> merge -> dedupe -> geocode -> save, each stage running
+    in its own threads and joined by bounded queues, so a slow geocode lookup
+    or a slow fuzzy match no longer stalls everything else.
+    
+    The merge stage folds copies of the same home from different sites into
+    the first one before the database is involved. It holds each listing
+    for a short window (`merge_window_seconds`, at most `merge_window`
+    listings) so copies from the other sites can fill it in, then passes it
+    on while scraping carries on. A copy that arrives after its window has
+    closed only adds a source. The copies' sources are saved as
+    ListingSource rows at the end of the run.
+    
+    The geocode stage never waits on the API: it hands addresses to a
+    GeocodingService pool and passes listings straight on. Lookups that are
+    already answered are saved with the listing; the rest are backfilled
+    with bulk UPDATEs once the run is over.
+    
+    Shared by scripts/run_pipeline.py and `cli.py scrape`.
+    """
+    
+    # "geocode" sizes the lookup pool; handing work to it takes a single thread
+    DEFAULT_WORKERS = {"clean": 2, "merge": 1, "dedupe": 1, "geocode": GeocodingService.DEFAULT_WORKERS, "save": 1}
+    DEFAULT_QUEUE_SIZE = 200
+    # How long, and for how many listings, the merge stage waits for copies
+    DEFAULT_MERGE_WINDOW = 500
+    DEFAULT_MERGE_WINDOW_SECONDS = 5.0
+    # How often a holding stage with an idle inbox checks for items to release
+    RELEASE_POLL_SECONDS = 0.1
+
+    def __init__(self, db_manager=None, geocoder=None, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+                 save_batch_size=200, merge_window=DEFAULT_MERGE_WINDOW,
+                 merge_window_seconds=DEFAULT_MERGE_WINDOW_SECONDS):
+        self.db = db_manager or DatabaseManager()
+        self.geocoder = geocoder or Geocoder()
+        self.workers = dict(self.DEFAULT_WORKERS, **(workers or {}))
+        self.queue_size = queue_size
+        self.save_batch_size = save_batch_size
+        self.merge_window = merge_window
+        self.merge_window_seconds = merge_window_seconds
+        self.lock = threading.Lock()
+
+    def run(self, scrapers, pages=1, concurrency=None, profile=None, profile_output=None, metrics_json=None):
+        """
+        Runs the whole pipeline and returns per-stage stats.
+        
+        profile: None, "cprofile" or "tracemalloc" (see utils.metrics.Profiler)
+        metrics_json: optional path to dump the stage timings to
+        """
+        profiler = Profiler(profile, profile_output)
+        metrics.reset()
+        start = time.perf_counter()
+        scraping = ScrapingService(scrapers, concurrency=concurrency)
+        
+        # Every dedupe worker shares one index, loaded once and kept current by the save stage
+        with self.db.session_scope() as session:
+            self.index = AddressIndex.load(session)
+        self.merger = ListingMerger()
+        self.geocoding = GeocodingService(self.geocoder, workers=self.workers["geocode"])
+        # (url, future) for listings saved before their coordinates were known
+        self.pending_geocodes = []
+        
+        # 1. Build the stages (scraping feeds the first one)
+        stage_workers = dict(self.workers, geocode=1)
+        stages = {name: Stage(name, stage_workers[name], self.queue_size)
+                  for name in ("clean", "merge", "dedupe", "geocode", "save")}
+        scrape_stage = Stage("scrape", workers=1, queue_size=0)
+        order = [scrape_stage, stages["clean"], stages["merge"], stages["dedupe"], stages["geocode"], stages["save"]]
+        
+        # 2. Start every stage's workers
+        threads = [threading.Thread(target=self._scrape_worker, args=(scraping, pages, scrape_stage, stages["clean"]),
+                                    name="ingest-scrape")]
+        handlers = {"clean": self._clean, "merge": self._merge, "dedupe": self._dedupe, "geocode": self._geocode}
+        releasers = {"merge": self._release_merged}
+        for name, handler in handlers.items():
+            next_stage = order[order.index(stages[name]) + 1]
+            remaining = [stages[name].workers]
+            for i in range(stages[name].workers):
+                threads.append(threading.Thread(
+                    target=self._worker,
+                    args=(stages[name], handler, next_stage, remaining, releasers.get(name)),
+                    name=f"ingest-{name}-{i}"
+                ))
+        threads.append(threading.Thread(target=self._save_worker, args=(stages["save"],), name="ingest-save"))
+        
+        with profiler.capture():
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        # 3. Record where merged homes were seen, now that their first copies are saved
+        with self.db.session_scope() as session:
+            PropertyService(session).save_sources(self.merger.provenance())
+        
+        # 4. Fill in the coordinates that were still being looked up
+        with metrics.stage("geocode") as timer:
+            timer.rows = self.geocoding.backfill(self.db, self.pending_geocodes)
+        self.geocoding.shutdown()
+        
+        # 5. Keep the analytics snapshot current, if one has been built
+        snapshot = SnapshotService(self.db)
+        if snapshot.manifest() is not None:
+            snapshot.refresh()
+        
+        elapsed = time.perf_counter() - start
+        scraping.print_stats()
+        self._print_geocode_stats()
+        report = self._report(order, elapsed)
+        self.print_report(report, elapsed)
+        metrics.print_summary()
+        if metrics_json:
+            metrics.to_json(metrics_json, extra={"pipeline": report})
+        return report
+
+    # --- WORKERS ---
+
+    def _scrape_worker(self, scraping, pages, stage, next_stage):
+        try:
+            for site_name, page, listings in scraping.stream(pages):
+                stage.record("in")
+                for prop_obj in listings:
+                    stage.record("out")
+                    next_stage.put(prop_obj)
+        except Exception as e:
+            stage.record("errors")
+            print(f"   ❌ Scraping failed: {e}")
+        finally:
+            for _ in range(next_stage.workers):
+                next_stage.put(_DONE)
+
+    def _worker(self, stage, handler, next_stage, remaining, release=None):
+        """
+        Generic worker: handler(item, context) returns the item to pass on,
+        None to drop it, or _HELD to keep it. release(final) returns the held
+        items that may go on now; it is called after every item, whenever
+        the inbox is idle, and once with final=True by the last worker to
+        finish, which then closes the next stage.
+        """
+        context = {}
+        try:
+            try:
+                context = self._open_context(stage.name)
+            except Exception as e:
+                context = None
+                print(f"   ❌ [{stage.name}] worker could not start: {e}")
+            while True:
+                try:
+                    item = stage.inbox.get(timeout=self.RELEASE_POLL_SECONDS if release else None)
+                except queue.Empty:
+                    item = None
+                if item is _DONE:
+                    break
+                if item is not None:
+                    self._handle(stage, handler, item, context, next_stage)
+                if release is not None:
+                    self._release(stage, release, next_stage)
+        finally:
+            if context:
+                self._close_context(context)
+            with stage.lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                if release is not None:
+                    self._release(stage, release, next_stage, final=True)
+                for _ in range(next_stage.workers):
+                    next_stage.put(_DONE)
+
+    @staticmethod
+    def _handle(stage, handler, item, context, next_stage):
+        stage.record("in")
+        started = time.perf_counter()
+        try:
+            # Without a context, keep draining the inbox so producers never block on it
+            if context is None:
+                raise RuntimeError("worker has no context")
+            result = handler(item, context)
+        except Exception as e:
+            result = None
+            stage.record("errors")
+            print(f"   ❌ [{stage.name}] {e}")
+        busy = time.perf_counter() - started
+        stage.record("busy", busy)
+        metrics.record(stage.name, busy)
+        if result is _HELD:
+            stage.record("held")
+        elif result is None:
+            stage.record("dropped")
+        else:
+            stage.record("out")
+            next_stage.put(result)
+
+    @staticmethod
+    def _release(stage, release, next_stage, final=False):
+        """
+        Passes on the held items release() gives back. At the end, held
+        items it never gave back (e.g. merged copies) count as dropped.
+        """
+        try:
+            released = release(final)
+        except Exception as e:
+            released = []
+            stage.record("errors")
+            print(f"   ❌ [{stage.name}] {e}")
+        for item in released:
+            stage.record("released")
+            stage.record("out")
+            next_stage.put(item)
+        if final:
+            stage.record("dropped", stage.stats["held"] - stage.stats["released"])
+
+    def _save_worker(self, stage):
+        """Saves listings in batches; flushes early when the inbox runs dry."""
+        session = self.db.Session()
+        service = PropertyService(session)
+        batch = []
+        
+        def flush():
+            started = time.perf_counter()
+            try:
+                totals = service.save_listings(batch, batch_size=self.save_batch_size)
+            except Exception as e:
+                # e.g. the URL lookup failed: lose this batch, but keep draining the inbox
+                session.rollback()
+                print(f"   ❌ [save] {e}")
+                totals = {"inserted": 0, "updated": 0, "failed": len(batch)}
+            busy = time.perf_counter() - started
+            stage.record("busy", busy)
+            metrics.record("save", busy, rows=len(batch))
+            stage.record("out", totals["inserted"] + totals["updated"])
+            stage.record("errors", totals["failed"])
+            if not totals["failed"]:
+                for prop_obj in batch:
+                    self.index.add_listing(prop_obj)
+            batch.clear()
+        
+        try:
+            while True:
+                try:
+                    item = stage.inbox.get(timeout=0.5 if batch else None)
+                except queue.Empty:
+                    flush()
+                    continue
+                if item is _DONE:
+                    break
+                stage.record("in")
+                batch.append(item)
+                if len(batch) >= self.save_batch_size or stage.inbox.empty():
+                    flush()
+            if batch:
+                flush()
+        finally:
+            session.close()
+
+    # --- STAGE HANDLERS ---
+
+    def _open_context(self, stage_name):
+        # Each dedupe worker gets its own session; sessions aren't thread-safe
+        if stage_name == "dedupe":
+            session = self.db.Session()
+            return {"session": session, "detector": DuplicateDetector(session, self.index)}
+        return {}
+
+    @staticmethod
+    def _close_context(context):
+        if "session" in context:
+            context["session"].close()
+
+    @staticmethod
+    def _clean(prop_obj, context):
+        raw_data = {
+            "address": prop_obj.address,
+            "city": prop_obj.city,
+            "state": prop_obj.state,
+            "price": prop_obj.price,
+            "beds": prop_obj.bedrooms,
+            "baths": prop_obj.bathrooms,
+            "sqft": prop_obj.square_feet,
+            "url": prop_obj.url
+        }
+        clean_data = CleaningService.clean_listing(raw_data)
+        prop_obj.address = clean_data["address"]
+        prop_obj.address_key = clean_data["address_key"]
+        prop_obj.city = clean_data["city"]
+        prop_obj.state = clean_data["state"]
+        prop_obj.price = clean_data["price"]
+        prop_obj.bedrooms = clean_data["bedrooms"]
+        prop_obj.bathrooms = clean_data["bathrooms"]
+        prop_obj.square_feet = clean_data["square_feet"]
+        return prop_obj
+
+    def _merge(self, prop_obj, context):
+        # Passed on by _release_merged() once its window for copies has closed
+        self.merger.add(prop_obj)
+        return _HELD
+
+    def _release_merged(self, final=False):
+        if final:
+            return self.merger.flush()
+        return self.merger.release(self.merge_window, self.merge_window_seconds)
+
+    def _dedupe(self, prop_obj, context):
+        existing = context["detector"].find_potential_duplicate(
+            prop_obj.address, prop_obj.city, zip_code=prop_obj.zip_code
+        )
+        existing_url = existing.url if existing else None
+        # The detector's read transaction must not pin an old snapshot of the table
+        context["session"].rollback()
+        if existing:
+            print(f"   ⏭️ Skipping Fuzzy Duplicate: '{prop_obj.address}'")
+            # Sources merged into this listing belong to the home already saved
+            self.merger.redirect(prop_obj.url, existing_url)
+            return None
+        return prop_obj
+
+    def _geocode(self, prop_obj, context):
+        full_address = f"{prop_obj.address}, {prop_obj.city}, {prop_obj.state} {prop_obj.zip_code or ''}".strip()
+        future = self.geocoding.submit(full_address)
+        # Already answered (cache, local data, or an earlier copy): save it with the listing
+        if future.done() or prop_obj.url is None:
+            prop_obj.latitude, prop_obj.longitude = future.result()
+        else:
+            with self.lock:
+                self.pending_geocodes.append((prop_obj.url, future))
+        return prop_obj
+
+    # --- REPORTING ---
+
+    def _print_geocode_stats(self):
+        stats = self.geocoding.get_stats()
+        print(f"📍 Geocoding: {stats['submitted']} addresses, {stats['unique']} unique, "
+              f"{stats['found']} found, {stats['backfilled']} backfilled after saving")
+        cache = getattr(self.geocoder, "cache", None)
+        if cache is None:
+            return
+        stats = cache.get_stats()
+        print(f"🗺️ Geocode cache: {stats['hits']} hits, {stats['negative_hits']} known misses, "
+              f"{stats['misses']} lookups ({stats['hit_rate']:.0%} hit rate), {stats['entries']:,} entries")
+
+    @staticmethod
+    def _report(order, elapsed):
+        report = {}
+        for stage in order:
+            s = stage.stats
+            report[stage.name] = {
+                "workers": stage.workers,
+                "in": s["in"],
+                "out": s["out"],
+                "dropped": s["dropped"],
+                "errors": s["errors"],
+                "busy_seconds": round(s["busy"], 3),
+                "items_per_sec": round(s["in"] / elapsed, 2) if elapsed else 0.0,
+                "max_queue_depth": s["max_depth"],
+                "avg_queue_depth": round(s["depth_total"] / s["depth_samples"], 1) if s["depth_samples"] else 0.0,
+            }
+        return report
+
+    @staticmethod
+    def print_report(report, elapsed):
+        print(f"\n📊 Pipeline finished in {elapsed:.2f}s")
+        print(f"   {'stage':<8} {'workers':>7} {'in':>7} {'out':>7} {'dropped':>7} {'errors':>6} "
+              f"{'items/s':>8} {'busy s':>8} {'max q':>6} {'avg q':>6}")
+        for name, r in report.items():
+            print(f"   {name:<8} {r['workers']:>7} {r['in']:>7} {r['out']:>7} {r['dropped']:>7} {r['errors']:>6} "
+                  f"{r['items_per_sec']:>8} {r['busy_seconds']:>8} {r['max_queue_depth']:>6} {r['avg_queue_depth']:>6}")
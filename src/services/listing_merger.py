@@ -0,0 +1,150 @@
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+from src.cleaners.address_cleaner import AddressCleaner
+from src.core.models import Property
+
+class ListingMerger:
+    """
+    In-memory, cross-source dedupe for one scraping run.
+    
+    When Zillow, Redfin and Realtor all return the same house, only the
+    first copy goes on to the (database-backed) duplicate detector and gets
+    saved. Later copies are folded into it: empty fields are filled in from
+    them, and each copy's site, URL and price is kept as provenance
+    (ListingSource rows, written once the run is over).
+    
+    add() only collects; release() hands back the merged listings that have
+    waited long enough for their copies, flush() all of them. A listing is
+    only finished (and safe to pass on) once it has been released. A copy
+    that arrives after its home was released is kept as provenance but
+    never touches the released listing.
+    
+    Two listings are the same home when their city and normalized address
+    key match and their ZIPs don't disagree. Safe to share between threads.
+    """
+    
+    # Fields a later copy may fill in when the first copy left them empty
+    FILLABLE = ["zip_code", "bedrooms", "bathrooms", "square_feet", "property_type"]
+
+    def __init__(self):
+        # (city, address_key) -> [group], group = {"listing", "copies", "target_url", "held_at", "released"}
+        self.groups = defaultdict(list)
+        self.by_url = {}
+        # Groups not released yet, in arrival order
+        self.held = []
+        self.stats = {"in": 0, "merged": 0}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def merge_key(listing: Property):
+        address_key = listing.address_key or AddressCleaner.address_key(listing.address)
+        if not address_key:
+            return None
+        return ((listing.city or "").strip().lower(), address_key)
+
+    def add(self, listing: Property):
+        """
+        Collects a listing. Returns True if it's the first copy of its home
+        this run (it will come out of release() or flush()), False if it was
+        merged into an earlier copy.
+        """
+        key = self.merge_key(listing)
+        with self.lock:
+            self.stats["in"] += 1
+            group = self._find(key, listing)
+            if group is None:
+                group = {"listing": listing, "copies": [self._copy(listing)], "target_url": listing.url,
+                         "held_at": time.monotonic(), "released": False}
+                if key is not None:
+                    self.groups[key].append(group)
+                if listing.url is not None:
+                    self.by_url[listing.url] = group
+                self.held.append(group)
+                return True
+            
+            # --- MERGE INTO THE FIRST COPY ---
+            self.stats["merged"] += 1
+            first = group["listing"]
+            # A released listing is already being deduped/saved elsewhere: never modify it
+            if not group["released"]:
+                for field in self.FILLABLE:
+                    if getattr(first, field) in (None, 0, "") and getattr(listing, field) not in (None, 0, ""):
+                        setattr(first, field, getattr(listing, field))
+            if all(copy["url"] != listing.url for copy in group["copies"]):
+                group["copies"].append(self._copy(listing))
+            if listing.url is not None:
+                self.by_url[listing.url] = group
+            return False
+
+    def release(self, max_held=0, max_age=0.0):
+        """
+        Releases, in arrival order, the listings held for at least `max_age`
+        seconds, plus the oldest ones beyond `max_held`.
+        """
+        now = time.monotonic()
+        with self.lock:
+            count = max(0, len(self.held) - max_held)
+            while count < len(self.held) and now - self.held[count]["held_at"] >= max_age:
+                count += 1
+            released, self.held = self.held[:count], self.held[count:]
+            for group in released:
+                group["released"] = True
+        return [group["listing"] for group in released]
+
+    def flush(self):
+        """Releases every merged listing collected so far, in arrival order."""
+        return self.release()
+
+    def merge_listings(self, listings):
+        """Batch form: the listings left after merging, in their original order."""
+        for listing in listings:
+            self.add(listing)
+        return self.flush()
+
+    def redirect(self, url, target_url):
+        """
+        The first copy turned out to duplicate a property already in the
+        database (and wasn't saved), so its provenance belongs to that one.
+        """
+        with self.lock:
+            group = self.by_url.get(url)
+            if group is not None:
+                group["target_url"] = target_url
+
+    def provenance(self):
+        """
+        ListingSource rows for every home seen on more than one URL:
+        [{"property_url", "source_site", "url", "price", "seen_at"}]
+        """
+        rows = []
+        with self.lock:
+            groups = {id(g): g for g in self.by_url.values()}.values()
+            for group in groups:
+                if len(group["copies"]) < 2 or group["target_url"] is None:
+                    continue
+                for copy in group["copies"]:
+                    rows.append(dict(copy, property_url=group["target_url"]))
+        return rows
+
+    def _find(self, key, listing):
+        # The same URL (e.g. a listing repeated across pages) is always the same home
+        if listing.url is not None and listing.url in self.by_url:
+            return self.by_url[listing.url]
+        if key is None:
+            return None
+        for group in self.groups.get(key, ()):
+            other_zip = group["listing"].zip_code
+            if not listing.zip_code or not other_zip or listing.zip_code == other_zip:
+                return group
+        return None
+
+    @staticmethod
+    def _copy(listing):
+        return {
+            "source_site": listing.source_site,
+            "url": listing.url,
+            "price": listing.price,
+            "seen_at": listing.scraped_at or datetime.utcnow(),
+        }
@@ -1,73 +1,397 @@
-from sqlalchemy.orm import Session
-from src.core.models import Property, PriceHistory
-from datetime import datetime
-
-class PropertyService:
-    def __init__(self, session: Session):
-        self.session = session
-
-    def save_listing(self, new_data: Property):
-        """
-        Saves a property. If it exists, checks for price changes.
-        If price changed, records history before updating.
-        """
-        # 1. Check if property exists (by URL)
-        existing_prop = self.session.query(Property).filter_by(url=new_data.url).first()
-
-        if existing_prop:
-            # --- UPDATE EXISTING ---
-            print(f"   🔄 Updating: {existing_prop.address}")
-            
-            # Check for Price Change
-            if existing_prop.price != new_data.price:
-                print(f"   📉 PRICE CHANGE DETECTED: ${existing_prop.price:,.0f} -> ${new_data.price:,.0f}")
-                
-                # Create History Record (Save the OLD price)
-                history = PriceHistory(
-                    property_id=existing_prop.id,
-                    price=existing_prop.price,
-                    recorded_at=datetime.utcnow()
-                )
-                self.session.add(history)
-                
-                # Update main record
-                existing_prop.price = new_data.price
-                existing_prop.updated_at = datetime.utcnow()
-                
-            # Update other fields just in case they changed
-            existing_prop.listing_status = new_data.listing_status
-            
-        else:
-            # --- CREATE NEW ---
-            print(f"   🆕 New Listing: {new_data.address}")
-            self.session.add(new_data)
-        
-        # Commit the transaction
-        try:
-            self.session.commit()
-        except Exception as e:
-            self.session.rollback()
-            print(f"   ❌ Error saving property: {e}")
-
-    def get_price_drops(self):
-        """
-        Finds all properties that are currently cheaper than their history.
-        """
-        results = []
-        properties = self.session.query(Property).all()
-        
-        for prop in properties:
-            # Get history sorted by date
-            history = sorted(prop.price_history, key=lambda x: x.recorded_at, reverse=True)
-            
-            if history:
-                old_price = history[0].price # The most recent old price
-                if prop.price < old_price:
-                    drop_amount = old_price - prop.price
-                    results.append({
-                        "address": prop.address,
-                        "current_price": prop.price,
-                        "old_price": old_price,
-                        "drop_amount": drop_amount
-                    })
-        return results
\ No newline at end of file
+from sqlalchemy.orm import Session
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import sqlite, postgresql
+from src.core.models import Property, PriceHistory, ListingSource
+from src.cleaners.address_cleaner import AddressCleaner
+from datetime import datetime
+
+class PropertyService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    def save_listing(self, new_data: Property):
+        """
+        Saves a property. If it exists, checks for price changes.
+        If price changed, records history before updating.
+        """
+        # 1. Check if property exists (by URL)
+        existing_prop = self.session.query(Property).filter_by(url=new_data.url).first()
+
+        if existing_prop:
+            # --- UPDATE EXISTING ---
+            print(f"   🔄 Updating: {existing_prop.address}")
+            
+            # Check for Price Change
+            if existing_prop.price != new_data.price:
+                print(f"   📉 PRICE CHANGE DETECTED: ${existing_prop.price:,.0f} -> ${new_data.price:,.0f}")
+                
+                # Create History Record (Save the OLD price)
+                history = PriceHistory(
+                    property_id=existing_prop.id,
+                    price=existing_prop.price,
+                    recorded_at=datetime.utcnow()
+                )
+                self.session.add(history)
+                
+                # Update main record
+                existing_prop.price = new_data.price
+                existing_prop.updated_at = datetime.utcnow()
+                
+            # Update other fields just in case they changed
+            if existing_prop.listing_status != new_data.listing_status:
+                existing_prop.listing_status = new_data.listing_status
+                existing_prop.updated_at = datetime.utcnow()
+            
+        else:
+            # --- CREATE NEW ---
+            print(f"   🆕 New Listing: {new_data.address}")
+            self.session.add(new_data)
+        
+        # Commit the transaction
+        try:
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"   ❌ Error saving property: {e}")
+
+    def save_listings(self, listings, batch_size=500):
+        """
+        Bulk version of save_listing(): same price-change rules, but one
+        transaction per `batch_size` listings instead of one per listing.
+        
+        Each batch looks up existing URLs with a single IN query, then writes
+        new and updated listings with one INSERT ... ON CONFLICT(url) DO UPDATE
+        and all the PriceHistory rows with one INSERT.
+        Returns counts: {"inserted", "updated", "price_changes", "failed"}.
+        """
+        totals = {"inserted": 0, "updated": 0, "price_changes": 0, "failed": 0}
+        batch = []
+        for listing in listings:
+            batch.append(listing)
+            if len(batch) >= batch_size:
+                self._save_batch(batch, totals)
+                batch = []
+        if batch:
+            self._save_batch(batch, totals)
+        return totals
+
+    # Columns written for a listing (the id comes from the database)
+    _LISTING_COLUMNS = [c.name for c in Property.__table__.columns if c.name != "id"]
+    # SQLite caps bound parameters per statement, so IN lists are chunked
+    _IN_CHUNK = 500
+
+    def _save_batch(self, batch, totals):
+        now = datetime.utcnow()
+        
+        # 1. Which URLs already exist? (one IN query per 500 URLs)
+        urls = list({p.url for p in batch if p.url is not None})
+        existing = self._lookup_urls(urls, with_state=True)
+        
+        # 2. Replay the batch in order, exactly like calling save_listing() per item
+        rows = {}         # url -> row to write (final state)
+        new_rows = []     # listings without a URL can't conflict, always insert
+        history = []      # (url, old_price), oldest change first
+        inserted = updated = 0
+        for listing in batch:
+            url = listing.url
+            if url is not None and url in rows:
+                row = rows[url]
+            elif url is not None and url in existing:
+                prop_id, price, updated_at, listing_status = existing[url]
+                row = self._listing_row(listing, now)
+                row.update(price=price, updated_at=updated_at, listing_status=listing_status)
+                rows[url] = row
+            else:
+                # --- CREATE NEW ---
+                row = self._listing_row(listing, now)
+                if url is None:
+                    new_rows.append(row)
+                else:
+                    rows[url] = row
+                inserted += 1
+                continue
+            
+            # --- UPDATE EXISTING ---
+            updated += 1
+            if row["price"] != listing.price:
+                history.append((url, row["price"]))
+                row["price"] = listing.price
+                row["updated_at"] = now
+            # Any real change moves updated_at (the analytics snapshot relies on it)
+            if row["listing_status"] != listing.listing_status:
+                row["listing_status"] = listing.listing_status
+                row["updated_at"] = now
+        
+        # 3. Write everything in one transaction
+        try:
+            if rows:
+                self.session.execute(self._upsert_statement(), list(rows.values()))
+            if new_rows:
+                self.session.execute(insert(Property.__table__), new_rows)
+            if history:
+                # Listings that were new in this batch only got their id just now
+                ids = {url: values[0] for url, values in existing.items()}
+                missing = list({url for url, _ in history if url not in ids})
+                ids.update({url: prop_id for url, (prop_id, _) in self._lookup_urls(missing).items()})
+                self.session.execute(insert(PriceHistory.__table__), [
+                    {"property_id": ids[url], "price": old_price, "recorded_at": now}
+                    for url, old_price in history
+                ])
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            totals["failed"] += len(batch)
+            print(f"   ❌ Error saving batch of {len(batch)}: {e}")
+            return
+        
+        totals["inserted"] += inserted
+        totals["updated"] += updated
+        totals["price_changes"] += len(history)
+        print(f"   💾 Saved batch: {inserted} new, {updated} updated, {len(history)} price changes")
+
+    def _lookup_urls(self, urls, with_state=False):
+        """Returns {url: (id, price[, updated_at, listing_status])} for URLs already in the database."""
+        columns = [Property.url, Property.id, Property.price]
+        if with_state:
+            columns += [Property.updated_at, Property.listing_status]
+        found = {}
+        for i in range(0, len(urls), self._IN_CHUNK):
+            chunk = urls[i:i + self._IN_CHUNK]
+            for url, *values in self.session.query(*columns).filter(Property.url.in_(chunk)):
+                found[url] = tuple(values)
+        return found
+
+    def _listing_row(self, listing, now):
+        row = {name: getattr(listing, name) for name in self._LISTING_COLUMNS}
+        # Column defaults don't apply to explicit NULLs in a bulk insert
+        row["scraped_at"] = row["scraped_at"] or now
+        row["updated_at"] = row["updated_at"] or now
+        row["address_key"] = row["address_key"] or AddressCleaner.address_key(row["address"])
+        return row
+
+    def _upsert_statement(self):
+        """INSERT ... ON CONFLICT(url) DO UPDATE for the session's database."""
+        dialect = self.session.get_bind().dialect.name
+        insert_fn = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert_fn(Property.__table__)
+        return stmt.on_conflict_do_update(
+            index_elements=[Property.__table__.c.url],
+            set_={
+                "price": stmt.excluded.price,
+                "listing_status": stmt.excluded.listing_status,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        )
+
+    def save_sources(self, sources):
+        """
+        Writes provenance rows (see ListingMerger.provenance()), linking each
+        to the property saved under its `property_url`. Re-seeing a source
+        URL updates its row. Returns how many rows were written.
+        """
+        ids = self._lookup_urls(list({s["property_url"] for s in sources}))
+        rows = [
+            {"property_id": ids[s["property_url"]][0], "source_site": s["source_site"], "url": s["url"],
+             "price": s["price"], "seen_at": s["seen_at"]}
+            for s in sources if s["property_url"] in ids
+        ]
+        if not rows:
+            return 0
+        dialect = self.session.get_bind().dialect.name
+        insert_fn = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert_fn(ListingSource.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ListingSource.__table__.c.url],
+            set_={"property_id": stmt.excluded.property_id, "price": stmt.excluded.price,
+                  "seen_at": stmt.excluded.seen_at}
+        )
+        try:
+            self.session.execute(stmt, rows)
+            self.session.commit()
+        except Exception as e:
+            self.session.rollback()
+            print(f"   ❌ Error saving {len(rows)} listing sources: {e}")
+            return 0
+        print(f"   🔗 Saved {len(rows)} listing sources")
+        return len(rows)
+
+    # --- QUERIES ---
+
+    DEFAULT_PAGE_SIZE = 1000
+    # filter name -> column matched by equality (a list/tuple/set matches any of its values)
+    _EQUALITY_FILTERS = {
+        "city": Property.city,
+        "state": Property.state,
+        "zip_code": Property.zip_code,
+        "source_site": Property.source_site,
+        "property_type": Property.property_type,
+        "listing_status": Property.listing_status,
+    }
+
+    def query_properties(self, columns=None, **filters):
+        """
+        A Query over properties with filters applied, ready to refine further.
+        
+        columns: Property attributes or names to select (default: whole objects)
+        filters: city, state, zip_code, source_site, property_type,
+            listing_status (a value or a list of values), min_price, max_price,
+            min_beds, geocoded (True/False), updated_since (datetime)
+        """
+        if columns:
+            query = self.session.query(*[getattr(Property, c) if isinstance(c, str) else c for c in columns])
+        else:
+            query = self.session.query(Property)
+        return query.filter(*self._conditions(filters))
+
+    def _conditions(self, filters):
+        conditions = []
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name in self._EQUALITY_FILTERS:
+                column = self._EQUALITY_FILTERS[name]
+                is_many = isinstance(value, (list, tuple, set))
+                conditions.append(column.in_(list(value)) if is_many else column == value)
+            elif name == "min_price":
+                conditions.append(Property.price >= value)
+            elif name == "max_price":
+                conditions.append(Property.price <= value)
+            elif name == "min_beds":
+                conditions.append(Property.bedrooms >= value)
+            elif name == "geocoded":
+                conditions.append(Property.latitude.isnot(None) if value else Property.latitude.is_(None))
+            elif name == "updated_since":
+                conditions.append(Property.updated_at >= value)
+            else:
+                raise ValueError(f"Unknown property filter: {name}")
+        return conditions
+
+    def get_page(self, columns=None, limit=DEFAULT_PAGE_SIZE, after_id=None, **filters):
+        """
+        One page of matches in id order. Pass the last row's id as after_id
+        for the next page (keyset pagination: every page costs the same, no
+        matter how deep, unlike OFFSET).
+        """
+        if columns and "id" not in columns and Property.id not in columns:
+            columns = ["id"] + list(columns)
+        query = self.query_properties(columns, **filters)
+        if after_id is not None:
+            query = query.filter(Property.id > after_id)
+        return query.order_by(Property.id).limit(limit).all()
+
+    def iter_chunks(self, columns=None, chunk_size=DEFAULT_PAGE_SIZE, **filters):
+        """Streams every match as lists of up to chunk_size rows, one keyset page at a time."""
+        after_id = None
+        while True:
+            page = self.get_page(columns, limit=chunk_size, after_id=after_id, **filters)
+            if not page:
+                return
+            yield page
+            if len(page) < chunk_size:
+                return
+            after_id = page[-1].id
+
+    def iter_properties(self, columns=None, chunk_size=DEFAULT_PAGE_SIZE, **filters):
+        """Like iter_chunks(), one row at a time."""
+        for chunk in self.iter_chunks(columns, chunk_size, **filters):
+            yield from chunk
+
+    def get_properties_by_city(self, city, columns=None, limit=DEFAULT_PAGE_SIZE, after_id=None):
+        """A page of listings in one city (see get_page)."""
+        return self.get_page(columns, limit=limit, after_id=after_id, city=city)
+
+    def get_properties_by_price(self, min_price=None, max_price=None, columns=None,
+                                limit=DEFAULT_PAGE_SIZE, after_id=None, **filters):
+        """A page of listings priced between min_price and max_price (inclusive)."""
+        return self.get_page(columns, limit=limit, after_id=after_id,
+                             min_price=min_price, max_price=max_price, **filters)
+
+    def get_properties_by_ids(self, ids, columns=None):
+        """{id: listing} for the given ids (missing ones are left out), one IN query per 500 ids."""
+        if columns and "id" not in columns and Property.id not in columns:
+            columns = ["id"] + list(columns)
+        ids = list(ids)
+        found = {}
+        for i in range(0, len(ids), self._IN_CHUNK):
+            for row in self.query_properties(columns).filter(Property.id.in_(ids[i:i + self._IN_CHUNK])):
+                found[row.id] = row
+        return found
+
+    def get_stats(self, **filters):
+        """Headline numbers for the matching listings, computed in one SQL query."""
+        row = self.session.query(
+            func.count(Property.id),
+            func.avg(Property.price),
+            func.min(Property.price),
+            func.max(Property.price),
+            func.avg(Property.square_feet),
+            func.count(func.distinct(Property.city)),
+            func.count(Property.latitude),
+        ).filter(*self._conditions(filters)).one()
+        total, avg_price, min_price, max_price, avg_sqft, cities, geocoded = row
+        return {
+            "total_listings": total,
+            "avg_price": round(avg_price, 2) if avg_price is not None else None,
+            "min_price": min_price,
+            "max_price": max_price,
+            "avg_square_feet": round(avg_sqft, 1) if avg_sqft is not None else None,
+            "cities": cities,
+            "geocoded": geocoded,
+        }
+
+    def get_price_drops(self, city=None, min_drop=0.0, since=None, limit=None, offset=0):
+        """
+        Finds all properties that are currently cheaper than their history.
+        
+        One query: a window function picks each property's most recent
+        history row, and the join keeps only listings now priced below it.
+        Biggest drops come first.
+        
+        city: only this city
+        min_drop: only drops of at least this many dollars
+        since: only if that most recent old price was recorded at/after this datetime
+        limit / offset: pagination
+        """
+        history = self.session.query(
+            PriceHistory.property_id,
+            PriceHistory.price.label("old_price"),
+            PriceHistory.recorded_at,
+            func.row_number().over(
+                partition_by=PriceHistory.property_id,
+                order_by=(PriceHistory.recorded_at.desc(), PriceHistory.id.desc())
+            ).label("rank")
+        )
+        # Any history row since `since` means the latest one is too, so filter before ranking
+        if since is not None:
+            history = history.filter(PriceHistory.recorded_at >= since)
+        latest = history.subquery()
+        
+        drop_amount = (latest.c.old_price - Property.price).label("drop_amount")
+        query = self.session.query(
+            Property.id, Property.address, Property.city, Property.url,
+            Property.price, latest.c.old_price, drop_amount, latest.c.recorded_at
+        ).join(latest, latest.c.property_id == Property.id).filter(
+            latest.c.rank == 1,
+            Property.price < latest.c.old_price
+        )
+        if city is not None:
+            query = query.filter(Property.city == city)
+        if min_drop:
+            query = query.filter(latest.c.old_price - Property.price >= min_drop)
+        query = query.order_by(drop_amount.desc(), Property.id).offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        
+        return [
+            {
+                "id": prop_id,
+                "address": address,
+                "city": prop_city,
+                "url": url,
+                "current_price": price,
+                "old_price": old_price,
+                "drop_amount": drop,
+                "recorded_at": recorded_at,
+            }
+            for prop_id, address, prop_city, url, price, old_price, drop, recorded_at in query
+        ]
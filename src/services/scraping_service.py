@@ -0,0 +1,121 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import time
+from src.utils.rate_limiter import RateLimiter
+from src.utils.retry import get_retry_stats
+
+
+class ScrapingService:
+    """
+    Runs every scraper, and every page of every scraper, at the same time.
+    Each site gets its own bounded thread pool so one slow site can't
+    starve the others, and the total crawl takes about as long as the
+    slowest single site.
+    """
+
+    # Worker threads per site. Keys are matched against the scraper's
+    # site_name the same way ScraperFactory matches site names.
+    DEFAULT_CONCURRENCY = {
+        "zillow": 4,
+        "redfin": 4,
+        "realtor": 4,
+    }
+    FALLBACK_CONCURRENCY = 2
+
+    def __init__(self, scrapers, concurrency=None):
+        self.scrapers = scrapers
+        self.concurrency = dict(self.DEFAULT_CONCURRENCY)
+        if concurrency:
+            self.concurrency.update({k.lower(): v for k, v in concurrency.items()})
+
+    def workers_for(self, scraper):
+        """How many pages of this site may be in flight at once."""
+        site_name = scraper.site_name.lower()
+        for key, workers in self.concurrency.items():
+            if key in site_name:
+                return max(1, int(workers))
+        return self.FALLBACK_CONCURRENCY
+
+    def stream(self, pages=1):
+        """
+        Scrapes `pages` pages from every site concurrently and yields
+        (site_name, page, [Property, ...]) as soon as each page is done.
+        
+        Only `workers_for(site)` pages per site are in flight at a time, and
+        the next page is only queued once one finishes, so memory stays flat
+        however many pages are requested.
+        """
+        pools = {}
+        next_page = {}
+        pending = {}
+
+        def submit_next(scraper):
+            page = next_page[scraper.site_name]
+            if page > pages:
+                return
+            next_page[scraper.site_name] = page + 1
+            future = pools[scraper.site_name].submit(scraper.scrape_page, page)
+            pending[future] = (scraper, page)
+
+        # 1. Give every site its own pool and fill it with its first pages
+        for scraper in self.scrapers:
+            workers = self.workers_for(scraper)
+            pools[scraper.site_name] = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix=f"scrape-{scraper.site_name}"
+            )
+            next_page[scraper.site_name] = 1
+            for _ in range(workers):
+                submit_next(scraper)
+
+        # 2. Hand pages over as they finish, topping each site's pool back up
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    scraper, page = pending.pop(future)
+                    submit_next(scraper)
+                    try:
+                        listings = future.result()
+                    except Exception as e:
+                        print(f"   ❌ [{scraper.site_name}] Page {page} failed: {e}")
+                        continue
+                    yield scraper.site_name, page, listings
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def scrape_all(self, pages=1):
+        """
+        Scrapes `pages` pages from every site concurrently.
+        Returns {site_name: [Property, ...]} with each site's listings in page order.
+        """
+        start = time.perf_counter()
+        
+        # 1. Collect every page (a failed page is skipped, not fatal)
+        by_page = {scraper.site_name: {} for scraper in self.scrapers}
+        for site_name, page, listings in self.stream(pages):
+            by_page[site_name][page] = listings
+        
+        # 2. Put each site's pages back in order
+        results = {}
+        for site_name, site_pages in by_page.items():
+            results[site_name] = [prop for page in sorted(site_pages) for prop in site_pages[page]]
+
+        elapsed = time.perf_counter() - start
+        total = sum(len(v) for v in results.values())
+        print(f"⚡ Scraped {total} listings from {len(results)} sites in {elapsed:.2f}s")
+        self.print_stats()
+        return results
+
+    def print_stats(self):
+        """Prints rate limiter waits and retry costs for the crawl."""
+        # 1. Show how long requests sat in the rate limiter, per domain
+        for domain, stats in RateLimiter.shared().get_stats().items():
+            print(f"   ⏳ {domain}: {stats['requests']} requests, "
+                  f"avg wait {stats['avg_wait']:.2f}s, max wait {stats['max_wait']:.2f}s")
+        
+        # 2. ...and how much time retries and open circuits cost us
+        retries = get_retry_stats()
+        if retries["retries"] or retries["fast_failures"]:
+            print(f"   🔁 {retries['retries']} retries ({retries['backoff_seconds']:.1f}s backing off), "
+                  f"{retries['fast_failures']} fast failures, breakers: {retries['breakers']}")
@@ -0,0 +1,286 @@
+import json
+import os
+import shutil
+import time
+import pandas as pd
+from sqlalchemy import DateTime, Float, Integer, String, and_, func, or_
+from src.core.database import DatabaseManager
+from src.core.models import Property
+from src.services.property_service import PropertyService
+
+class SnapshotService:
+    """
+    Columnar copy of the properties table for analytics reads.
+    
+    Written as Parquet, partitioned by state and city (hive-style folders,
+    e.g. state=TX/city=Austin/), with rows sorted by price inside each file.
+    Loading a few columns for one city then reads only that folder and only
+    those columns, and price filters skip whole row groups by their stats.
+    
+    refresh() is incremental: only partitions holding rows whose updated_at
+    (or id) is newer than the last refresh are rewritten. A full rebuild,
+    and each rewritten partition, goes to a temporary folder and is swapped
+    in, so readers never see a half-written snapshot.
+    """
+    
+    PARTITIONS = ["state", "city"]
+    ROWS_PER_GROUP = 50_000
+    CHUNK_SIZE = 100_000
+    # Rewriting more partitions than this in one refresh: just rebuild everything
+    MAX_INCREMENTAL_PARTITIONS = 500
+    MANIFEST = "_manifest.json"
+
+    def __init__(self, db_manager=None, path=None):
+        self.db = db_manager or DatabaseManager()
+        self.path = path or self.default_path(self.db.db_url)
+        self.columns = [c.name for c in Property.__table__.columns]
+
+    @staticmethod
+    def default_path(db_url):
+        """Next to the SQLite file (data/real_estate.db -> data/snapshots/real_estate/properties)."""
+        if db_url.startswith("sqlite:///") and db_url != "sqlite:///:memory:":
+            db_path = os.path.abspath(db_url[len("sqlite:///"):])
+            name = os.path.splitext(os.path.basename(db_path))[0]
+            return os.path.join(os.path.dirname(db_path), "snapshots", name, "properties")
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return os.path.join(base_dir, "data", "snapshots", "default", "properties")
+
+    # --- STATE ---
+
+    def manifest(self):
+        """What the snapshot was built from, or None if there is no usable snapshot."""
+        try:
+            with open(os.path.join(self.path, self.MANIFEST)) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("db_url") == self.db.db_url else None
+
+    def _db_state(self):
+        """(rows, max id, max updated_at) -- enough to tell whether anything changed."""
+        # Separate queries: a lone MAX() is one index lookup, MAX() next to COUNT() is a table scan
+        with self.db.session_scope() as session:
+            rows = session.query(func.count(Property.id)).scalar()
+            max_id = session.query(func.max(Property.id)).scalar()
+            max_updated = session.query(func.max(Property.updated_at)).scalar()
+        return rows, max_id or 0, max_updated.isoformat() if max_updated else None
+
+    def is_fresh(self, max_age=None):
+        """
+        True when the snapshot matches the database (no new or updated rows)
+        and, if max_age (seconds) is given, was refreshed that recently.
+        """
+        manifest = self.manifest()
+        if manifest is None:
+            return False
+        if max_age is not None and time.time() - manifest["built_at"] > max_age:
+            return False
+        rows, max_id, max_updated = self._db_state()
+        return (rows, max_id, max_updated) == (manifest["rows"], manifest["max_id"], manifest["max_updated_at"])
+
+    # --- WRITING ---
+
+    def refresh(self, full=False):
+        """Brings the snapshot up to date; returns {"mode", "rows", "partitions", "seconds"}."""
+        started = time.perf_counter()
+        manifest = None if full else self.manifest()
+        rows, max_id, max_updated = self._db_state()
+        
+        if manifest is None:
+            report = self._rebuild()
+        else:
+            report = self._update(manifest, rows)
+        
+        self._write_manifest(rows, max_id, max_updated)
+        report["seconds"] = round(time.perf_counter() - started, 3)
+        print(f"🗂️ Snapshot {report['mode']}: {report['rows']:,} rows in "
+              f"{report['partitions']:,} partitions ({report['seconds']}s) -> {self.path}")
+        return report
+
+    def _rebuild(self):
+        """Streams the whole table (keyset pages) into a fresh folder, then swaps it in."""
+        staging = f"{self.path}.building"
+        shutil.rmtree(staging, ignore_errors=True)
+        rows = 0
+        partitions = set()
+        with self.db.session_scope() as session:
+            for i, chunk in enumerate(PropertyService(session).iter_chunks(self.columns, chunk_size=self.CHUNK_SIZE)):
+                df = self._frame(chunk)
+                self._write(df, staging, f"part-{i}-{{i}}.parquet", "overwrite_or_ignore")
+                rows += len(df)
+                partitions.update(zip(df["state"], df["city"]))
+        os.makedirs(staging, exist_ok=True)
+        
+        # Swap: the old snapshot is only removed once the new one is complete
+        old = f"{self.path}.old"
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.exists(self.path):
+            os.replace(self.path, old)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        os.replace(staging, self.path)
+        shutil.rmtree(old, ignore_errors=True)
+        return {"mode": "rebuild", "rows": rows, "partitions": len(partitions)}
+
+    def _update(self, manifest, db_rows):
+        """Rewrites only the partitions that gained, lost or changed rows since the manifest."""
+        conditions = [Property.id > manifest["max_id"]]
+        if manifest["max_updated_at"]:
+            conditions.append(Property.updated_at > pd.Timestamp(manifest["max_updated_at"]).to_pydatetime())
+        with self.db.session_scope() as session:
+            changed = session.query(Property.id, Property.state, Property.city).filter(or_(*conditions)).all()
+        if not changed and db_rows == manifest["rows"]:
+            return {"mode": "unchanged", "rows": 0, "partitions": 0}
+        
+        # 1. Where changed rows live now, and where they used to live (a row may have moved city)
+        partitions = {(state, city) for _, state, city in changed}
+        previous = self.load(columns=["id"] + self.PARTITIONS, ids=[prop_id for prop_id, _, _ in changed])
+        partitions.update(zip(previous["state"], previous["city"]))
+        partitions = {(self._none(s), self._none(c)) for s, c in partitions}
+        if len(partitions) > self.MAX_INCREMENTAL_PARTITIONS:
+            return self._rebuild()
+        
+        # 2. Rewrite each of them from the database, whole
+        written = 0
+        for state, city in partitions:
+            with self.db.session_scope() as session:
+                rows = session.query(*[getattr(Property, c) for c in self.columns]).filter(
+                    and_(self._equals(Property.state, state), self._equals(Property.city, city))
+                ).all()
+            df = self._frame(rows) if rows else None
+            self._replace_partition(state, city, df)
+            written += len(df) if df is not None else 0
+        
+        # Deleted rows don't show up as "changed": if counts disagree, start over
+        if self._count() != db_rows:
+            return self._rebuild()
+        return {"mode": "incremental", "rows": written, "partitions": len(partitions)}
+
+    def _frame(self, rows):
+        df = pd.DataFrame(rows, columns=self.columns)
+        return df.sort_values(["state", "city", "price"], na_position="last", kind="stable")
+
+    def _write(self, df, path, basename_template, existing_data_behavior):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        
+        table = pa.Table.from_pandas(df, schema=self._schema(), preserve_index=False)
+        ds.write_dataset(
+            table, path, format="parquet",
+            partitioning=self._partitioning(),
+            basename_template=basename_template,
+            existing_data_behavior=existing_data_behavior,
+            max_rows_per_group=self.ROWS_PER_GROUP,
+        )
+
+    def _replace_partition(self, state, city, df):
+        """
+        Writes one partition's rows (None: it has none left) to a staging
+        folder, then swaps its folder into the snapshot like _rebuild does.
+        """
+        current = set()
+        if os.path.exists(self.path):
+            fragments = self._dataset().get_fragments(filter=self._partition_filter(state, city))
+            current = {os.path.abspath(os.path.dirname(fragment.path)) for fragment in fragments}
+        
+        target = None
+        if df is not None:
+            staging = f"{self.path}.staging"
+            shutil.rmtree(staging, ignore_errors=True)
+            self._write(df, staging, "part-{i}.parquet", "overwrite_or_ignore")
+            written = next(root for root, _, files in os.walk(staging) if files)
+            target = os.path.abspath(os.path.join(self.path, os.path.relpath(written, staging)))
+            old = f"{self.path}.old"
+            shutil.rmtree(old, ignore_errors=True)
+            if os.path.exists(target):
+                os.replace(target, old)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(written, target)
+            shutil.rmtree(old, ignore_errors=True)
+            shutil.rmtree(staging, ignore_errors=True)
+        
+        # Files of this partition anywhere else (e.g. it emptied out) go too
+        for folder in current - {target}:
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def _write_manifest(self, rows, max_id, max_updated):
+        os.makedirs(self.path, exist_ok=True)
+        manifest = {"db_url": self.db.db_url, "built_at": time.time(), "rows": rows,
+                    "max_id": max_id, "max_updated_at": max_updated}
+        tmp_path = os.path.join(self.path, self.MANIFEST + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(self.path, self.MANIFEST))
+
+    # --- READING ---
+
+    def load(self, columns=None, ids=None, **filters):
+        """
+        The snapshot as a DataFrame (same columns as the properties table).
+        
+        columns: only read these columns
+        filters: state, city (a value or a list), min_price, max_price --
+            pushed down to skip partitions and row groups
+        ids: only these property ids
+        """
+        import pyarrow.dataset as ds
+        
+        columns = list(columns or self.columns)
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=columns)
+        expr = None
+        for name, value in filters.items():
+            if value is None:
+                continue
+            if name in self.PARTITIONS:
+                condition = ds.field(name).isin(list(value)) if isinstance(value, (list, tuple, set)) \
+                    else ds.field(name) == value
+            elif name == "min_price":
+                condition = ds.field("price") >= value
+            elif name == "max_price":
+                condition = ds.field("price") <= value
+            else:
+                raise ValueError(f"Unknown snapshot filter: {name}")
+            expr = condition if expr is None else expr & condition
+        if ids is not None:
+            condition = ds.field("id").isin(list(ids))
+            expr = condition if expr is None else expr & condition
+        
+        table = self._dataset().to_table(columns=columns, filter=expr)
+        return table.to_pandas()
+
+    def _count(self):
+        return self._dataset().count_rows() if os.path.exists(self.path) else 0
+
+    def _dataset(self):
+        import pyarrow.dataset as ds
+        return ds.dataset(self.path, format="parquet", partitioning=self._partitioning(),
+                          schema=self._schema(), exclude_invalid_files=False,
+                          ignore_prefixes=[".", "_"])
+
+    # --- SCHEMA ---
+
+    def _schema(self):
+        import pyarrow as pa
+        types = {Integer: pa.int64(), Float: pa.float64(), String: pa.string(), DateTime: pa.timestamp("us")}
+        return pa.schema([(c.name, types[type(c.type)]) for c in Property.__table__.columns])
+
+    def _partitioning(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        return ds.partitioning(pa.schema([(name, pa.string()) for name in self.PARTITIONS]), flavor="hive")
+
+    def _partition_filter(self, state, city):
+        import pyarrow.dataset as ds
+        expr = None
+        for name, value in zip(self.PARTITIONS, (state, city)):
+            condition = ds.field(name).is_null() if value is None else ds.field(name) == value
+            expr = condition if expr is None else expr & condition
+        return expr
+
+    @staticmethod
+    def _equals(column, value):
+        return column.is_(None) if value is None else column == value
+
+    @staticmethod
+    def _none(value):
+        return None if value is None or (isinstance(value, float) and pd.isna(value)) else value
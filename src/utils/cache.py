@@ -0,0 +1,368 @@
+import atexit
+import os
+import re
+import sqlite3
+import threading
+import time
+from src.cleaners.address_cleaner import AddressCleaner
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+
+
+class HttpCache:
+    """
+    Persistent HTTP response cache, keyed by URL.
+    
+    Stores each body with its ETag / Last-Modified so the next fetch can be a
+    conditional request: if the server answers 304 Not Modified we reuse the
+    body we already have instead of downloading it again.
+    
+    - Bounded by `max_bytes`; least recently used entries are evicted first.
+    - `ttl_rules` lets some URLs (e.g. search-result pages) be served straight
+      from the cache, with no request at all, for a number of seconds.
+    - Hits and 304s don't write to disk one by one: their timestamps are
+      batched and written with the next store, eviction or every TOUCH_BATCH.
+    """
+    
+    DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+    TOUCH_BATCH = 200
+    # Search-result pages change often but not every minute
+    DEFAULT_TTL_RULES = [(r"/homes/|/search|_rb/", 15 * 60)]
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=None, max_bytes=DEFAULT_MAX_BYTES, ttl_rules=None):
+        self.path = path or os.path.join(DATA_DIR, "http_cache.db")
+        self.max_bytes = max_bytes
+        rules = self.DEFAULT_TTL_RULES if ttl_rules is None else ttl_rules
+        self.ttl_rules = [(re.compile(pattern), ttl) for pattern, ttl in rules]
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "stored": 0, "evicted": 0, "bytes_saved": 0}
+        self.lock = threading.Lock()
+        # url -> [accessed_at, stored_at or None] not written yet
+        self.pending = {}
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL + NORMAL: a commit no longer waits for an fsync
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS http_cache (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT,
+                size INTEGER,
+                stored_at REAL,
+                accessed_at REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_http_cache_accessed ON http_cache (accessed_at)")
+        self.conn.commit()
+        atexit.register(self._flush_at_exit)
+
+    @classmethod
+    def shared(cls):
+        """Returns the process-wide cache used by all scrapers."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def ttl_for(self, url):
+        """Seconds a cached copy of this URL may be used without asking the server."""
+        for pattern, ttl in self.ttl_rules:
+            if pattern.search(url):
+                return ttl
+        return 0
+
+    def get(self, url):
+        """Returns the cached entry as a dict, or None."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, body, stored_at FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+            touched = self.pending.get(url)
+        if row is None:
+            return None
+        # A 304 not written yet still restarts the TTL
+        stored_at = touched[1] if touched and touched[1] is not None else row[3]
+        return {"url": url, "etag": row[0], "last_modified": row[1], "body": row[2], "stored_at": stored_at}
+
+    def is_fresh(self, entry):
+        """True if the entry is still inside its TTL and needs no request."""
+        ttl = self.ttl_for(entry["url"])
+        return ttl > 0 and time.time() - entry["stored_at"] < ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """If-None-Match / If-Modified-Since headers for a revalidation request."""
+        headers = {}
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, entry):
+        """Records that a fresh entry was served without any request."""
+        self._touch(entry["url"], revalidated=False)
+        with self.lock:
+            self.stats["hits"] += 1
+            self.stats["bytes_saved"] += len(entry["body"])
+        return entry["body"]
+
+    def revalidated(self, entry):
+        """Records a 304: the body is still good and its TTL starts over."""
+        self._touch(entry["url"], revalidated=True)
+        with self.lock:
+            self.stats["revalidated"] += 1
+            self.stats["bytes_saved"] += len(entry["body"])
+        return entry["body"]
+
+    def store(self, url, response):
+        """
+        Saves a 200 response. Skipped if the server gave us no validators and
+        no TTL rule applies, since we could never reuse it.
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        with self.lock:
+            self.stats["misses"] += 1
+        if not etag and not last_modified and not self.ttl_for(url):
+            return
+        
+        body = response.text
+        now = time.time()
+        with self.lock:
+            self._write_touches()
+            self.pending.pop(url, None)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, body, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, len(body), now, now)
+            )
+            self.conn.commit()
+            self.stats["stored"] += 1
+        self._evict()
+
+    def _touch(self, url, revalidated):
+        now = time.time()
+        with self.lock:
+            touched = self.pending.setdefault(url, [now, None])
+            touched[0] = now
+            if revalidated:
+                touched[1] = now
+            if len(self.pending) >= self.TOUCH_BATCH:
+                self._write_touches()
+                self.conn.commit()
+
+    def _write_touches(self):
+        """Writes the batched timestamps (caller holds the lock and commits)."""
+        if not self.pending:
+            return
+        self.conn.executemany("UPDATE http_cache SET accessed_at = ? WHERE url = ?",
+                              [(accessed, url) for url, (accessed, _) in self.pending.items()])
+        self.conn.executemany("UPDATE http_cache SET stored_at = ? WHERE url = ?",
+                              [(stored, url) for url, (_, stored) in self.pending.items() if stored is not None])
+        self.pending.clear()
+
+    def flush(self):
+        """Writes any batched hit / 304 timestamps now."""
+        with self.lock:
+            if self.pending:
+                self._write_touches()
+                self.conn.commit()
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except sqlite3.Error:
+            pass  # e.g. a temporary cache whose folder is already gone
+
+    def _evict(self):
+        """Drops least recently used entries until we're back under max_bytes."""
+        # Recency must be up to date before picking victims
+        self.flush()
+        with self.lock:
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            
+            freed = 0
+            victims = []
+            for url, size in self.conn.execute("SELECT url, size FROM http_cache ORDER BY accessed_at"):
+                if total - freed <= self.max_bytes:
+                    break
+                victims.append((url,))
+                freed += size
+            self.conn.executemany("DELETE FROM http_cache WHERE url = ?", victims)
+            self.conn.commit()
+            self.stats["evicted"] += len(victims)
+
+    def get_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+class GeocodeCache:
+    """
+    Persistent geocoding results, keyed by normalized address, so
+    "12 N. Oak St, Austin, TX" and "12 North Oak Street, austin, tx" share
+    one entry and re-running over known inventory makes no API calls.
+    
+    - Found coordinates live for `ttl` seconds.
+    - "Not found" answers are cached too, for the shorter `negative_ttl`,
+      so hopeless addresses aren't retried (and slept for) every run.
+    - Bounded by `max_entries`; least recently used entries are evicted first.
+    - Hits don't commit anything: their access times are batched and written
+      with the next store, eviction or every TOUCH_BATCH hits.
+    """
+    
+    DEFAULT_TTL = 90 * 24 * 3600
+    DEFAULT_NEGATIVE_TTL = 24 * 3600
+    DEFAULT_MAX_ENTRIES = 500_000
+    TOUCH_BATCH = 200
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, negative_ttl=DEFAULT_NEGATIVE_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path or os.path.join(DATA_DIR, "geocode_cache.db")
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "expired": 0, "stored": 0, "evicted": 0}
+        self.lock = threading.Lock()
+        # key -> accessed_at not written yet
+        self.pending = {}
+        
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL + NORMAL: a commit no longer waits for an fsync
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS geocode_cache (
+                key TEXT PRIMARY KEY,
+                latitude REAL,
+                longitude REAL,
+                stored_at REAL,
+                accessed_at REAL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS ix_geocode_cache_accessed ON geocode_cache (accessed_at)")
+        self.conn.commit()
+        self.count = self.conn.execute("SELECT COUNT(*) FROM geocode_cache").fetchone()[0]
+        atexit.register(self._flush_at_exit)
+
+    @classmethod
+    def shared(cls):
+        """Returns the process-wide cache used by every Geocoder."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def normalize_key(address):
+        return AddressCleaner.normalize(address or "")
+
+    def get(self, address):
+        """
+        Returns (found_in_cache, (lat, lon)). A cached "not found" comes back
+        as (True, (None, None)); a miss or an expired entry as (False, None).
+        """
+        key = self.normalize_key(address)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT latitude, longitude, stored_at FROM geocode_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return False, None
+            
+            latitude, longitude, stored_at = row
+            ttl = self.ttl if latitude is not None else self.negative_ttl
+            if now - stored_at >= ttl:
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return False, None
+            
+            self.pending[key] = now
+            if len(self.pending) >= self.TOUCH_BATCH:
+                self._write_touches()
+                self.conn.commit()
+            self.stats["hits" if latitude is not None else "negative_hits"] += 1
+            return True, (latitude, longitude)
+
+    def store(self, address, coords):
+        """Saves a lookup result; (None, None) records a "not found"."""
+        latitude, longitude = coords if coords else (None, None)
+        key = self.normalize_key(address)
+        now = time.time()
+        with self.lock:
+            self._write_touches()
+            self.pending.pop(key, None)
+            added = self.conn.execute(
+                "INSERT OR IGNORE INTO geocode_cache (key, latitude, longitude, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, latitude, longitude, now, now)
+            ).rowcount
+            if not added:
+                self.conn.execute(
+                    "UPDATE geocode_cache SET latitude = ?, longitude = ?, stored_at = ?, accessed_at = ? WHERE key = ?",
+                    (latitude, longitude, now, now, key)
+                )
+            self.conn.commit()
+            self.count += added
+            self.stats["stored"] += 1
+        self._evict()
+
+    def _write_touches(self):
+        """Writes the batched access times (caller holds the lock and commits)."""
+        if not self.pending:
+            return
+        self.conn.executemany("UPDATE geocode_cache SET accessed_at = ? WHERE key = ?",
+                              [(accessed, key) for key, accessed in self.pending.items()])
+        self.pending.clear()
+
+    def flush(self):
+        """Writes any batched hit timestamps now."""
+        with self.lock:
+            if self.pending:
+                self._write_touches()
+                self.conn.commit()
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except sqlite3.Error:
+            pass  # e.g. a temporary cache whose folder is already gone
+
+    def _evict(self):
+        """Drops least recently used entries until we're back under max_entries."""
+        with self.lock:
+            excess = self.count - self.max_entries
+            if excess <= 0:
+                return
+            # Recency must be up to date before picking victims
+            self._write_touches()
+            self.conn.execute(
+                "DELETE FROM geocode_cache WHERE key IN "
+                "(SELECT key FROM geocode_cache ORDER BY accessed_at LIMIT ?)", (excess,)
+            )
+            self.conn.commit()
+            self.count -= excess
+            self.stats["evicted"] += excess
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats, entries=self.count)
+        lookups = stats["hits"] + stats["negative_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["hits"] + stats["negative_hits"]) / lookups, 3) if lookups else 0.0
+        return stats
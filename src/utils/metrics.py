@@ -0,0 +1,212 @@
+import cProfile
+import io
+import json
+import pstats
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+class StageMetrics:
+    """
+    Timing for one stage: call count, rows, total wall time and a bounded
+    sample of call latencies (reservoir sampling, so memory stays flat
+    however many calls we record).
+    """
+    
+    def __init__(self, reservoir_size):
+        self.calls = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.samples = []
+        self.reservoir_size = reservoir_size
+
+    def add(self, seconds, rows):
+        self.calls += 1
+        self.rows += rows
+        self.seconds += seconds
+        if len(self.samples) < self.reservoir_size:
+            self.samples.append(seconds)
+        else:
+            slot = random.randrange(self.calls)
+            if slot < self.reservoir_size:
+                self.samples[slot] = seconds
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class _Span:
+    def __init__(self, rows):
+        self.rows = rows
+
+
+class PipelineMetrics:
+    """
+    Lightweight, thread-safe instrumentation for the ingest pipeline.
+    
+        with metrics.stage("geocode"):
+            ...
+    
+    records wall time, calls, rows and p50/p95/p99 latency per stage.
+    """
+    
+    STAGE_ORDER = ["fetch", "parse", "clean", "merge", "dedupe", "geocode", "save"]
+
+    def __init__(self, reservoir_size=10000):
+        self.reservoir_size = reservoir_size
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.stages = {}
+            self.started = time.perf_counter()
+
+    def record(self, name, seconds, rows=1):
+        with self.lock:
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = StageMetrics(self.reservoir_size)
+            stage.add(seconds, rows)
+
+    @contextmanager
+    def stage(self, name, rows=1):
+        """Times the block; set `span.rows` inside it if the count isn't known up front."""
+        span = _Span(rows)
+        started = time.perf_counter()
+        try:
+            yield span
+        finally:
+            self.record(name, time.perf_counter() - started, span.rows)
+
+    def summary(self):
+        """Returns {stage: {calls, rows, total_s, rows_per_s, mean_ms, p50_ms, p95_ms, p99_ms}}."""
+        with self.lock:
+            names = [n for n in self.STAGE_ORDER if n in self.stages]
+            names += sorted(n for n in self.stages if n not in self.STAGE_ORDER)
+            report = {}
+            for name in names:
+                s = self.stages[name]
+                report[name] = {
+                    "calls": s.calls,
+                    "rows": s.rows,
+                    "total_s": round(s.seconds, 4),
+                    "rows_per_s": round(s.rows / s.seconds, 1) if s.seconds else 0.0,
+                    "mean_ms": round(s.seconds / s.calls * 1000, 3) if s.calls else 0.0,
+                    "p50_ms": round(s.percentile(50) * 1000, 3),
+                    "p95_ms": round(s.percentile(95) * 1000, 3),
+                    "p99_ms": round(s.percentile(99) * 1000, 3),
+                }
+            return report
+
+    def print_summary(self):
+        elapsed = time.perf_counter() - self.started
+        print(f"\n⏱️ Stage timings ({elapsed:.2f}s wall)")
+        print(f"   {'stage':<8} {'calls':>7} {'rows':>7} {'total s':>9} {'rows/s':>9} "
+              f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name, r in self.summary().items():
+            print(f"   {name:<8} {r['calls']:>7} {r['rows']:>7} {r['total_s']:>9} {r['rows_per_s']:>9} "
+                  f"{r['p50_ms']:>9} {r['p95_ms']:>9} {r['p99_ms']:>9}")
+
+    def to_json(self, path, extra=None):
+        """Dumps the summary (plus anything in `extra`) so runs can be compared."""
+        payload = {
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "wall_s": round(time.perf_counter() - self.started, 4),
+            "stages": self.summary(),
+        }
+        payload.update(extra or {})
+        with open(path, "w") as f:
+            json.dump(payload, f, indent=2)
+        print(f"📝 Metrics written to {path}")
+        return path
+
+
+# The process-wide instance every stage records into
+metrics = PipelineMetrics()
+
+
+class Profiler:
+    """
+    Optional deep capture for a pipeline run.
+    
+    mode="cprofile":    cProfile only sees the thread that enabled it, so
+                        every thread started during capture() (stage
+                        workers, but also the scraper and geocoder pools)
+                        gets its own profile via threading.setprofile, and
+                        the results are merged at the end.
+    mode="tracemalloc": top allocation sites and peak memory (process-wide).
+    """
+    
+    MODES = ("cprofile", "tracemalloc")
+
+    def __init__(self, mode=None, output=None, top=20):
+        if mode not in (None,) + self.MODES:
+            raise ValueError(f"Unknown profile mode: {mode} (use {', '.join(self.MODES)})")
+        self.mode = mode
+        self.output = output
+        self.top = top
+        self.profiles = []
+        self.lock = threading.Lock()
+
+    def _profile_thread(self, frame, event, arg):
+        """threading.setprofile hook: runs once per new thread and hands it to cProfile."""
+        sys.setprofile(None)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return  # Python 3.12+ allows one active cProfile per process
+        with self.lock:
+            self.profiles.append(profile)
+
+    @contextmanager
+    def capture(self):
+        if self.mode == "tracemalloc":
+            tracemalloc.start()
+        elif self.mode == "cprofile":
+            threading.setprofile(self._profile_thread)
+        try:
+            yield self
+        finally:
+            if self.mode == "cprofile":
+                threading.setprofile(None)
+            if self.mode == "tracemalloc":
+                self._report_tracemalloc()
+            elif self.mode == "cprofile":
+                self._report_cprofile()
+
+    def _report_cprofile(self):
+        if not self.profiles:
+            return
+        stats = pstats.Stats(self.profiles[0], stream=io.StringIO())
+        for profile in self.profiles[1:]:
+            stats.add(profile)
+        if self.output:
+            stats.dump_stats(self.output)
+            print(f"📝 cProfile stats written to {self.output}")
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats("cumulative").print_stats(self.top)
+        print(f"\n🔬 cProfile (top {self.top} by cumulative time, all threads)")
+        print(stream.getvalue())
+
+    def _report_tracemalloc(self):
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"\n🔬 tracemalloc: current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB")
+        lines = [f"   {stat}" for stat in snapshot.statistics("lineno")[:self.top]]
+        print("\n".join(lines))
+        if self.output:
+            with open(self.output, "w") as f:
+                f.write(f"current_mb={current / 1e6:.3f} peak_mb={peak / 1e6:.3f}\n")
+                f.write("\n".join(lines) + "\n")
+            print(f"📝 tracemalloc report written to {self.output}")
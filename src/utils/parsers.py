@@ -0,0 +1,55 @@
+import re
+import numpy as np
+import pandas as pd
+
+NON_ASCII = re.compile(r'[^\x00-\x7f]')
+
+def split_numbers(values: pd.Series):
+    """
+    Splits a raw column into (numbers as floats, mask of cells that are int/float).
+    Text columns are detected without touching each cell in Python.
+    Missing values (None/NaN) are never counted as numbers.
+    """
+    if pd.api.types.is_numeric_dtype(values.dtype):
+        numeric = values.astype(float)
+        return numeric, numeric.notna()
+    
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind in ("string", "empty"):
+        return pd.Series(np.nan, index=values.index, dtype=float), pd.Series(False, index=values.index)
+    
+    # Mixed column: the same isinstance check the per-row cleaners use
+    is_number = values.map(lambda v: isinstance(v, (int, float))) & values.notna()
+    numeric = pd.Series(np.nan, index=values.index, dtype=float)
+    numeric[is_number] = values[is_number].astype(float)
+    return numeric, is_number
+
+def to_number(text: pd.Series, parse=float) -> pd.Series:
+    """
+    pd.to_numeric() for cleaned digit strings, NaN where unparseable.
+    Non-ASCII digits (e.g. "٣") are rare and pandas can't read them, so those
+    few cells fall back to `parse` (float or int) like the per-row cleaners.
+    """
+    result = pd.to_numeric(text, errors='coerce').astype(float)
+    unicode_digits = text.str.contains(NON_ASCII, na=False)
+    if unicode_digits.any():
+        result[unicode_digits] = text[unicode_digits].map(lambda v: _safe_parse(parse, v))
+    return result
+
+def _safe_parse(parse, value):
+    try:
+        return float(parse(value))
+    except (TypeError, ValueError):
+        return np.nan
+
+def apply_unique(values: pd.Series, func) -> pd.Series:
+    """
+    Runs a column cleaner once per *distinct* value and spreads the results
+    back out. Scraped columns repeat a lot (cities, states, "3 bd"...), so
+    this turns a million string ops into a few thousand plus one C-level take.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    cleaned = func(pd.Series(uniques, dtype=values.dtype if len(uniques) else object))
+    result = cleaned.take(codes)
+    result.index = values.index
+    return result
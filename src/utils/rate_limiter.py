@@ -1,20 +1,151 @@
-import time
-import random
-
-class RateLimiter:
-    """
-    Helps scrapers look like humans by waiting between requests.
-    """
-    
-    @staticmethod
-    def delay(min_seconds=2, max_seconds=5):
-        """
-        Pauses execution for a random amount of time.
-        
-        Args:
-            min_seconds (int): Minimum wait time.
-            max_seconds (int): Maximum wait time.
-        """
-        sleep_time = random.uniform(min_seconds, max_seconds)
-        print(f"⏳ Waiting for {sleep_time:.2f} seconds...")
-        time.sleep(sleep_time)
\ No newline at end of file
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+class TokenBucket:
+    """
+    Classic token bucket: refills `rate` tokens per second, holds at most `burst`.
+    
+    Callers *reserve* a token instead of waiting while holding the lock, so a
+    slow caller never blocks the bucket for anyone else. The bucket may go
+    negative; that just means the next caller has to wait a little longer.
+    """
+    
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """
+        Takes one token and returns how many seconds the caller must wait
+        before using it (0.0 if a token was available).
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def set_limits(self, rate, burst):
+        """Changes rate and burst in place; tokens earned so far (or owed) carry over."""
+        with self.lock:
+            now = time.monotonic()
+            # Settle the time since the last reservation at the old rate first
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.rate = float(rate)
+            self.burst = float(burst)
+            self.tokens = min(self.tokens, self.burst)
+
+
+class RateLimiter:
+    """
+    Helps scrapers stay polite with one token bucket per domain.
+    
+    Workers hitting different sites never wait on each other; workers
+    hitting the same site share that site's budget. Every wait is recorded
+    so throughput can be tuned from real numbers.
+    """
+    
+    DEFAULT_RATE = 0.5   # requests per second, per domain
+    DEFAULT_BURST = 2    # requests allowed back-to-back before throttling
+    
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, domain_limits=None):
+        """
+        Args:
+            rate (float): Default requests per second for any domain.
+            burst (int): Default bucket size for any domain.
+            domain_limits (dict): Per-domain overrides, e.g. {"zillow.com": (1.0, 3)}.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.domain_limits = dict(domain_limits or {})
+        self.buckets = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Returns the process-wide limiter used by all scrapers."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def domain_of(url_or_domain):
+        """'https://www.zillow.com/homes/' -> 'zillow.com'"""
+        netloc = urlparse(url_or_domain).netloc if "://" in url_or_domain else url_or_domain
+        netloc = netloc.split(":")[0].lower()
+        return netloc[4:] if netloc.startswith("www.") else netloc
+
+    def configure(self, domain, rate, burst=None):
+        """Sets (or changes) the rate and burst for one domain, keeping its stats."""
+        domain = self.domain_of(domain)
+        with self.lock:
+            self.domain_limits[domain] = (rate, burst if burst is not None else self.burst)
+            bucket = self.buckets.get(domain)
+            if bucket is not None:
+                bucket.set_limits(*self.domain_limits[domain])
+
+    def _bucket(self, domain):
+        with self.lock:
+            bucket = self.buckets.get(domain)
+            if bucket is None:
+                rate, burst = self.domain_limits.get(domain, (self.rate, self.burst))
+                bucket = TokenBucket(rate, burst)
+                self.buckets[domain] = bucket
+                self.stats.setdefault(domain, {"requests": 0, "waited": 0.0, "max_wait": 0.0})
+            return bucket
+
+    def _record(self, domain, wait):
+        with self.lock:
+            stats = self.stats[domain]
+            stats["requests"] += 1
+            stats["waited"] += wait
+            stats["max_wait"] = max(stats["max_wait"], wait)
+
+    def acquire(self, url):
+        """
+        Blocks until a request to this URL's domain is allowed.
+        Returns the number of seconds spent waiting.
+        """
+        domain = self.domain_of(url)
+        wait = self._bucket(domain).reserve()
+        if wait > 0:
+            time.sleep(wait)
+        self._record(domain, wait)
+        return wait
+
+    async def acquire_async(self, url):
+        """
+        Async version of acquire(): yields to the event loop instead of
+        blocking the thread. Returns the number of seconds spent waiting.
+        """
+        domain = self.domain_of(url)
+        wait = self._bucket(domain).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        self._record(domain, wait)
+        return wait
+
+    def get_stats(self):
+        """
+        Returns {domain: {"requests", "waited", "max_wait", "avg_wait"}}.
+        """
+        with self.lock:
+            report = {}
+            for domain, stats in self.stats.items():
+                report[domain] = dict(stats)
+                report[domain]["avg_wait"] = stats["waited"] / stats["requests"] if stats["requests"] else 0.0
+            return report
@@ -1,25 +1,252 @@
-import time
-import functools
-import requests
-
-def retry_request(max_attempts=3, delay=2):
-    """
-    Decorator: Retries a function if it crashes.
-    """
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            for attempt in range(max_attempts):
-                try:
-                    return func(*args, **kwargs)
-                except (requests.exceptions.RequestException, ConnectionError) as e:
-                    print(f"⚠️ Network Error (Attempt {attempt + 1}/{max_attempts}): {e}")
-                    if attempt < max_attempts - 1:
-                        print(f"   ⏳ Retrying in {delay} seconds...")
-                        time.sleep(delay)
-                    else:
-                        print("❌ Max retries reached. Giving up.")
-                        raise e # Re-raise the error so the main program knows
-            return None
-        return wrapper
-    return decorator
\ No newline at end of file
+import time
+import random
+import functools
+import threading
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+import requests
+from src.core.exceptions import CircuitOpenError
+
+# Responses that mean "try again later", not "you asked for something wrong"
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RetryStats:
+    """
+    Thread-safe counters so we can see how much time retries cost us.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.counters = {
+                "attempts": 0,
+                "retries": 0,
+                "give_ups": 0,
+                "backoff_seconds": 0.0,
+                "fast_failures": 0,
+                "circuit_opened": 0,
+                "circuit_half_open": 0,
+                "circuit_closed": 0,
+            }
+
+    def add(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.counters)
+
+
+retry_stats = RetryStats()
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker.
+    
+    CLOSED    -> requests flow normally.
+    OPEN      -> too many failures in a row; fail fast until `cooldown` passes.
+    HALF_OPEN -> cooldown is over; let one trial request through.
+                 Success closes the circuit, failure opens it again.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host, failure_threshold=5, cooldown=30):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def before_request(self):
+        """Raises CircuitOpenError if requests to this host should fail fast."""
+        with self.lock:
+            if self.state == self.CLOSED:
+                return
+            
+            remaining = self.cooldown - (time.monotonic() - self.opened_at)
+            if self.state == self.OPEN and remaining <= 0:
+                # Cooldown is over: this caller gets to be the trial request
+                self.state = self.HALF_OPEN
+                retry_stats.add("circuit_half_open")
+                return
+            
+            retry_stats.add("fast_failures")
+            raise CircuitOpenError(self.host, max(remaining, 0.0))
+
+    def record_success(self):
+        with self.lock:
+            if self.state != self.CLOSED:
+                retry_stats.add("circuit_closed")
+                print(f"   🟢 Circuit closed for {self.host}")
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    retry_stats.add("circuit_opened")
+                    print(f"   🔴 Circuit opened for {self.host} (cooling down {self.cooldown}s)")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def record_neutral(self):
+        """
+        The host answered, but with an error retrying can't fix (e.g. 404).
+        That says nothing about failures in a row, so the count is left as
+        it is; a half-open trial still counts as answered and closes.
+        """
+        with self.lock:
+            if self.state != self.HALF_OPEN:
+                return
+        self.record_success()
+
+    def abandon_trial(self):
+        """
+        The call ended without telling us whether the host is healthy (e.g. a
+        bug in our own code). A half-open trial must not stay pending forever,
+        so the circuit opens again and the next cooldown allows a new trial.
+        """
+        with self.lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(host, failure_threshold=5, cooldown=30):
+    """Returns the shared circuit breaker for a host, creating it on first use."""
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(host, failure_threshold, cooldown)
+            _breakers[host] = breaker
+        return breaker
+
+def get_retry_stats():
+    """
+    Returns all retry counters plus the current state of every host's breaker.
+    """
+    stats = retry_stats.snapshot()
+    with _breakers_lock:
+        stats["breakers"] = {host: b.state for host, b in _breakers.items()}
+    return stats
+
+def parse_retry_after(response):
+    """
+    Reads the Retry-After header (seconds or an HTTP date).
+    Returns seconds to wait, or None if the header is missing or unreadable.
+    """
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+def _find_host(func, args, kwargs):
+    """Breakers are per host, so dig the URL out of the call's arguments."""
+    candidates = [kwargs.get("url")] + list(args)
+    for value in candidates:
+        if isinstance(value, str) and "://" in value:
+            return urlparse(value).netloc.lower()
+    return func.__qualname__
+
+def retry_request(max_attempts=3, delay=2, max_delay=60, failure_threshold=5, cooldown=30):
+    """
+    Decorator: Retries a function if it crashes.
+    
+    - Waits delay, 2*delay, 4*delay... (capped at max_delay) with jitter,
+      so a crowd of workers doesn't retry in lock-step.
+    - Honours Retry-After on 429/503 responses.
+    - Gives up straight away on errors retrying can't fix (e.g. 404).
+    - Trips a per-host circuit breaker after `failure_threshold` failures in a
+      row; while it is open, calls raise CircuitOpenError without sleeping
+      (so does the call that trips it, if it had retries left).
+      4xx answers like 404 don't count towards or reset that streak.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            breaker = get_breaker(_find_host(func, args, kwargs), failure_threshold, cooldown)
+            
+            for attempt in range(max_attempts):
+                breaker.before_request()
+                retry_stats.add("attempts")
+                try:
+                    result = func(*args, **kwargs)
+                    breaker.record_success()
+                    return result
+                except (requests.exceptions.RequestException, ConnectionError) as e:
+                    response = getattr(e, "response", None)
+                    status = getattr(response, "status_code", None)
+                    
+                    # A 4xx like 404 means the request itself is wrong. Retrying won't help,
+                    # and the host answered, so it neither counts against nor resets the breaker.
+                    if isinstance(e, requests.exceptions.HTTPError) and status not in RETRYABLE_STATUSES:
+                        breaker.record_neutral()
+                        print(f"❌ HTTP {status}: not retrying.")
+                        raise e
+                    
+                    breaker.record_failure()
+                    print(f"⚠️ Network Error (Attempt {attempt + 1}/{max_attempts}): {e}")
+                    
+                    if attempt >= max_attempts - 1:
+                        print("❌ Max retries reached. Giving up.")
+                        retry_stats.add("give_ups")
+                        raise e # Re-raise the error so the main program knows
+                    
+                    # This failure tripped the breaker: the next attempt would fail fast anyway
+                    if breaker.state == CircuitBreaker.OPEN:
+                        print("❌ Circuit opened. Not waiting to retry.")
+                        retry_stats.add("give_ups")
+                        raise CircuitOpenError(breaker.host, breaker.cooldown) from e
+                    
+                    # Exponential backoff with "equal jitter": half fixed, half random
+                    backoff = min(max_delay, delay * (2 ** attempt))
+                    wait = backoff / 2 + random.uniform(0, backoff / 2)
+                    
+                    retry_after = parse_retry_after(response)
+                    if retry_after is not None:
+                        if retry_after > max_delay:
+                            print(f"❌ Server asked us to wait {retry_after:.0f}s. Giving up.")
+                            retry_stats.add("give_ups")
+                            raise e
+                        wait = max(wait, retry_after)
+                    
+                    print(f"   ⏳ Retrying in {wait:.2f} seconds...")
+                    retry_stats.add("retries")
+                    retry_stats.add("backoff_seconds", wait)
+                    time.sleep(wait)
+                except BaseException:
+                    # Anything else (parser bugs, KeyboardInterrupt...) says nothing about the host
+                    breaker.abandon_trial()
+                    raise
+            return None
+        return wrapper
+    return decorator
@@ -0,0 +1,27 @@
+import re
+import unicodedata
+
+# Everything except letters, digits, whitespace and '#' (kept for unit numbers)
+PUNCTUATION = re.compile(r"[^\w\s#]|_")
+WHITESPACE = re.compile(r"\s+")
+# "#12" -> "# 12" so the unit marker is its own token
+HASH_NUMBER = re.compile(r"#(?=\w)")
+
+def fold_ascii(text: str) -> str:
+    """'Café Ñandú' -> 'Cafe Nandu' (accents dropped, other non-ASCII removed)."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return decomposed.encode("ascii", "ignore").decode("ascii")
+
+def normalize_text(text: str) -> str:
+    """
+    Lowercase, ASCII-only, punctuation turned into spaces, whitespace collapsed.
+    '  1234 N. Main St.,  Apt #2 ' -> '1234 n main st apt # 2'
+    """
+    text = fold_ascii(text).lower()
+    text = PUNCTUATION.sub(" ", text)
+    text = HASH_NUMBER.sub("# ", text)
+    return WHITESPACE.sub(" ", text).strip()
+
+def tokenize(text: str) -> list:
+    """normalize_text() split into words."""
+    return normalize_text(text).split()
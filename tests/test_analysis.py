@@ -1,39 +1,162 @@
-import sys
-import os
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.core.database import DatabaseManager
-from src.analyzers.price_analyzer import PriceAnalyzer
-from src.analyzers.market_analyzer import MarketAnalyzer
-from src.analyzers.comparative_analyzer import ComparativeAnalyzer
-from src.analyzers.neighborhood_analyzer import NeighborhoodAnalyzer
-
-def test_full_analysis():
-    print("📊 Running Full Analysis Suite...\n")
-    db = DatabaseManager()
-    
-    # 1. Market Health
-    print("--- 🌍 Market Health ---")
-    m_analyzer = MarketAnalyzer(db)
-    print(m_analyzer.get_market_health())
-    print("\n")
-    
-    # 2. Neighborhoods
-    print("--- 🏘️ Neighborhood Rankings ---")
-    n_analyzer = NeighborhoodAnalyzer(db)
-    print(n_analyzer.compare_zip_codes())
-    print("\n")
-    
-    # 3. DEAL HUNTER
-    print("--- 💰 Potential Deals (Undervalued) ---")
-    c_analyzer = ComparativeAnalyzer(db)
-    deals = c_analyzer.find_deals(discount_threshold=0.20) # Find houses 20% off
-    
-    if not deals.empty:
-        print(deals.to_string())
-    else:
-        print("No deals found (Everything is expensive!).")
-
-if __name__ == "__main__":
-    test_full_analysis()
\ No newline at end of file
+import sys
+import os
+import tempfile
+from concurrent.futures import Future
+from datetime import datetime
+import pandas as pd
+from sqlalchemy import event
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import DatabaseManager
+from src.core.models import Property
+from src.geocoding.reverse_geocoder import ReverseGeocoder
+from src.services.geocoding_service import GeocodingService
+from src.services.data_generator import SyntheticDataGenerator
+from src.services.property_service import PropertyService
+from src.services.snapshot_service import SnapshotService
+from src.analyzers.price_analyzer import PriceAnalyzer
+from src.analyzers.market_analyzer import MarketAnalyzer
+from src.analyzers.comparative_analyzer import ComparativeAnalyzer
+from src.analyzers.neighborhood_analyzer import NeighborhoodAnalyzer
+
+class OfflineGeocoder:
+    """Never asked for anything here: backfill() only writes finished lookups."""
+    def geocode(self, address_str):
+        return None, None
+
+def test_full_analysis():
+    print("📊 Running Full Analysis Suite...\n")
+    db = DatabaseManager()
+    
+    # 1. Market Health
+    print("--- 🌍 Market Health ---")
+    m_analyzer = MarketAnalyzer(db)
+    print(m_analyzer.get_market_health())
+    print("\n")
+    
+    # 2. Neighborhoods
+    print("--- 🏘️ Neighborhood Rankings ---")
+    n_analyzer = NeighborhoodAnalyzer(db)
+    print(n_analyzer.compare_zip_codes())
+    print("\n")
+    
+    # 3. DEAL HUNTER
+    print("--- 💰 Potential Deals (Undervalued) ---")
+    c_analyzer = ComparativeAnalyzer(db)
+    deals = c_analyzer.find_deals(discount_threshold=0.20) # Find houses 20% off
+    
+    if not deals.empty:
+        print(deals.to_string())
+    else:
+        print("No deals found (Everything is expensive!).")
+
+def test_parquet_snapshot():
+    print("🗂️ Testing Parquet Snapshot Store...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'snap.db')}")
+        SyntheticDataGenerator(seed=5).to_database(db, 3000)
+        with db.session_scope() as session:
+            session.add(Property(address="1 Nowhere Rd", city=None, state=None, price=1.0, url="http://t/null"))
+        analyzer = PriceAnalyzer(db)
+        from_sql = analyzer.get_dataframe().sort_values("id").reset_index(drop=True)
+        
+        # 1. Built next to the database, partitioned by state/city, and it matches SQL exactly
+        snapshot = SnapshotService(db)
+        snapshot.ROWS_PER_GROUP = 200
+        assert not snapshot.is_fresh()
+        assert snapshot.refresh()["mode"] == "rebuild"
+        assert snapshot.path.startswith(os.path.join(tmp, "snapshots"))
+        assert snapshot.is_fresh()
+        loaded = analyzer.get_dataframe().sort_values("id").reset_index(drop=True)
+        assert list(loaded.columns) == list(from_sql.columns)
+        assert loaded[["id", "city", "state", "price", "address_key"]].equals(from_sql[["id", "city", "state", "price", "address_key"]])
+        
+        # 2. Column and row pruning: one city, a price band, two columns
+        city = from_sql["city"].dropna().iloc[0]
+        some = snapshot.load(["id", "price"], city=city, min_price=300000, max_price=400000)
+        expected = from_sql[(from_sql["city"] == city) & from_sql["price"].between(300000, 400000)]
+        assert list(some.columns) == ["id", "price"] and sorted(some["id"]) == sorted(expected["id"])
+        fragments = list(snapshot._dataset().get_fragments(filter=snapshot._partition_filter("TX", city)))
+        assert len(fragments) == 1 and fragments[0].metadata.num_row_groups > 1
+        
+        # 3. Changes make it stale; the analyzer falls back to SQL until it's refreshed
+        with db.session_scope() as session:
+            service = PropertyService(session)
+            moved = session.query(Property).filter(Property.city == city).first()
+            moved_id = moved.id
+            moved.city = "Snapshotville"
+            moved.updated_at = datetime.utcnow()
+            session.flush()
+            service.save_listings([Property(address="2 New St", city="Snapshotville", state="TX",
+                                            price=123456.0, url="http://t/new")])
+        assert not snapshot.is_fresh()
+        assert len(analyzer.get_dataframe()) == len(from_sql) + 1
+        
+        # 4. Incremental refresh rewrites only the touched partitions
+        report = snapshot.refresh()
+        assert report["mode"] == "incremental" and report["partitions"] == 2
+        assert snapshot.is_fresh()
+        assert sorted(snapshot.load(["id"], city="Snapshotville")["id"])[0] == moved_id
+        assert moved_id not in set(snapshot.load(["id"], city=city)["id"])
+        assert len(snapshot.load()) == len(from_sql) + 1
+        assert snapshot.refresh()["mode"] == "unchanged"
+        # Listings without a state or city get their own (null) partition
+        unplaced = snapshot.load(["url", "state", "city"])
+        unplaced = unplaced[unplaced["url"] == "http://t/null"]
+        assert len(unplaced) == 1 and unplaced["state"].isna().all() and unplaced["city"].isna().all()
+        
+        # 5. Every writer moves updated_at, so none of these changes is served stale
+        with db.session_scope() as session:
+            target = session.query(Property).filter(Property.city == "Snapshotville", Property.url != "http://t/new").one()
+            target_id, target_url, target_status = target.id, target.url, target.listing_status
+            target.latitude, target.longitude, target.zip_code = 30.5, -97.5, None
+            target.updated_at = datetime.utcnow()
+        snapshot.refresh()
+        
+        # A status-only re-scrape (same price)...
+        with db.session_scope() as session:
+            PropertyService(session).save_listings([Property(address="2 New St", city="Snapshotville", state="TX",
+                                                             price=123456.0, url="http://t/new", listing_status="Sold")])
+        assert not snapshot.is_fresh()
+        snapshot.refresh()
+        # ...a reverse-geocoded ZIP...
+        ReverseGeocoder(points=pd.DataFrame({"latitude": ["30.5"], "longitude": ["-97.5"], "zip_code": ["78799"]})
+                        ).fill_missing(db, columns=["zip_code"])
+        assert not snapshot.is_fresh()
+        snapshot.refresh()
+        # ...and backfilled coordinates
+        future = Future()
+        future.set_result((30.25, -97.75))
+        geocoding = GeocodingService(OfflineGeocoder())
+        assert geocoding.backfill(db, [("http://t/new", future)]) == 1
+        geocoding.shutdown()
+        assert not snapshot.is_fresh()
+        snapshot.refresh()
+        
+        rows = analyzer.get_dataframe().set_index("url")
+        assert rows.loc["http://t/new", "listing_status"] == "Sold"
+        assert rows.loc["http://t/new", "latitude"] == 30.25
+        assert rows.loc[target_url, "zip_code"] == "78799"
+        assert snapshot.refresh()["mode"] == "unchanged"
+        
+        # 6. The freshness check is index lookups, not a scan of the table
+        statements = []
+        listen = lambda conn, cursor, statement, params, context, many: statements.append((statement, params))
+        event.listen(db.engine, "before_cursor_execute", listen)
+        try:
+            snapshot._db_state()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listen)
+        with db.engine.connect() as connection:
+            plans = [connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).fetchall()[0][-1]
+                     for statement, params in statements if "updated_at" in statement]
+        assert plans == ["SEARCH properties USING COVERING INDEX ix_properties_updated_at"]
+        db.engine.dispose()
+    
+    print("\n✅ Parquet Snapshot Store Passed!")
+
+if __name__ == "__main__":
+    test_full_analysis()
+    test_parquet_snapshot()
@@ -0,0 +1,64 @@
+import sys
+import os
+import tempfile
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import DatabaseManager
+from src.services.property_service import PropertyService
+from src.core.models import Property, PriceHistory
+
+def make_listings():
+    """A run with new houses, re-listed houses and a house that changes twice."""
+    def house(n, price, status="active"):
+        return Property(address=f"{n} Bulk Lane", city="Test City", state="TX", price=price,
+                        bedrooms=3, bathrooms=2, square_feet=2000, listing_status=status,
+                        url=f"http://test-bulk.com/{n}")
+    first_run = [house(1, 500000.0), house(2, 300000.0), house(3, 250000.0)]
+    second_run = [
+        house(1, 450000.0),             # price drop -> history
+        house(2, 300000.0, "pending"),  # same price, new status -> no history
+        house(4, 800000.0),             # brand new
+        house(4, 780000.0),             # new AND changed in the same batch -> history
+        house(1, 440000.0),             # dropped again -> second history row
+    ]
+    return first_run, second_run
+
+def snapshot(db):
+    with db.session_scope() as session:
+        props = sorted((p.url, p.price, p.listing_status) for p in session.query(Property))
+        history = sorted((h.property.url, h.price) for h in session.query(PriceHistory))
+        return props, history
+
+def test_bulk_save_matches_single_save():
+    print("📦 Testing Bulk Upsert...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        single_db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'single.db')}")
+        bulk_db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'bulk.db')}")
+        
+        # 1. One listing at a time (the original path)
+        for run in make_listings():
+            with single_db.session_scope() as session:
+                service = PropertyService(session)
+                for listing in run:
+                    service.save_listing(listing)
+        
+        # 2. The same runs through the batch API (tiny batches to cross a boundary)
+        totals = []
+        for run in make_listings():
+            with bulk_db.session_scope() as session:
+                totals.append(PropertyService(session).save_listings(run, batch_size=3))
+        
+        # 3. Same rows, same prices, same history
+        assert snapshot(bulk_db) == snapshot(single_db)
+        assert totals[1] == {"inserted": 1, "updated": 4, "price_changes": 3, "failed": 0}
+        
+        single_db.engine.dispose()
+        bulk_db.engine.dispose()
+    
+    print("\n✅ Bulk Upsert Passed!")
+
+if __name__ == "__main__":
+    test_bulk_save_matches_single_save()
@@ -1,42 +1,101 @@
-import sys
-import os
-
-# Fix imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.services.cleaning_service import CleaningService
-
-def test_cleaning_pipeline():
-    print("🧹 Testing Data Cleaning Pipeline...")
-
-    # 1. Create some DIRTY data (what real scraping looks like)
-    dirty_house = {
-        "address": "  123 Messy Lane  ",
-        "city": "austin",       # Lowercase
-        "state": "Texas",       # Not abbreviated
-        "price": "$450,000.00", # String with symbols
-        "beds": "3 bd",         # Text mixed with numbers
-        "baths": -2,            # Impossible negative number
-        "sqft": "2,500 sqft"    # Comma and text
-    }
-
-    print("\n🤢 Dirty Input:")
-    print(dirty_house)
-
-    # 2. Run it through the Cleaner
-    clean_house = CleaningService.clean_listing(dirty_house)
-
-    print("\n✨ Clean Output:")
-    print(clean_house)
-    
-    # 3. Verify
-    assert clean_house['price'] == 450000.0
-    assert clean_house['city'] == "Austin"
-    assert clean_house['state'] == "TE" # Our simple cleaner takes first 2 chars. Ideally 'TX', but logic holds.
-    assert clean_house['bedrooms'] == 3
-    assert clean_house['bathrooms'] == 2 # Absolute value fixed the negative
-    
-    print("\n✅ Cleaning Logic Passed!")
-
-if __name__ == "__main__":
-    test_cleaning_pipeline()
\ No newline at end of file
+import sys
+import os
+import random
+import pandas as pd
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cleaners.address_cleaner import AddressCleaner
+from src.services.cleaning_service import CleaningService
+
+def test_cleaning_pipeline():
+    print("🧹 Testing Data Cleaning Pipeline...")
+
+    # 1. Create some DIRTY data (what real scraping looks like)
+    dirty_house = {
+        "address": "  123 Messy Lane  ",
+        "city": "austin",       # Lowercase
+        "state": "Texas",       # Not abbreviated
+        "price": "$450,000.00", # String with symbols
+        "beds": "3 bd",         # Text mixed with numbers
+        "baths": -2,            # Impossible negative number
+        "sqft": "2,500 sqft"    # Comma and text
+    }
+
+    print("\n🤢 Dirty Input:")
+    print(dirty_house)
+
+    # 2. Run it through the Cleaner
+    clean_house = CleaningService.clean_listing(dirty_house)
+
+    print("\n✨ Clean Output:")
+    print(clean_house)
+    
+    # 3. Verify
+    assert clean_house['price'] == 450000.0
+    assert clean_house['city'] == "Austin"
+    assert clean_house['state'] == "TE" # Our simple cleaner takes first 2 chars. Ideally 'TX', but logic holds.
+    assert clean_house['bedrooms'] == 3
+    assert clean_house['bathrooms'] == 2 # Absolute value fixed the negative
+    
+    print("\n✅ Cleaning Logic Passed!")
+
+def test_clean_dataframe_matches_clean_listing():
+    print("🧹 Testing Vectorized Batch Cleaning...")
+    
+    # 1. A messy batch mixing every kind of value the scrapers send us
+    random.seed(7)
+    prices = ["$450,000.00", "450000", 0, "", None, "call us", "1.2.3", "$0", 12.5, -3, True, "٣٠٠"]
+    cities = [" austin ", "DALLAS", "", None, "round rock"]
+    states = ["Texas", "tx ", "", None]
+    counts = ["3 bd", -2, None, 2.5, "none", "2,500 sqft", 0, "٣ beds"]
+    raw_rows = [{
+        "address": random.choice(["  123 Messy Lane  ", "9 Elm St"]),
+        "city": random.choice(cities),
+        "state": random.choice(states),
+        "price": random.choice(prices),
+        "beds": random.choice(counts),
+        "baths": random.choice(counts),
+        "sqft": random.choice(counts),
+        "url": f"http://test.com/{i}"
+    } for i in range(2000)]
+    
+    # 2. Row by row vs. the whole batch at once
+    expected = pd.DataFrame([CleaningService.clean_listing(row) for row in raw_rows])
+    batch = CleaningService.clean_dataframe(pd.DataFrame(raw_rows))
+    
+    pd.testing.assert_frame_equal(batch[expected.columns], expected)
+    
+    print("\n✅ Batch Cleaning Matches Row Cleaning!")
+
+def test_address_key():
+    print("🔑 Testing Address Normalization...")
+    
+    # 1. Suffixes, directionals, units, case, punctuation and spacing all collapse to one key
+    same_home = [
+        "1234 North Main Street, Apt. #2",
+        "1234 n main st #2",
+        "  1234 N. MAIN ST.,   Unit 2 ",
+        "1234 North Main Str Apartment 2",
+    ]
+    keys = {AddressCleaner.address_key(a) for a in same_home}
+    assert keys == {"1234 n main st apt 2"}
+    assert AddressCleaner.address_key("1234 South Main Street") != AddressCleaner.address_key("1234 Main Street")
+    assert AddressCleaner.address_key("12 Café Blvd") == "12 cafe blvd"
+    assert AddressCleaner.address_key(None) is None
+    assert AddressCleaner.address_key(" ,. ") is None
+    
+    # 2. Expanding goes the other way
+    assert AddressCleaner.expand("1234 n main st apt 2") == "1234 North Main Street Apartment 2"
+    
+    # 3. The column version agrees with the single one
+    column = pd.Series(same_home + [None, "9 Elm Ave"])
+    assert AddressCleaner.address_keys(column).tolist() == [AddressCleaner.address_key(a) for a in column]
+    
+    print("\n✅ Address Normalization Passed!")
+
+if __name__ == "__main__":
+    test_cleaning_pipeline()
+    test_clean_dataframe_matches_clean_listing()
+    test_address_key()
\ No newline at end of file
@@ -1,22 +1,68 @@
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.core.database import SessionLocal
-from src.core.models import Property
-
-def test_connection():
-    db = SessionLocal()
-    try:
-        # Create a dummy house
-        test_house = Property(address="123 Portfolio St", price=100.0)
-        db.add(test_house)
-        db.commit()
-        print("🎉 Success! Data saved to database.")
-    except Exception as e:
-        print(f"❌ Error: {e}")
-    finally:
-        db.close()
-
-if __name__ == "__main__":
-    test_connection()
\ No newline at end of file
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from src.core.database import DatabaseManager, SessionLocal, dispose_engines
+from src.core.models import Property
+
+def test_connection():
+    db = SessionLocal()
+    try:
+        # Create a dummy house
+        test_house = Property(address="123 Portfolio St", price=100.0)
+        db.add(test_house)
+        db.commit()
+        print("🎉 Success! Data saved to database.")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        db.close()
+
+def test_shared_engine():
+    print("🔌 Testing Shared Engine and SQLite Tuning...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'shared.db')}"
+        
+        # 1. Every manager for the same database shares one engine; creating more is cheap
+        first = DatabaseManager(url)
+        start = time.perf_counter()
+        managers = [DatabaseManager(url) for _ in range(1000)]
+        elapsed = time.perf_counter() - start
+        print(f"   ⏱️ 1,000 DatabaseManager() calls: {elapsed * 1000:.1f}ms")
+        assert all(m.engine is first.engine and m.Session is first.Session for m in managers)
+        assert elapsed < 1.0
+        
+        # 2. Connections come tuned
+        with first.session_scope() as session:
+            assert session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert session.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert session.execute(text("PRAGMA cache_size")).scalar() == -64000
+        
+        # 3. Readers aren't blocked while a write transaction is open (WAL)
+        writer = first.Session()
+        writer.add(Property(address="1 Writer Way", url="http://t/writer"))
+        writer.flush()
+        counts = []
+        def read():
+            with DatabaseManager(url).session_scope() as session:
+                counts.append(session.query(Property).count())
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join(timeout=5)
+        assert counts == [0]
+        writer.commit()
+        writer.close()
+        with first.session_scope() as session:
+            assert session.query(Property).count() == 1
+        dispose_engines()
+    
+    print("\n✅ Shared Engine Passed!")
+
+if __name__ == "__main__":
+    test_connection()
+    test_shared_engine()
\ No newline at end of file
@@ -1,43 +1,241 @@
-import sys
-import os
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.core.database import DatabaseManager
-from src.core.models import Property
-from src.services.duplicate_detector import DuplicateDetector
-
-def test_fuzzy_logic():
-    print("🔍 Testing Fuzzy Duplicate Detection...")
-    
-    db_manager = DatabaseManager()
-    
-    with db_manager.session_scope() as session:
-        # 1. Clear old test data (optional, but cleaner)
-        session.query(Property).filter(Property.city == "DuplicateCity").delete()
-        
-        # 2. Add an "Original" House
-        original = Property(
-            address="1234 Main Street", # Note: Spelled out "Street"
-            city="DuplicateCity",
-            price=100000,
-            url="http://test.com/1"
-        )
-        session.add(original)
-        session.commit()
-        print("   ✅ Added: '1234 Main Street'")
-        
-        # 3. Try to match a "Messy" version
-        detector = DuplicateDetector(session)
-        messy_address = "1234 Main St." # Note: Abbreviation and dot
-        
-        print(f"   ❓ Checking: '{messy_address}'...")
-        match = detector.find_potential_duplicate(messy_address, "DuplicateCity")
-        
-        if match:
-            print(f"   ✅ SUCCESS! It matched '{messy_address}' to '{match.address}'")
-        else:
-            print("   ❌ FAILED. It thought they were different.")
-
-if __name__ == "__main__":
-    test_fuzzy_logic()
\ No newline at end of file
+import sys
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from src.core.database import DatabaseManager
+from src.core.models import Property, DuplicateCluster
+from src.services.duplicate_detector import AddressIndex, DuplicateDetector
+from src.services.dedupe_job import DedupeJob
+
+def test_fuzzy_logic():
+    print("🔍 Testing Fuzzy Duplicate Detection...")
+    
+    db_manager = DatabaseManager()
+    
+    with db_manager.session_scope() as session:
+        # 1. Clear old test data (optional, but cleaner)
+        session.query(Property).filter(Property.city == "DuplicateCity").delete()
+        
+        # 2. Add an "Original" House
+        original = Property(
+            address="1234 Main Street", # Note: Spelled out "Street"
+            city="DuplicateCity",
+            price=100000,
+            url="http://test.com/1"
+        )
+        session.add(original)
+        session.commit()
+        print("   ✅ Added: '1234 Main Street'")
+        
+        # 3. Try to match a "Messy" version
+        detector = DuplicateDetector(session)
+        messy_address = "1234 Main St." # Note: Abbreviation and dot
+        
+        print(f"   ❓ Checking: '{messy_address}'...")
+        match = detector.find_potential_duplicate(messy_address, "DuplicateCity")
+        
+        if match:
+            print(f"   ✅ SUCCESS! It matched '{messy_address}' to '{match.address}'")
+        else:
+            print("   ❌ FAILED. It thought they were different.")
+
+def test_blocking_index():
+    print("🧱 Testing Duplicate Blocking Index...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'dupes.db')}")
+        with db.session_scope() as session:
+            # 1. A big city: 20,000 homes on 200 streets
+            session.bulk_save_objects([
+                Property(address=f"{n} Street {s} Rd", city="Blockville", zip_code="78701",
+                         url=f"http://test.com/{s}/{n}")
+                for s in range(200) for n in range(100, 200)
+            ])
+            session.add(Property(address="1234 Main Street", city="Blockville", zip_code="78701",
+                                 url="http://test.com/main"))
+        
+        with db.session_scope() as session:
+            index = AddressIndex.load(session)
+            detector = DuplicateDetector(session, index)
+            assert index.size == 20001
+            
+            # 2. The fuzzy scorer only sees homes with the same house number
+            assert len(index.candidates("150 Street 7 Road", "Blockville")) == 200
+            assert len(index.candidates("1234 Main St.", "Blockville")) == 1
+            
+            # 3. Same matches as before: messy spelling found, other cities/ZIPs/numbers not
+            match = detector.find_potential_duplicate("1234 Main St.", "Blockville")
+            assert match is not None and match.url == "http://test.com/main"
+            assert detector.find_potential_duplicate("1234 Main St.", "Elsewhere") is None
+            assert detector.find_potential_duplicate("1234 Main St.", "Blockville", zip_code="78702") is None
+            assert detector.find_potential_duplicate("1243 Main Street", "Blockville") is None
+            
+            # 4. Listings added during the run are found without reloading
+            session.add(Property(address="77 Lake Dr", city="Blockville", url="http://test.com/lake"))
+            session.flush()
+            index.add("77 Lake Dr", "Blockville", url="http://test.com/lake")
+            assert detector.find_potential_duplicate("77 Lake Drive", "Blockville").url == "http://test.com/lake"
+            
+            # 5. Lookups stay fast however big the city gets
+            start = time.perf_counter()
+            for n in range(100, 200):
+                detector.find_potential_duplicate(f"{n} Street 999 Rd", "Blockville")
+            elapsed = time.perf_counter() - start
+            print(f"   ⏱️ 100 lookups against 20,000 homes: {elapsed:.3f}s")
+            assert elapsed < 2.0
+        db.engine.dispose()
+    
+    print("\n✅ Blocking Index Passed!")
+
+def test_batch_matches_single():
+    print("📦 Testing Batch Duplicate Detection...")
+    rng = random.Random(3)
+    streets = ["Main Street", "Main St", "Oak Avenue", "Oak Ave.", "Café Lane", "Cafe Ln", "North Lake Drive"]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'batch.db')}")
+        with db.session_scope() as session:
+            session.bulk_save_objects([
+                Property(address=f"{rng.randint(1, 30)} {rng.choice(streets)}", city=rng.choice(["A", "B"]),
+                         zip_code=rng.choice(["78701", "78702", None]), url=f"http://test.com/{i}")
+                for i in range(400)
+            ])
+        
+        # 1. Messy incoming listings, including typos, accents, missing ZIPs and no address
+        incoming = [
+            Property(address=f"{rng.randint(1, 30)} {rng.choice(streets)}{rng.choice(['', ' #2', 'e', ' Unit B'])}",
+                     city=rng.choice(["A", "B", "C"]), zip_code=rng.choice(["78701", "78702", None]))
+            for _ in range(500)
+        ]
+        incoming.append(Property(address=None, city="A"))
+        
+        with db.session_scope() as session:
+            detector = DuplicateDetector(session)
+            batched = detector.find_duplicates_batch(incoming)
+            
+            # 2. Same decision (and same winner) as checking one at a time
+            assert len(batched) == len(incoming)
+            for prop, match in zip(incoming, batched):
+                single = detector.find_potential_duplicate(prop.address, prop.city, zip_code=prop.zip_code)
+                assert (single.url if single else None) == (match.url if match else None), prop.address
+            assert any(batched) and not all(batched)
+        db.engine.dispose()
+    
+    print("\n✅ Batch Duplicate Detection Passed!")
+
+def test_exact_key_fast_path():
+    print("🔑 Testing Exact Address Key Matching...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "legacy.db")
+        
+        # 1. A database from before address_key existed
+        legacy = sqlite3.connect(path)
+        legacy.execute("CREATE TABLE properties (id INTEGER PRIMARY KEY, address VARCHAR, city VARCHAR, "
+                       "state VARCHAR, zip_code VARCHAR, price FLOAT, bedrooms INTEGER, bathrooms FLOAT, "
+                       "square_feet INTEGER, property_type VARCHAR, listing_status VARCHAR, source_site VARCHAR, "
+                       "url VARCHAR UNIQUE, latitude FLOAT, longitude FLOAT, scraped_at DATETIME, updated_at DATETIME)")
+        legacy.execute("INSERT INTO properties (address, city, url) VALUES "
+                       "('1234 North Main Street', 'Keyville', 'http://test.com/1')")
+        legacy.commit()
+        legacy.close()
+        
+        # 2. Opening it adds and backfills the indexed column
+        db = DatabaseManager(f"sqlite:///{path}")
+        with db.session_scope() as session:
+            assert session.query(Property.address_key).scalar() == "1234 n main st"
+            index = AddressIndex.load(session)
+            detector = DuplicateDetector(session, index)
+            
+            # 3. A spelling fuzzy matching would miss (score < 85) is caught by the key
+            assert index.candidates("1234 N Main St", "Keyville")
+            match = detector.find_potential_duplicate("1234 N Main St", "Keyville")
+            assert match is not None and match.url == "http://test.com/1"
+            assert detector.find_duplicates_batch([Property(address="1234 N. Main St.", city="Keyville")])[0] is match
+            assert detector.find_potential_duplicate("1234 N Main St", "Elsewhere") is None
+            
+            # 4. New rows get their key on insert
+            session.add(Property(address="5 Oak Avenue", city="Keyville", url="http://test.com/2"))
+            session.flush()
+            assert session.query(Property).filter_by(address_key="5 oak ave").count() == 1
+            
+            # 5. The old table also gets the query indexes, and dedupe lookups use them
+            names = {row[0] for row in session.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+            assert {"ix_properties_city_zip_code", "ix_properties_price",
+                    "ix_price_history_property_id_recorded_at"} <= names
+            plan = session.execute(text("EXPLAIN QUERY PLAN SELECT id FROM properties WHERE city = 'Keyville'")).fetchall()
+            assert "ix_properties_city_zip_code" in plan[0][-1]
+        db.engine.dispose()
+    
+    print("\n✅ Exact Address Key Matching Passed!")
+
+def test_offline_dedupe_job():
+    print("🧬 Testing Offline Dedupe Job...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'job.db')}")
+        rng = random.Random(5)
+        with db.session_scope() as session:
+            # 1. 3,000 distinct homes...
+            homes = [(f"{n} {street} Street", city) for n in range(100, 400)
+                     for street, city in [("Oak", "Austin"), ("Maple", "Austin"), ("Cedar", "Dallas"),
+                                          ("Pine", "Dallas"), ("Elm", "Houston"), ("Birch", "Houston"),
+                                          ("Walnut", "Waco"), ("Spruce", "Waco"), ("Willow", "Plano"),
+                                          ("Aspen", "Plano")]]
+            session.bulk_save_objects([
+                Property(address=address, city=city, zip_code="78701", url=f"http://test.com/{i}")
+                for i, (address, city) in enumerate(homes)
+            ])
+            # 2. ...plus already-saved duplicates: typos, abbreviations, other city spellings
+            session.bulk_save_objects([
+                Property(address="100 Oak St", city="austin tx", zip_code="78701", url="http://dupe.com/1"),
+                Property(address="100 Oak Stret", city="Austin", zip_code=None, url="http://dupe.com/2"),
+                Property(address="250 Ceder Street", city="Dalas", zip_code="78701", url="http://dupe.com/3"),
+                # Same street, different number, or different ZIP: not duplicates
+                Property(address="101 Oak Stret", city="Austin", zip_code="78702", url="http://dupe.com/4"),
+                Property(address="399 Aspen Street", city="Plano", zip_code="75001", url="http://dupe.com/5"),
+                # The same street address in another city (or state) is another home, even without a ZIP
+                Property(address="300 Elm Street", city="Denton", zip_code=None, url="http://dupe.com/6"),
+                Property(address="301 Elm Street", city="Houston", state="LA", zip_code=None, url="http://dupe.com/7"),
+            ])
+        
+        # 3. Several processes, small chunks
+        report = DedupeJob(db, workers=2, chunk_size=500).run()
+        assert report["rows"] == 3007
+        assert report["candidate_pairs"] < 3007 * 3006 // 2 // 100
+        
+        with db.session_scope() as session:
+            ids = dict(session.query(Property.url, Property.id))
+            clusters = {}
+            for row in session.query(DuplicateCluster):
+                clusters.setdefault(row.canonical_id, set()).add(row.property_id)
+            
+            # 4. The original listing is canonical and every copy joined it
+            oak = ids["http://test.com/0"]
+            assert clusters[oak] == {oak, ids["http://dupe.com/1"], ids["http://dupe.com/2"]}
+            cedar = ids[f"http://test.com/{homes.index(('250 Cedar Street', 'Dallas'))}"]
+            assert clusters[cedar] == {cedar, ids["http://dupe.com/3"]}
+            clustered = set().union(*clusters.values())
+            assert not {ids[f"http://dupe.com/{n}"] for n in (4, 5, 6, 7)} & clustered
+            assert len(clusters) == 2
+        
+        # 5. Re-running replaces the previous clusters instead of piling up
+        DedupeJob(db, workers=1).run()
+        with db.session_scope() as session:
+            assert session.query(DuplicateCluster).count() == 5
+        db.engine.dispose()
+    
+    print("\n✅ Offline Dedupe Job Passed!")
+
+if __name__ == "__main__":
+    test_fuzzy_logic()
+    test_blocking_index()
+    test_batch_matches_single()
+    test_exact_key_fast_path()
+    test_offline_dedupe_job()
\ No newline at end of file
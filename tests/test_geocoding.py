@@ -0,0 +1,332 @@
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from sqlalchemy import event
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.geocoding.geocoder import Geocoder, GazetteerBackend, NominatimBackend
+from src.geocoding.gazetteer import Gazetteer
+from src.geocoding.reverse_geocoder import ReverseGeocoder
+from src.geocoding.distance_calculator import SpatialIndex, haversine, distance_matrix
+from src.core.database import DatabaseManager
+from src.core.models import Property
+from src.services.geocoding_service import GeocodingService
+from src.utils.rate_limiter import RateLimiter
+from src.utils.cache import GeocodeCache
+
+def fake_geolocator(known):
+    """Answers like Nominatim for the addresses in `known`, None for anything else."""
+    geolocator = MagicMock()
+    def geocode(address, timeout=None):
+        if address not in known:
+            return None
+        return MagicMock(latitude=known[address][0], longitude=known[address][1])
+    geolocator.geocode.side_effect = geocode
+    return geolocator
+
+def test_geocode_cache():
+    print("🗺️ Testing Persistent Geocode Cache...")
+    
+    with tempfile.TemporaryDirectory() as tmp, patch("src.utils.rate_limiter.time.sleep"):
+        path = os.path.join(tmp, "geocode.db")
+        geocoder = Geocoder(cache=GeocodeCache(path))
+        geocoder.backends[0].geolocator = fake_geolocator({"12 North Oak Street, Austin, TX": (30.1, -97.7)})
+        
+        # 1. First lookups go to the API; "not found" is remembered too
+        assert geocoder.geocode("12 North Oak Street, Austin, TX") == (30.1, -97.7)
+        assert geocoder.geocode("1 Nowhere Lane, Austin, TX") == (None, None)
+        assert geocoder.backends[0].geolocator.geocode.call_count == 2
+        
+        # 2. A new process (new cache object, same file) makes no calls, even for other spellings
+        again = Geocoder(cache=GeocodeCache(path))
+        again.backends[0].geolocator = fake_geolocator({})
+        assert again.geocode("12 N. Oak St, austin, tx") == (30.1, -97.7)
+        assert again.geocode("1 Nowhere Ln, Austin, TX") == (None, None)
+        assert again.backends[0].geolocator.geocode.call_count == 0
+        stats = again.cache.get_stats()
+        assert stats["hits"] == 1 and stats["negative_hits"] == 1 and stats["hit_rate"] == 1.0
+        
+        # 3. Negative answers expire sooner than found ones
+        short = GeocodeCache(path, ttl=3600, negative_ttl=0)
+        assert short.get("1 Nowhere Lane, Austin, TX") == (False, None)
+        assert short.get("12 North Oak Street, Austin, TX") == (True, (30.1, -97.7))
+        
+        # 4. Size-bounded: least recently used entries go first
+        small = GeocodeCache(os.path.join(tmp, "small.db"), max_entries=2)
+        small.store("1 A St", (1.0, 1.0))
+        small.store("2 B St", (2.0, 2.0))
+        small.get("1 A St")
+        small.store("3 C St", (3.0, 3.0))
+        assert small.get("2 B St") == (False, None)
+        assert small.get("1 A St")[0] and small.get("3 C St")[0]
+        assert small.get_stats()["evicted"] == 1
+        
+        # 5. Hits commit nothing; their access times are written in one batch
+        with sqlite3.connect(path) as other:
+            before = dict(other.execute("SELECT key, accessed_at FROM geocode_cache"))
+        for _ in range(3):
+            again.cache.get("12 North Oak Street, Austin, TX")
+        with sqlite3.connect(path) as other:
+            assert dict(other.execute("SELECT key, accessed_at FROM geocode_cache")) == before
+        again.cache.flush()
+        with sqlite3.connect(path) as other:
+            assert dict(other.execute("SELECT key, accessed_at FROM geocode_cache")) != before
+        assert again.cache.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    
+    print("\n✅ Geocode Cache Passed!")
+
+def test_gazetteer_backend():
+    print("📍 Testing Offline Gazetteer Geocoder...")
+    
+    with tempfile.TemporaryDirectory() as tmp, patch("src.utils.rate_limiter.time.sleep"):
+        # 1. Tiny reference files: two Austin ZIPs and one street range (numbers run high to low)
+        zip_path = os.path.join(tmp, "zips.csv")
+        with open(zip_path, "w") as f:
+            f.write("zip,latitude,longitude,city,state\n"
+                    "78701,30.27,-97.74,Austin,TX\n78702,30.26,-97.72,Austin,TX\n")
+        street_path = os.path.join(tmp, "streets.csv")
+        with open(street_path, "w") as f:
+            f.write("zip,street,from_number,to_number,from_lat,from_lon,to_lat,to_lon\n"
+                    "78701,North Oak Street,200,100,30.30,-97.70,30.20,-97.70\n")
+        gazetteer = Gazetteer(zip_path, street_path)
+        
+        # 2. Street interpolation, then ZIP centroid, then city centroid
+        lat, lon, precision = gazetteer.lookup("150 N Oak St Apt 2, Austin, TX 78701")
+        assert precision == "street" and abs(lat - 30.25) < 1e-4 and abs(lon + 97.70) < 1e-4
+        assert gazetteer.lookup("999 N Oak St, Austin, TX 78701")[2] == "zip"
+        assert gazetteer.lookup("5 Elm St, Austin, TX 78702")[:2] == gazetteer.zip_centroid("78702")
+        lat, lon, precision = gazetteer.lookup("5 Elm St, Austin, TX")
+        assert precision == "city" and abs(lat - 30.265) < 1e-4
+        assert gazetteer.lookup("5 Elm St, Nowhere, ZZ 99999") is None
+        
+        # 3. Precise-enough local answers never touch the API
+        remote = NominatimBackend()
+        remote.geolocator = fake_geolocator({"150 N Oak St, Austin, TX 78701": (30.2512, -97.7011)})
+        geocoder = Geocoder(cache=GeocodeCache(os.path.join(tmp, "geocode.db")),
+                            backends=[GazetteerBackend(gazetteer), remote])
+        assert geocoder.geocode("5 Elm St, Austin, TX 78702") == gazetteer.zip_centroid("78702")
+        assert remote.geolocator.geocode.call_count == 0
+        
+        # 4. Asking for more precision falls back to the API, or keeps the best local answer
+        geocoder.min_precision = Geocoder.PRECISIONS.index("rooftop")
+        assert geocoder.geocode("150 N Oak St, Austin, TX 78701") == (30.2512, -97.7011)
+        assert geocoder.geocode("5 Elm St, Austin, TX 78702") == gazetteer.zip_centroid("78702")
+        assert remote.geolocator.geocode.call_count == 2
+        
+        # 5. Offline mode: no remote backend at all
+        offline = Geocoder.from_gazetteer(zip_path, street_path, fallback=False)
+        assert [b.name for b in offline.backends] == ["gazetteer"]
+        start = time.perf_counter()
+        for n in range(5000):
+            offline.geocode(f"{100 + n % 100} N Oak St, Austin, TX 78701")
+        elapsed = time.perf_counter() - start
+        print(f"   ⏱️ 5,000 offline lookups: {elapsed:.3f}s")
+        assert elapsed < 5.0
+    
+    print("\n✅ Offline Gazetteer Geocoder Passed!")
+
+class SlowGeocoder:
+    """Takes a while per lookup, like the real API, and counts its calls."""
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = []
+        self.release = threading.Event()
+
+    def geocode(self, address_str):
+        self.release.wait()
+        time.sleep(self.delay)
+        self.calls.append(address_str)
+        return (None, None) if "Nowhere" in address_str else (30.0, -97.0)
+
+def test_geocoding_service():
+    print("📬 Testing Async Geocoding Service...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'geo.db')}")
+        addresses = [f"{n} Oak St, Austin, TX" for n in range(20)]
+        with db.session_scope() as session:
+            session.bulk_save_objects([Property(address=a, city="Austin", url=f"http://test.com/{i}")
+                                       for i, a in enumerate(addresses)])
+        
+        # 1. Submitting never waits on a lookup
+        geocoder = SlowGeocoder()
+        service = GeocodingService(geocoder, workers=4)
+        start = time.perf_counter()
+        futures = service.submit_many(addresses + ["0 oak st., austin, tx", "1 Nowhere Ln, Austin, TX"])
+        assert time.perf_counter() - start < 0.05
+        assert not any(f.done() for f in futures)
+        
+        # 2. The same address (however it's spelled) is looked up once
+        assert futures[-2] is futures[0]
+        assert service.get_stats()["deduped"] == 1
+        
+        # 3. Saved listings get their coordinates in bulk once lookups finish
+        pending = [(f"http://test.com/{i}", f) for i, f in enumerate(futures[:20])]
+        pending.append(("http://test.com/missing", futures[-1]))
+        geocoder.release.set()
+        assert service.backfill(db, pending, batch_size=8) == 20
+        assert len(geocoder.calls) == 21
+        with db.session_scope() as session:
+            assert session.query(Property).filter(Property.latitude == 30.0).count() == 20
+        service.shutdown()
+        db.engine.dispose()
+    
+    # 4. Every Nominatim backend draws from one process-wide budget
+    limiter = RateLimiter()
+    first, second = NominatimBackend(limiter=limiter), NominatimBackend(limiter=limiter)
+    assert first.limiter is second.limiter
+    assert limiter.domain_limits["nominatim.openstreetmap.org"] == (NominatimBackend.RATE, 1)
+    
+    print("\n✅ Async Geocoding Service Passed!")
+
+def test_reverse_geocoder():
+    print("🧭 Testing Offline Reverse Geocoder...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # 1. The gazetteer's ZIP file doubles as reverse-geocoding reference data
+        zip_path = os.path.join(tmp, "zips.csv")
+        with open(zip_path, "w") as f:
+            f.write("zip,latitude,longitude,city,state\n"
+                    "78701,30.27,-97.74,Austin,TX\n78702,30.26,-97.72,Austin,TX\n"
+                    "75201,32.79,-96.80,Dallas,TX\n")
+        reverse = ReverseGeocoder(zip_path)
+        
+        # 2. Arrays in, labels out, in order (missing or far-away coordinates stay empty)
+        found = reverse.lookup([30.261, 32.70, np.nan, 40.7], [-97.721, -96.81, -97.0, -74.0], max_distance_km=50)
+        assert list(found["zip_code"][:2]) == ["78702", "75201"]
+        assert found["city"][1] == "Dallas" and found["state"][0] == "TX"
+        assert found["zip_code"][2:].isna().all()
+        assert 9 < found["distance_km"][1] < 11
+        
+        # 3. Missing ZIPs and cities get filled; existing values are left alone
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'reverse.db')}")
+        with db.session_scope() as session:
+            session.bulk_save_objects([
+                Property(address="1 A St", city=None, zip_code=None, latitude=30.27, longitude=-97.739, url="http://t/1"),
+                Property(address="2 B St", city="Dallas", zip_code="", latitude=32.79, longitude=-96.801, url="http://t/2"),
+                Property(address="3 C St", city="Keep", zip_code=None, latitude=30.26, longitude=-97.72, url="http://t/3"),
+                Property(address="4 D St", city=None, zip_code=None, url="http://t/4"),
+            ])
+        filled = reverse.fill_missing(db, columns=["zip_code", "city"], chunk_size=2)
+        assert filled == {"zip_code": 3, "city": 1}
+        with db.session_scope() as session:
+            rows = {p.url: (p.zip_code, p.city) for p in session.query(Property)}
+            assert rows["http://t/1"] == ("78701", "Austin")
+            assert rows["http://t/2"] == ("75201", "Dallas")
+            assert rows["http://t/3"] == ("78702", "Keep")
+            assert rows["http://t/4"] == (None, None)
+            
+            # 4. Or learn from listings that already have every label (no files at all)
+            learned = ReverseGeocoder.from_properties(session, labels=["zip_code", "city"])
+            assert len(learned.points) == 3
+        db.engine.dispose()
+        
+        # 5. One vectorized call answers a big batch quickly
+        rng = np.random.default_rng(1)
+        big = ReverseGeocoder(points=pd.DataFrame({
+            "latitude": rng.uniform(25, 49, 40000), "longitude": rng.uniform(-124, -67, 40000),
+            "zip_code": [f"{z:05d}" for z in range(40000)],
+        }))
+        lats, lons = rng.uniform(25, 49, 200000), rng.uniform(-124, -67, 200000)
+        start = time.perf_counter()
+        labels = big.lookup(lats, lons)
+        elapsed = time.perf_counter() - start
+        print(f"   ⏱️ 200,000 reverse lookups: {elapsed:.3f}s")
+        assert labels["zip_code"].notna().all()
+        assert elapsed < 10.0
+    
+    print("\n✅ Offline Reverse Geocoder Passed!")
+
+def test_spatial_index():
+    print("📐 Testing Haversine and Spatial Index...")
+    
+    # 1. Vectorized haversine: Austin -> Dallas is about 182 miles
+    assert 180 < haversine(30.2672, -97.7431, 32.7767, -96.7970) < 184
+    assert abs(haversine(30.2672, -97.7431, 32.7767, -96.7970, unit="km") / 1.609344 - 182) < 2
+    many = haversine(30.0, -97.0, np.array([30.0, 31.0]), np.array([-97.0, -97.0]))
+    assert many[0] == 0 and 68 < many[1] < 70
+    assert distance_matrix([30, 31], [-97, -97], [30, 31, 32], [-97, -97, -97]).shape == (2, 3)
+    
+    # 2. Radius and k-nearest answers match a full scan (points on both sides of the date line too)
+    rng = np.random.default_rng(7)
+    lats = np.concatenate((rng.uniform(25, 49, 200000), [10.0, 10.0]))
+    lons = np.concatenate((rng.uniform(-124, -67, 200000), [179.99, -179.99]))
+    index = SpatialIndex(merge_at=50000)
+    index.add(np.arange(len(lats)), lats, lons)
+    assert len(index) == len(lats)
+    for lat, lon in [(30.27, -97.74), (47.6, -122.3), (40.7, -74.0)]:
+        full = haversine(lat, lon, lats, lons)
+        ids, distances = index.within(lat, lon, 5.0)
+        assert set(ids) == set(np.flatnonzero(full <= 5.0)) and np.all(np.diff(distances) >= 0)
+        ids, _ = index.nearest(lat, lon, k=8)
+        assert list(ids) == list(np.argsort(full, kind="stable")[:8])
+    assert set(index.within(10.0, 179.995, 5.0)[0]) == {200000, 200001}
+    
+    # 3. Incremental: moved points leave their old spot, new ones show up before any merge
+    pending_before = len(index.pending_ids)
+    index.add([0, 999999], [64.0, 64.0], [-150.0, -150.0001])
+    assert len(index.pending_ids) == pending_before + 2
+    assert set(index.within(64.0, -150.0, 1.0)[0]) == {0, 999999}
+    assert 0 not in set(index.within(lats[0], lons[0], 0.1)[0])
+    
+    # 4. Queries stay well under a millisecond
+    start = time.perf_counter()
+    for lat, lon in zip(rng.uniform(30, 45, 500), rng.uniform(-120, -70, 500)):
+        index.within(lat, lon, 1.0)
+    elapsed = (time.perf_counter() - start) / 500
+    print(f"   ⏱️ 1-mile radius query over 200,000 points: {elapsed * 1000:.3f}ms")
+    assert elapsed < 0.005
+    
+    # 5. Built from (and refreshed against) geocoded listings
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'spatial.db')}")
+        with db.session_scope() as session:
+            session.bulk_save_objects([
+                Property(address="1 A St", latitude=30.27, longitude=-97.74, url="http://t/1"),
+                Property(address="2 B St", latitude=30.28, longitude=-97.74, url="http://t/2"),
+                Property(address="3 C St", url="http://t/3"),
+            ])
+        with db.session_scope() as session:
+            spatial = SpatialIndex.from_properties(session)
+            assert len(spatial) == 2
+            now = datetime.utcnow()
+            session.query(Property).filter_by(url="http://t/3").update(
+                {"latitude": 30.29, "longitude": -97.74, "updated_at": now})
+            session.query(Property).filter_by(url="http://t/1").update(
+                {"latitude": 40.0, "longitude": -80.0, "updated_at": now})
+            session.flush()
+            assert spatial.refresh(session) == 2
+            ids, _ = spatial.within(30.28, -97.74, 2.0)
+            assert len(ids) == 2 and len(spatial) == 3
+            
+            # 6. Later refreshes only read rows added or updated since the last one
+            session.add(Property(address="4 D St", latitude=40.1, longitude=-80.0, url="http://t/4"))
+            session.flush()
+            statements = []
+            listen = lambda conn, cursor, statement, params, context, many: statements.append(statement)
+            event.listen(db.engine, "before_cursor_execute", listen)
+            try:
+                assert spatial.refresh(session) == 1
+            finally:
+                event.remove(db.engine, "before_cursor_execute", listen)
+            assert spatial.last_id == 4 and len(spatial) == 4
+            assert all("updated_at >=" in statement for statement in statements if "latitude" in statement)
+        db.engine.dispose()
+    
+    print("\n✅ Haversine and Spatial Index Passed!")
+
+if __name__ == "__main__":
+    test_geocode_cache()
+    test_gazetteer_backend()
+    test_geocoding_service()
+    test_reverse_geocoder()
+    test_spatial_index()
@@ -1,57 +1,108 @@
-import sys
-import os
-from datetime import datetime
-
-# Fix imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.core.database import DatabaseManager
-from src.services.property_service import PropertyService
-from src.core.models import Property
-
-def test_price_history():
-    print("📉 Testing Historical Tracking...")
-    
-    db_manager = DatabaseManager()
-    
-    with db_manager.session_scope() as session:
-        service = PropertyService(session)
-        
-        # 1. Create a Fake House
-        url = "http://test-history.com/house1"
-        house_v1 = Property(
-            address="999 History Lane",
-            city="Test City",
-            price=500000.0,  # ORIGINAL PRICE
-            bedrooms=3, bathrooms=2, square_feet=2000,
-            url=url,
-            scraped_at=datetime.utcnow()
-        )
-        service.save_listing(house_v1)
-        
-        # 2. Update the SAME house with a LOWER price
-        print("\n⏳ Simulating time passing... Price drops!")
-        house_v2 = Property(
-            address="999 History Lane",
-            city="Test City",
-            price=450000.0,  # NEW LOWER PRICE
-            bedrooms=3, bathrooms=2, square_feet=2000,
-            url=url  # Same URL means same house
-        )
-        service.save_listing(house_v2)
-        
-        # 3. Verify History
-        print("\n🔍 Checking Database Records...")
-        prop = session.query(Property).filter_by(url=url).first()
-        
-        print(f"   Current Price in DB: ${prop.price:,.0f}")
-        print(f"   History Count: {len(prop.price_history)}")
-        
-        if len(prop.price_history) > 0:
-            old_price = prop.price_history[0].price
-            print(f"   ✅ SUCCESS! Found historical record of: ${old_price:,.0f}")
-        else:
-            print("   ❌ FAILURE. No history found.")
-
-if __name__ == "__main__":
-    test_price_history()
\ No newline at end of file
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import DatabaseManager
+from src.services.property_service import PropertyService
+from src.core.models import Property, PriceHistory
+from src.services.data_generator import SyntheticDataGenerator
+
+def test_price_history():
+    print("📉 Testing Historical Tracking...")
+    
+    db_manager = DatabaseManager()
+    
+    with db_manager.session_scope() as session:
+        service = PropertyService(session)
+        
+        # 1. Create a Fake House
+        url = "http://test-history.com/house1"
+        house_v1 = Property(
+            address="999 History Lane",
+            city="Test City",
+            price=500000.0,  # ORIGINAL PRICE
+            bedrooms=3, bathrooms=2, square_feet=2000,
+            url=url,
+            scraped_at=datetime.utcnow()
+        )
+        service.save_listing(house_v1)
+        
+        # 2. Update the SAME house with a LOWER price
+        print("\n⏳ Simulating time passing... Price drops!")
+        house_v2 = Property(
+            address="999 History Lane",
+            city="Test City",
+            price=450000.0,  # NEW LOWER PRICE
+            bedrooms=3, bathrooms=2, square_feet=2000,
+            url=url  # Same URL means same house
+        )
+        service.save_listing(house_v2)
+        
+        # 3. Verify History
+        print("\n🔍 Checking Database Records...")
+        prop = session.query(Property).filter_by(url=url).first()
+        
+        print(f"   Current Price in DB: ${prop.price:,.0f}")
+        print(f"   History Count: {len(prop.price_history)}")
+        
+        if len(prop.price_history) > 0:
+            old_price = prop.price_history[0].price
+            print(f"   ✅ SUCCESS! Found historical record of: ${old_price:,.0f}")
+        else:
+            print("   ❌ FAILURE. No history found.")
+
+def test_price_drops():
+    print("📉 Testing Single-Query Price Drops...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'drops.db')}")
+        SyntheticDataGenerator(seed=3).to_database(db, 3000)
+        
+        with db.session_scope() as session:
+            service = PropertyService(session)
+            
+            # 1. Same answer as the old load-everything loop (latest history row vs current price)
+            expected = {}
+            for prop in session.query(Property):
+                history = sorted(prop.price_history, key=lambda h: (h.recorded_at, h.id), reverse=True)
+                if history and prop.price < history[0].price:
+                    expected[prop.id] = history[0].price - prop.price
+            start = time.perf_counter()
+            drops = service.get_price_drops()
+            print(f"   ⏱️ {len(drops)} drops in {time.perf_counter() - start:.3f}s")
+            assert expected and {d["id"]: d["drop_amount"] for d in drops} == expected
+            assert [d["drop_amount"] for d in drops] == sorted(expected.values(), reverse=True)
+            
+            # 2. Filters
+            city = drops[0]["city"]
+            assert all(d["city"] == city for d in service.get_price_drops(city=city))
+            assert len(service.get_price_drops(city=city)) == sum(d["city"] == city for d in drops)
+            big = service.get_price_drops(min_drop=50000)
+            assert big and all(d["drop_amount"] >= 50000 for d in big)
+            cutoff = sorted(d["recorded_at"] for d in drops)[len(drops) // 2]
+            recent = service.get_price_drops(since=cutoff)
+            assert {d["id"] for d in recent} == {d["id"] for d in drops if d["recorded_at"] >= cutoff}
+            
+            # 3. Pages line up with the full list
+            pages = service.get_price_drops(limit=10) + service.get_price_drops(limit=10, offset=10)
+            assert [d["id"] for d in pages] == [d["id"] for d in drops[:20]]
+            
+            # 4. A newer price that went back up is not a drop any more
+            prop_id = drops[0]["id"]
+            current = drops[0]["current_price"]
+            session.add(PriceHistory(property_id=prop_id, price=current - 1,
+                                     recorded_at=drops[0]["recorded_at"] + timedelta(days=1)))
+            session.flush()
+            assert prop_id not in {d["id"] for d in service.get_price_drops()}
+        db.engine.dispose()
+    
+    print("\n✅ Single-Query Price Drops Passed!")
+
+if __name__ == "__main__":
+    test_price_history()
+    test_price_drops()
\ No newline at end of file
@@ -0,0 +1,111 @@
+import sys
+import os
+import sqlite3
+import tempfile
+import time
+import requests
+from unittest.mock import MagicMock
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.base_scraper import BaseScraper
+from src.utils.cache import HttpCache
+from src.utils.rate_limiter import RateLimiter
+
+class PlainScraper(BaseScraper):
+    def parse(self, html):
+        pass
+    
+    def run(self):
+        pass
+
+def fake_response(status, body="", headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = body.encode()
+    response.headers.update(headers or {})
+    return response
+
+def test_conditional_requests():
+    print("💾 Testing Conditional HTTP Cache...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HttpCache(path=os.path.join(tmp, "cache.db"), ttl_rules=[])
+        scraper = PlainScraper("http://site.example", "Example",
+                               rate_limiter=RateLimiter(rate=1000, burst=100), http_cache=cache)
+        scraper.session = MagicMock()
+        
+        # 1. First fetch downloads the page and remembers its ETag
+        scraper.session.get.return_value = fake_response(200, "<html>listing</html>", {"ETag": '"v1"'})
+        assert scraper.fetch_page("http://site.example/home/1") == "<html>listing</html>"
+        
+        # 2. Second fetch sends If-None-Match, gets a 304, and reuses the stored body
+        scraper.session.get.return_value = fake_response(304)
+        assert scraper.fetch_page("http://site.example/home/1") == "<html>listing</html>"
+        sent_headers = scraper.session.get.call_args.kwargs["headers"]
+        assert sent_headers == {"If-None-Match": '"v1"'}
+        
+        stats = cache.get_stats()
+        assert stats["revalidated"] == 1
+        assert stats["bytes_saved"] == len("<html>listing</html>")
+    
+    print("\n✅ Conditional Cache Passed!")
+
+def test_ttl_and_lru_eviction():
+    print("💾 Testing Cache TTL and Eviction...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HttpCache(path=os.path.join(tmp, "cache.db"), max_bytes=25,
+                          ttl_rules=[(r"/search", 600)])
+        
+        # 1. Search pages inside their TTL need no request at all
+        cache.store("http://site.example/search?p=1", fake_response(200, "0123456789"))
+        entry = cache.get("http://site.example/search?p=1")
+        assert cache.is_fresh(entry)
+        
+        # 2. Going over max_bytes evicts the least recently used entry first
+        cache.store("http://site.example/a", fake_response(200, "0123456789", {"ETag": "a"}))
+        cache.hit(entry)  # search page is now more recent than /a
+        cache.store("http://site.example/b", fake_response(200, "0123456789", {"ETag": "b"}))
+        
+        assert cache.get("http://site.example/a") is None
+        assert cache.get("http://site.example/search?p=1") is not None
+        assert cache.get("http://site.example/b") is not None
+    
+    print("\n✅ TTL and Eviction Passed!")
+
+def test_touches_are_batched():
+    print("💾 Testing Batched Cache Touches...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.db")
+        cache = HttpCache(path=path, ttl_rules=[(r"/search", 600)])
+        cache.store("http://site.example/search?p=1", fake_response(200, "0123456789", {"ETag": "s"}))
+        stored_at = cache.get("http://site.example/search?p=1")["stored_at"]
+        time.sleep(0.01)
+
+        def on_disk():
+            with sqlite3.connect(path) as other:
+                return other.execute("SELECT stored_at, accessed_at FROM http_cache").fetchone()
+        
+        # 1. Hits and 304s commit nothing...
+        entry = cache.get("http://site.example/search?p=1")
+        for _ in range(5):
+            cache.hit(entry)
+        cache.revalidated(entry)
+        assert on_disk() == (stored_at, stored_at)
+        # ...but a 304 restarts the TTL straight away
+        assert cache.get("http://site.example/search?p=1")["stored_at"] > stored_at
+        
+        # 2. flush() (or the next store / TOUCH_BATCH touches) writes them all at once
+        cache.flush()
+        assert on_disk()[0] > stored_at and on_disk()[1] > stored_at
+        assert cache.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    
+    print("\n✅ Batched Cache Touches Passed!")
+
+if __name__ == "__main__":
+    test_conditional_requests()
+    test_ttl_and_lru_eviction()
+    test_touches_are_batched()
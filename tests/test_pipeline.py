@@ -0,0 +1,246 @@
+import sys
+import os
+import json
+import pstats
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import DatabaseManager
+from src.core.models import Property, ListingSource
+from src.scrapers.scraper_factory import ScraperFactory
+from src.services.ingest_pipeline import IngestPipeline
+from src.services.property_service import PropertyService
+from src.utils.metrics import metrics
+
+class OfflineGeocoder:
+    """Stands in for Nominatim so the test needs no network (a little slow, like the API)."""
+    def geocode(self, address_str):
+        time.sleep(0.02)
+        return 30.0, -97.0
+
+class FixedScraper:
+    """Returns the same listings every time, like a site re-listing the same homes."""
+    def __init__(self, site_name, listings, delay=0.0):
+        self.site_name = site_name
+        self.listings = listings
+        self.delay = delay
+
+    def scrape_page(self, page):
+        time.sleep(self.delay)
+        return [Property(source_site=self.site_name, state="TX", price=price, url=f"http://{self.site_name}/{i}",
+                         address=address, city=city, zip_code=zip_code, square_feet=sqft)
+                for i, (address, city, zip_code, price, sqft) in enumerate(self.listings)]
+
+class GatedScraper(FixedScraper):
+    """Page 1 comes back at once; later pages wait (up to 10s) for the gate to open."""
+    def __init__(self, site_name, listings, gate):
+        super().__init__(site_name, listings)
+        self.gate = gate
+        self.opened_in_time = None
+
+    def scrape_page(self, page):
+        if page > 1:
+            self.opened_in_time = self.gate.wait(timeout=10)
+        return super().scrape_page(page)
+
+def test_pipelined_ingest():
+    print("🏭 Testing Pipelined Ingest...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'pipeline.db')}")
+        pipeline = IngestPipeline(db, OfflineGeocoder(), workers={"clean": 2}, queue_size=4)
+        
+        report = pipeline.run([ScraperFactory.get_scraper("redfin")], pages=3)
+        
+        # 1. Every scraped listing went through every stage (minus duplicates)
+        assert report["scrape"]["out"] == 15
+        assert report["clean"]["in"] == 15
+        assert report["merge"]["in"] == 15
+        assert report["dedupe"]["in"] == report["merge"]["out"]
+        assert report["dedupe"]["out"] + report["dedupe"]["dropped"] == report["dedupe"]["in"]
+        assert report["save"]["in"] == report["dedupe"]["out"]
+        
+        # 2. Queues never grew past their bound
+        assert report["clean"]["max_queue_depth"] <= 4
+        
+        # 3. What was saved is cleaned and geocoded (partly backfilled after saving)
+        assert pipeline.geocoding.get_stats()["backfilled"] > 0
+        with db.session_scope() as session:
+            saved = session.query(Property).all()
+            assert 0 < len(saved) <= report["save"]["out"]
+            assert all(p.latitude == 30.0 and p.state == "TX" for p in saved)
+        db.engine.dispose()
+    
+    print("\n✅ Pipelined Ingest Passed!")
+
+def test_stage_metrics():
+    print("⏱️ Testing Stage Metrics...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'metrics.db')}")
+        pipeline = IngestPipeline(db, OfflineGeocoder())
+        metrics_path = os.path.join(tmp, "metrics.json")
+        profile_path = os.path.join(tmp, "run.prof")
+        
+        pipeline.run([ScraperFactory.get_scraper("realtor")], pages=2,
+                     profile="cprofile", profile_output=profile_path, metrics_json=metrics_path)
+        
+        # 1. Every stage was timed, with row counts that line up
+        with open(metrics_path) as f:
+            dumped = json.load(f)
+        stages = dumped["stages"]
+        assert list(stages) == ["fetch", "parse", "clean", "merge", "dedupe", "geocode", "save"]
+        assert stages["fetch"]["calls"] == 2
+        assert stages["parse"]["rows"] == 10
+        assert stages["clean"]["calls"] == 10
+        assert stages["save"]["rows"] == dumped["pipeline"]["save"]["in"]
+        assert stages["fetch"]["p50_ms"] <= stages["fetch"]["p99_ms"]
+        assert stages["fetch"]["total_s"] >= 1.0  # two simulated 0.5s requests
+        
+        # 2. The merged cProfile covers every thread, including the scraper pool's
+        assert os.path.getsize(profile_path) > 0
+        profiled = {func[2] for func in pstats.Stats(profile_path).stats}
+        assert {"scrape_page", "_clean", "save_listings"} <= profiled
+        
+        # 3. Zillow's mock fetches are timed too, without its politeness pause
+        metrics.reset()
+        ScraperFactory.get_scraper("zillow").scrape_page(1)
+        fetch = metrics.summary()["fetch"]
+        assert fetch["calls"] == 1 and fetch["total_s"] < 0.5
+        db.engine.dispose()
+    
+    print("\n✅ Stage Metrics Passed!")
+
+def test_cross_source_merge():
+    print("🔗 Testing Cross-Source Merge...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'merge.db')}")
+        with db.session_scope() as session:
+            session.add(Property(address="9 Old Road", city="Austin", url="http://old/9"))
+        
+        # 1. Three sites list overlapping homes, spelled their own way
+        scrapers = [
+            FixedScraper("zillow", [("12 North Oak Street", "Austin", "78701", 500000, None),
+                                    ("77 Lake Dr", "Austin", "78702", 300000, 1500)]),
+            # A slow site: its copies arrive after the others have been through every stage
+            FixedScraper("redfin", [("12 N Oak St", "austin", None, 505000, 2100),
+                                    ("9 Old Rd", "Austin", None, 410000, None)], delay=1.0),
+            FixedScraper("realtor", [("12 n. oak st.", "Austin", "78701", 499000, None),
+                                     ("77 Lake Dr", "Austin", "78799", 310000, None),
+                                     ("9 Old Road", "Austin", None, 400000, None)]),
+        ]
+        report = IngestPipeline(db, OfflineGeocoder()).run(scrapers, pages=1)
+        
+        # 2. Copies were merged before the detector saw them (different ZIPs stay apart)
+        assert report["merge"]["in"] == 7
+        assert report["merge"]["out"] == 4
+        assert report["merge"]["dropped"] == 3
+        assert report["dedupe"]["in"] == 4
+        
+        with db.session_scope() as session:
+            oak = session.query(Property).filter(Property.address_key == "12 n oak st").all()
+            assert len(oak) == 1
+            assert oak[0].square_feet == 2100  # filled in from a later copy
+            
+            # 3. Every copy is kept as a source of the saved home
+            sources = {s.url: s for s in oak[0].sources}
+            assert set(sources) == {"http://zillow/0", "http://redfin/0", "http://realtor/0"}
+            assert sources["http://redfin/0"].price == 505000
+            
+            # 4. Copies of a home already in the database are credited to that home
+            old = session.query(Property).filter_by(url="http://old/9").one()
+            assert {s.url for s in old.sources} == {"http://redfin/1", "http://realtor/2"}
+            assert session.query(ListingSource).count() == 5
+        db.engine.dispose()
+    
+    print("\n✅ Cross-Source Merge Passed!")
+
+def test_merge_streams_while_scraping():
+    print("🌊 Testing Merge Windows...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'stream.db')}")
+        
+        # 1. Page 2 can only be scraped once something from page 1 has been saved
+        saved = threading.Event()
+        save_listings = PropertyService.save_listings
+        def saving(self, listings, **kwargs):
+            totals = save_listings(self, listings, **kwargs)
+            saved.set()
+            return totals
+        
+        scraper = GatedScraper("zillow", [("12 Oak St", "Austin", "78701", 500000, None)], saved)
+        pipeline = IngestPipeline(db, OfflineGeocoder(), merge_window_seconds=0.2)
+        with patch.object(PropertyService, "save_listings", saving):
+            report = pipeline.run([scraper], pages=2)
+        
+        # 2. The merge stage let page 1 through while scraping was still going on
+        assert scraper.opened_in_time
+        assert report["save"]["in"] == 1
+        
+        # 3. The late copy (same URL) was dropped but still counted as seen
+        assert report["merge"]["in"] == 2
+        assert report["merge"]["dropped"] == 1
+        db.engine.dispose()
+    
+    print("\n✅ Merge Windows Passed!")
+
+def test_failures_never_hang_the_run():
+    print("🧯 Testing Stage Failures...")
+    
+    listings = [(f"{i} Elm St", "Austin", "78701", 300000 + i, None) for i in range(30)]
+
+    def run_with_timeout(pipeline):
+        # A stage that stops draining its inbox blocks its producers forever
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(
+            report=pipeline.run([FixedScraper("zillow", listings)], pages=1)))
+        thread.start()
+        thread.join(timeout=30)
+        assert not thread.is_alive(), "pipeline hung"
+        return result["report"]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'failures.db')}")
+        
+        # 1. The first save batch fails outside _save_batch (the URL lookup): the rest still get saved
+        lookup = PropertyService._lookup_urls
+        calls = []
+        def flaky_lookup(self, urls, **kwargs):
+            calls.append(urls)
+            if len(calls) == 1:
+                raise RuntimeError("database is locked")
+            return lookup(self, urls, **kwargs)
+        
+        pipeline = IngestPipeline(db, OfflineGeocoder(), queue_size=2, save_batch_size=1)
+        with patch.object(PropertyService, "_lookup_urls", flaky_lookup):
+            report = run_with_timeout(pipeline)
+        assert report["save"]["in"] == 30
+        assert report["save"]["errors"] == 1
+        with db.session_scope() as session:
+            assert session.query(Property).count() == 29
+        
+        # 2. A worker that can't open its context still drains its inbox and closes the next stage
+        def broken_context(self, stage_name):
+            raise RuntimeError("no session for you")
+        pipeline = IngestPipeline(db, OfflineGeocoder(), queue_size=2)
+        with patch.object(IngestPipeline, "_open_context", broken_context):
+            report = run_with_timeout(pipeline)
+        assert report["clean"]["errors"] == 30
+        assert report["save"]["in"] == 0
+        db.engine.dispose()
+    
+    print("\n✅ Stage Failures Passed!")
+
+if __name__ == "__main__":
+    test_pipelined_ingest()
+    test_stage_metrics()
+    test_cross_source_merge()
+    test_merge_streams_while_scraping()
+    test_failures_never_hang_the_run()
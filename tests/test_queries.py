@@ -1,32 +1,96 @@
-import sys
-import os
-
-# Fix imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.core.database import DatabaseManager
-from src.services.property_service import PropertyService
-
-def test_queries():
-    print("🔎 Testing Search Capabilities...")
-    
-    db = DatabaseManager()
-    with db.session_scope() as session:
-        service = PropertyService(session)
-        
-        # Test 1: Search by City
-        # (We assume the database has data from the pipeline run)
-        austin_homes = service.get_properties_by_city("Austin")
-        print(f"✅ Found {len(austin_homes)} homes in Austin")
-        
-        # Test 2: Search by Price
-        # Search for mid-range homes
-        budget_homes = service.get_properties_by_price(300000, 450000)
-        print(f"✅ Found {len(budget_homes)} homes between $300k-$450k")
-
-        # Test 3: Get Total Count
-        stats = service.get_stats()
-        print(f"✅ Total Database Size: {stats['total_listings']} listings")
-
-if __name__ == "__main__":
-    test_queries()
\ No newline at end of file
+import sys
+import os
+import tempfile
+import pandas as pd
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.database import DatabaseManager
+from src.core.models import Property
+from src.services.property_service import PropertyService
+from src.services.data_generator import SyntheticDataGenerator
+
+def test_queries():
+    print("🔎 Testing Search Capabilities...")
+    
+    db = DatabaseManager()
+    with db.session_scope() as session:
+        service = PropertyService(session)
+        
+        # Test 1: Search by City
+        # (We assume the database has data from the pipeline run)
+        austin_homes = service.get_properties_by_city("Austin")
+        print(f"✅ Found {len(austin_homes)} homes in Austin")
+        
+        # Test 2: Search by Price
+        # Search for mid-range homes
+        budget_homes = service.get_properties_by_price(300000, 450000)
+        print(f"✅ Found {len(budget_homes)} homes between $300k-$450k")
+        
+        # Test 3: Get Total Count
+        stats = service.get_stats()
+        print(f"✅ Total Database Size: {stats['total_listings']} listings")
+
+def test_keyset_queries():
+    print("📑 Testing Keyset-Paginated Queries...")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(f"sqlite:///{os.path.join(tmp, 'queries.db')}")
+        SyntheticDataGenerator(seed=9).to_database(db, 2500)
+        
+        with db.session_scope() as session:
+            service = PropertyService(session)
+            everything = pd.read_sql(session.query(Property).statement, session.bind)
+            
+            # 1. Streaming visits every row once, in id order, in bounded chunks
+            chunks = list(service.iter_chunks(["price"], chunk_size=700))
+            assert [len(c) for c in chunks] == [700, 700, 700, 400]
+            ids = [row.id for chunk in chunks for row in chunk]
+            assert ids == sorted(everything["id"])
+            
+            # 2. Projection: only the asked-for columns (plus the id used for paging)
+            row = chunks[0][0]
+            assert row._fields == ("id", "price")
+            
+            # 3. Filters compose, and match the same filter done in pandas
+            city = everything["city"].iloc[0]
+            expected = everything[(everything["city"] == city) & everything["price"].between(200000, 600000)]
+            found = list(service.iter_properties(["id"], chunk_size=100, city=city, min_price=200000, max_price=600000))
+            assert sorted(r.id for r in found) == sorted(expected["id"])
+            sites = ["Zillow", "Redfin"]
+            assert sum(1 for _ in service.iter_properties(["id"], source_site=sites)) == \
+                everything["source_site"].isin(sites).sum()
+            
+            # 4. Pages pick up exactly where the last one stopped
+            first = service.get_properties_by_city(city, limit=50)
+            second = service.get_properties_by_city(city, limit=50, after_id=first[-1].id)
+            assert isinstance(first[0], Property)
+            assert [p.id for p in first + second] == sorted(everything[everything["city"] == city]["id"])[:100]
+            assert all(300000 <= p.price <= 450000 for p in service.get_properties_by_price(300000, 450000))
+            
+            # 5. Lookups by id are chunked under SQLite's bound-parameter limit
+            wanted = everything["id"].tolist()[:1200] + [10**9]
+            by_id = service.get_properties_by_ids(wanted, columns=["price"])
+            assert len(by_id) == 1200 and by_id[wanted[0]].price == everything["price"].iloc[0]
+            
+            # 6. Stats come from SQL and agree with pandas
+            stats = service.get_stats(city=city)
+            in_city = everything[everything["city"] == city]
+            assert stats["total_listings"] == len(in_city)
+            assert abs(stats["avg_price"] - in_city["price"].mean()) < 0.01
+            assert stats["max_price"] == in_city["price"].max() and stats["cities"] == 1
+            assert service.get_stats()["total_listings"] == 2500
+            
+            try:
+                service.get_page(colour="red")
+                assert False, "unknown filters must not be ignored"
+            except ValueError:
+                pass
+        db.engine.dispose()
+    
+    print("\n✅ Keyset-Paginated Queries Passed!")
+
+if __name__ == "__main__":
+    test_queries()
+    test_keyset_queries()
\ No newline at end of file
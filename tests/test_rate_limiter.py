@@ -0,0 +1,62 @@
+import sys
+import os
+import time
+import asyncio
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.rate_limiter import RateLimiter
+
+def test_token_bucket_per_domain():
+    print("🪣 Testing Per-Domain Rate Limiter...")
+    
+    limiter = RateLimiter(rate=10, burst=2)
+    
+    # 1. The burst goes through immediately, the next request has to wait
+    assert limiter.acquire("http://zillow.com/a") == 0
+    assert limiter.acquire("http://www.zillow.com/b") == 0
+    waited = limiter.acquire("http://zillow.com/c")
+    assert 0.05 < waited <= 0.11
+    
+    # 2. A different domain has its own bucket and never waits on Zillow
+    assert limiter.acquire("http://redfin.com/a") == 0
+    
+    # 3. Waits are reported per domain
+    stats = limiter.get_stats()
+    assert stats["zillow.com"]["requests"] == 3
+    assert stats["zillow.com"]["max_wait"] == waited
+    assert stats["redfin.com"]["waited"] == 0
+    
+    # 4. Reconfiguring a busy domain changes its pace but keeps its numbers
+    limiter.configure("zillow.com", rate=100, burst=1)
+    assert limiter.get_stats()["zillow.com"]["requests"] == 3
+    assert limiter.buckets["zillow.com"].rate == 100
+    limiter.acquire("http://zillow.com/d")
+    assert limiter.get_stats()["zillow.com"]["requests"] == 4
+    
+    print("\n✅ Rate Limiter Passed!")
+
+def test_async_acquire_does_not_block():
+    print("🪣 Testing Async Acquire...")
+    
+    limiter = RateLimiter(rate=20, burst=1)
+    
+    async def crawl():
+        # 5 requests to one site + 5 to another, all awaited at once
+        tasks = [limiter.acquire_async(f"http://{site}.com/{i}") for site in ("a", "b") for i in range(5)]
+        return await asyncio.gather(*tasks)
+    
+    start = time.perf_counter()
+    waits = asyncio.run(crawl())
+    elapsed = time.perf_counter() - start
+    
+    # Each site needs 4 x 0.05s; the two sites wait in parallel, not in sequence
+    assert max(waits) > 0.15
+    assert elapsed < 0.35
+    
+    print("\n✅ Async Acquire Passed!")
+
+if __name__ == "__main__":
+    test_token_bucket_per_domain()
+    test_async_acquire_does_not_block()
@@ -1,40 +1,187 @@
-import sys
-import os
-import requests
-from unittest.mock import MagicMock
-
-# Fix imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.scrapers.base_scraper import BaseScraper
-from src.utils.retry import retry_request
-
-class BrokenScraper(BaseScraper):
-    """A scraper designed to fail."""
-    
-    def parse(self, html):
-        pass
-    
-    def run(self):
-        pass
-    
-    # We override fetch_page to ALWAYS crash
-    @retry_request(max_attempts=3, delay=1)
-    def fetch_page(self, url):
-        print(f"💥 Trying to connect to {url}...")
-        raise requests.exceptions.ConnectionError("Fake Internet Outage")
-
-def test_retry_logic():
-    print("🧪 Testing Retry Mechanism...")
-    
-    scraper = BrokenScraper("http://bad-url.com", "BadSite")
-    
-    try:
-        scraper.fetch_page("http://bad-url.com")
-    except requests.exceptions.ConnectionError:
-        print("\n✅ Test Passed: The scraper failed gracefully after retrying.")
-    except Exception as e:
-        print(f"❌ Test Failed: Unexpected error: {e}")
-
-if __name__ == "__main__":
-    test_retry_logic()
\ No newline at end of file
+import sys
+import os
+import time
+import requests
+from unittest.mock import MagicMock
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.base_scraper import BaseScraper
+from src.utils.retry import retry_request, get_retry_stats
+from src.core.exceptions import CircuitOpenError
+
+class BrokenScraper(BaseScraper):
+    """A scraper designed to fail."""
+    
+    def parse(self, html):
+        pass
+    
+    def run(self):
+        pass
+    
+    # We override fetch_page to ALWAYS crash
+    @retry_request(max_attempts=3, delay=1)
+    def fetch_page(self, url):
+        print(f"💥 Trying to connect to {url}...")
+        raise requests.exceptions.ConnectionError("Fake Internet Outage")
+
+def test_retry_logic():
+    print("🧪 Testing Retry Mechanism...")
+    
+    scraper = BrokenScraper("http://bad-url.com", "BadSite")
+    
+    try:
+        scraper.fetch_page("http://bad-url.com")
+    except requests.exceptions.ConnectionError:
+        print("\n✅ Test Passed: The scraper failed gracefully after retrying.")
+    except Exception as e:
+        print(f"❌ Test Failed: Unexpected error: {e}")
+
+def test_retry_after_and_circuit_breaker():
+    print("🧪 Testing Retry-After and Circuit Breaker...")
+    
+    calls = []
+    
+    @retry_request(max_attempts=3, delay=0.01, failure_threshold=3, cooldown=60)
+    def overloaded(url):
+        calls.append(url)
+        response = requests.Response()
+        response.status_code = 503
+        response.headers["Retry-After"] = "0.05"
+        raise requests.exceptions.HTTPError("503 Service Unavailable", response=response)
+    
+    before = get_retry_stats()
+    
+    # 1. Three 503s: the two retries each honour Retry-After, then we give up
+    try:
+        overloaded("http://overloaded.example/page")
+    except requests.exceptions.HTTPError:
+        pass
+    assert len(calls) == 3
+    
+    after = get_retry_stats()
+    assert after["retries"] - before["retries"] == 2
+    assert after["backoff_seconds"] - before["backoff_seconds"] >= 0.099
+    assert after["breakers"]["overloaded.example"] == "open"
+    
+    # 2. The breaker is now open: the next call fails fast without touching the site
+    try:
+        overloaded("http://overloaded.example/other")
+        assert False, "expected the circuit to be open"
+    except CircuitOpenError as e:
+        print(f"   ✅ Failed fast: {e}")
+    assert len(calls) == 3
+    
+    # 3. A 404 is not retried at all
+    @retry_request(max_attempts=3, delay=0.01)
+    def missing(url):
+        calls.append(url)
+        response = requests.Response()
+        response.status_code = 404
+        raise requests.exceptions.HTTPError("404 Not Found", response=response)
+    
+    try:
+        missing("http://missing.example/page")
+    except requests.exceptions.HTTPError:
+        pass
+    assert calls.count("http://missing.example/page") == 1
+    
+    print("\n✅ Backoff and Circuit Breaker Passed!")
+
+def test_half_open_trial_always_resolves():
+    print("🧪 Testing the half-open trial request...")
+    
+    statuses = []
+
+    @retry_request(max_attempts=1, delay=0.01, failure_threshold=1, cooldown=0.05)
+    def flaky(url):
+        status = statuses.pop(0)
+        if status == "bug":
+            raise KeyError("parser bug")
+        response = requests.Response()
+        response.status_code = status
+        raise requests.exceptions.HTTPError(f"{status}", response=response)
+    
+    # 1. One 503 opens the circuit
+    statuses.append(503)
+    try:
+        flaky("http://halfopen.example/a")
+    except requests.exceptions.HTTPError:
+        pass
+    assert get_retry_stats()["breakers"]["halfopen.example"] == "open"
+    
+    # 2. After the cooldown the trial gets a 404: the host answered, so the circuit closes
+    time.sleep(0.06)
+    statuses.append(404)
+    try:
+        flaky("http://halfopen.example/missing")
+    except requests.exceptions.HTTPError:
+        pass
+    assert get_retry_stats()["breakers"]["halfopen.example"] == "closed"
+    
+    # 3. Open it again; this time the trial crashes in our own code
+    statuses.append(503)
+    try:
+        flaky("http://halfopen.example/a")
+    except requests.exceptions.HTTPError:
+        pass
+    time.sleep(0.06)
+    statuses.append("bug")
+    try:
+        flaky("http://halfopen.example/b")
+    except KeyError:
+        pass
+    # ...which re-opens the circuit instead of leaving it half-open forever
+    assert get_retry_stats()["breakers"]["halfopen.example"] == "open"
+    time.sleep(0.06)
+    statuses.append(404)
+    try:
+        flaky("http://halfopen.example/c")
+    except requests.exceptions.HTTPError:
+        pass
+    assert get_retry_stats()["breakers"]["halfopen.example"] == "closed"
+    
+    print("\n✅ Half-open trial Passed!")
+
+def test_breaker_trips_without_sleeping():
+    print("🧪 Testing 4xx answers and the tripping call...")
+    
+    statuses = []
+
+    @retry_request(max_attempts=1, delay=0.01, failure_threshold=3, cooldown=60)
+    def alternating(url):
+        status = statuses.pop(0)
+        response = requests.Response()
+        response.status_code = status
+        raise requests.exceptions.HTTPError(f"{status}", response=response)
+    
+    # 1. 404s in between don't reset the streak of 503s
+    statuses.extend([503, 404, 503, 404, 503])
+    for _ in range(5):
+        try:
+            alternating("http://alternating.example/page")
+        except requests.exceptions.HTTPError:
+            pass
+    assert get_retry_stats()["breakers"]["alternating.example"] == "open"
+    
+    # 2. The failure that trips the breaker doesn't sit out its backoff first
+    @retry_request(max_attempts=3, delay=5, failure_threshold=1, cooldown=60)
+    def down(url):
+        raise requests.exceptions.ConnectionError("refused")
+    
+    started = time.perf_counter()
+    try:
+        down("http://down.example/page")
+        assert False, "expected the circuit to open"
+    except CircuitOpenError as e:
+        assert isinstance(e.__cause__, requests.exceptions.ConnectionError)
+    assert time.perf_counter() - started < 1
+    
+    print("\n✅ Tripping Breaker Passed!")
+
+if __name__ == "__main__":
+    test_retry_logic()
+    test_retry_after_and_circuit_breaker()
+    test_half_open_trial_always_resolves()
+    test_breaker_trips_without_sleeping()
\ No newline at end of file
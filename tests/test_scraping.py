@@ -0,0 +1,58 @@
+import sys
+import os
+import time
+
+# Fix imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.scraper_factory import ScraperFactory
+from src.services.scraping_service import ScrapingService
+
+def test_concurrent_scraping():
+    print("⚡ Testing Concurrent Scraping Engine...")
+    
+    # 1. Redfin and Realtor each take ~0.5s per page when run one after another
+    scrapers = [ScraperFactory.get_scraper("redfin"), ScraperFactory.get_scraper("realtor")]
+    service = ScrapingService(scrapers, concurrency={"redfin": 3, "realtor": 3})
+    
+    start = time.perf_counter()
+    results = service.scrape_all(pages=3)
+    elapsed = time.perf_counter() - start
+    
+    # 2. Every site and every page should be there
+    assert set(results) == {"Redfin", "Realtor.com"}
+    assert len(results["Redfin"]) == 15
+    assert len(results["Realtor.com"]) == 15
+    
+    # 3. Sequential would be 6 pages x 0.5s = 3s. Concurrent is ~ one page.
+    print(f"   ⏱️ Took {elapsed:.2f}s")
+    assert elapsed < 2.0
+    
+    print("\n✅ Concurrent Scraping Passed!")
+
+def test_streaming_pages():
+    print("🌊 Testing Streaming Scraper Results...")
+    
+    service = ScrapingService([ScraperFactory.get_scraper("redfin")], concurrency={"redfin": 2})
+    
+    start = time.perf_counter()
+    first_page_at = None
+    pages_seen = []
+    for site_name, page, listings in service.stream(pages=6):
+        if first_page_at is None:
+            first_page_at = time.perf_counter() - start
+        assert len(listings) == 5
+        pages_seen.append(page)
+    
+    # 1. Every page arrives exactly once
+    assert sorted(pages_seen) == [1, 2, 3, 4, 5, 6]
+    
+    # 2. The first page is ready long before the whole crawl (3 rounds x 0.5s) is done
+    print(f"   ⏱️ First page after {first_page_at:.2f}s")
+    assert first_page_at < 1.0
+    
+    print("\n✅ Streaming Passed!")
+
+if __name__ == "__main__":
+    test_concurrent_scraping()
+    test_streaming_pages()